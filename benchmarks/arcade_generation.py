@@ -0,0 +1,85 @@
+"""Benchmark generatora poziomów Arcade.
+
+Generuje ``--levels`` układów (domyślnie 10 000) i osobno porównuje
+sprawdzanie wolnej przestrzeni nad platformami: liniowy przegląd listy
+kontra ``IntervalIndex``. Każdy układ mieści się w SCREEN_WIDTH, więc korytarz
+X niczego nie odrzuca i lista jest szybsza (dlatego generator jej używa).
+Przypadek ``--wide`` to długi rząd platform bez konfliktów, w którym lista
+przegląda wszystko, a indeks tylko korytarz X.
+
+    python benchmarks/arcade_generation.py --levels 10000 --segments 200
+    python benchmarks/arcade_generation.py --levels 200 --verify
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantumecho_game.arcade import ArcadeManager  # noqa: E402
+from quantumecho_game.spatial import IntervalIndex  # noqa: E402
+
+
+def validate_path(manager, path, indexed):
+    """Sprawdza każdą platformę ścieżki względem wszystkich wcześniejszych."""
+    placed = IntervalIndex() if indexed else []
+    for platform in path:
+        manager.has_sufficient_airspace(platform, placed)
+        if indexed:
+            placed.insert(platform["x"], platform["x"] + platform["width"], platform)
+        else:
+            placed.append(platform)
+
+
+def wide_row(count):
+    """Rząd platform i kandydatów nad nimi, wszystkie z zapasem wysokości."""
+    platforms = [{"x": i * 250, "y": 400, "width": 200, "height": 24} for i in range(count)]
+    candidates = [{"x": i * 250 + 50, "y": 200, "width": 150, "height": 24} for i in range(count)]
+    return platforms, candidates
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=10_000)
+    parser.add_argument("--segments", type=int, default=ArcadeManager.golden_path_segments)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verify", action="store_true", help="uruchom też solver (wolne)")
+    parser.add_argument("--wide", type=int, default=5000, help="długość rzędu platform")
+    args = parser.parse_args()
+
+    manager = ArcadeManager(args.seed)
+    manager.golden_path_segments = args.segments
+    paths = []
+    started = time.perf_counter()
+    for level_number in range(1, args.levels + 1):
+        if args.verify:
+            paths.append(manager.build(level_number).golden_path)
+        else:
+            difficulty = level_number % 20 + 1
+            paths.append(manager._build_level(random.Random(args.seed + level_number), difficulty)[1])
+    elapsed = time.perf_counter() - started
+    print(f"generowanie: {args.levels} poziomów, {args.segments} segmentów: "
+          f"{elapsed:.2f} s ({elapsed / args.levels * 1000:.3f} ms/poziom)")
+
+    for indexed, label in ((False, "lista"), (True, "IntervalIndex")):
+        started = time.perf_counter()
+        for path in paths:
+            validate_path(manager, path, indexed)
+        print(f"airspace ({label}): {time.perf_counter() - started:.2f} s")
+
+    platforms, candidates = wide_row(args.wide)
+    index = IntervalIndex()
+    for platform in platforms:
+        index.insert(platform["x"], platform["x"] + platform["width"], platform)
+    for placed, label in ((platforms, "lista"), (index, "IntervalIndex")):
+        started = time.perf_counter()
+        for candidate in candidates:
+            manager.has_sufficient_airspace(candidate, placed)
+        print(f"rząd {args.wide} platform ({label}): {time.perf_counter() - started:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark budowy poziomu całkowicie pokrytego kaflami.
+
+Poziom 1280×720 jest wypełniony kaflami ``--tile`` × ``--tile``; co
+``--temporal``-ty kafel jest platformą czasową (dwie tekstury na kafel).
+Mierzy czas ``Level`` z łączeniem kafli (jak w grze) i bez niego, gdy
+każdy kafel dostaje własną teksturę. Pierwsza kolumna to budowa z pustym
+cache tekstur, druga ponowna budowa tego samego poziomu.
+
+    python benchmarks/level_construction.py --repeat 5
+    python benchmarks/level_construction.py --tile 16 --temporal 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from quantumecho_game.config import SCREEN_HEIGHT, SCREEN_WIDTH  # noqa: E402
+from quantumecho_game.level import Level  # noqa: E402
+from quantumecho_game.textures import texture_cache  # noqa: E402
+
+
+def covered_level(tile, temporal_every):
+    platforms, temporal = [], []
+    index = 0
+    for y in range(0, SCREEN_HEIGHT, tile):
+        for x in range(0, SCREEN_WIDTH, tile):
+            entry = {"x": x, "y": y, "width": tile, "height": tile}
+            if temporal_every and index % temporal_every == temporal_every - 1:
+                temporal.append({**entry, "solid_time": 120, "phased_time": 60})
+            else:
+                platforms.append(entry)
+            index += 1
+    return {"platforms": platforms, "temporal_platforms": temporal,
+            "start": {"x": 0, "y": 0}, "end": {"x": SCREEN_WIDTH - 80, "y": 0}}
+
+
+def measure(data, compact, repeat, warm):
+    best = float("inf")
+    for seed in range(repeat):
+        if not warm:
+            texture_cache.clear()
+        started = time.perf_counter()
+        Level(data, 0, rng=random.Random(seed), compact=compact)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tile", type=int, default=32)
+    parser.add_argument("--temporal", type=int, default=5,
+                        help="co który kafel jest platformą czasową (0 = żaden)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    import pygame
+    pygame.init()
+    data = covered_level(args.tile, args.temporal)
+    print(f"kafle: {len(data['platforms'])} zwykłych, {len(data['temporal_platforms'])} czasowych")
+    for compact in (True, False):
+        label = "z łączeniem kafli" if compact else "kafel po kaflu"
+        cold = measure(data, compact, args.repeat, warm=False)
+        warm = measure(data, compact, args.repeat, warm=True)
+        print(f"{label:>18}: {cold * 1000:8.1f} ms {warm * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
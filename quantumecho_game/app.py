@@ -1,18 +1,22 @@
 """Główna pętla gry i zarządzanie jej stanami."""
 
 import os
+import time
 from pathlib import Path
-from collections import deque
 
 import pygame
 
 from .config import *
 from .effects import ParticleSystem, Starfield
-from .editor_ui import LevelEditor, delete_level, discover_levels, load_thumbnail
+from .editor_ui import LevelEditor, LevelIndex, ThumbnailLoader, browser_entry, delete_level
 from .entities import Player
-from .level import Level
 from .arcade import ArcadeManager
+from .prefetch import ArcadePrefetcher
+from .render import DirtyRectRenderer
+from .fonts import render_text
 from .runtime import clock, font_large, font_medium, font_small, screen
+from .replay import InputRecorder, save_replay
+from .simulation import Simulation
 from .storage import load_level, load_ranking, save_ranking, load_settings, save_settings
 from .ui import *
 
@@ -46,6 +50,7 @@ def main():
 
     refresh_level_order()
     RANKING_FILE = os.path.join(os.path.dirname(package_dir), "ranking.json")
+    REPLAY_DIR = os.path.join(os.path.dirname(package_dir), "replays")
 
     menu_options = [
         {"text": "SPACE/A - Kampania", "action": "start"},
@@ -61,20 +66,23 @@ def main():
     # Zmienne gry
     state = GameState.MENU
     current_level_index = -1
-    current_level = None
     current_level_filename = None
-    player = None
-    echo = None
+    # Simulation trzyma poziom, gracza, Echo i liczniki bieżącej próby.
+    simulation = None
+    # Wejście bieżącej próby; F9 zapisuje je jako powtórkę do raportu błędu.
+    recorder = None
     particle_system = ParticleSystem()
     starfield = Starfield(200, SCREEN_WIDTH, SCREEN_HEIGHT)
     is_training_mode = False
     is_arcade_mode = False
     arcade_manager = ArcadeManager()
+    arcade_prefetcher = ArcadePrefetcher(arcade_manager)
     arcade_level = 0
     arcade_lives = 3
     settings_file = os.path.join(os.path.dirname(package_dir), "settings.json")
     settings = load_settings(settings_file)
     settings_menu = SettingsMenu(settings, lambda value: (save_settings(settings_file, value), apply_audio_settings(value)))
+    dirty_renderer = DirtyRectRenderer(screen)
 
     # Audio jest częścią pakietu gry, tak jak fonty i poziomy. Dzięki temu
     # ścieżka nie zależy od katalogu roboczego, z którego uruchomiono grę.
@@ -145,11 +153,9 @@ def main():
     play_music("menu")
 
     # Statystyki całej gry
-    level_time = 0
     score = 0
     deaths = 0
     restart_penalty = 0
-    swap_count = 0
     total_swap_count = 0
 
     # Ranking i wprowadzanie nazwy gracza
@@ -173,18 +179,6 @@ def main():
     cursor_timer = 0
     cursor_visible = True
 
-    # Zmienne dla systemu drugiego życia
-    is_on_second_life = False
-    ECHO_DELAY_FRAMES = 600
-    # Stałe okno czasowe: append/popleft są O(1), a pozycję Echa pobieramy
-    # z lewej strony kolejki zamiast indeksować środek deque (O(n)).
-    player_history = deque(maxlen=ECHO_DELAY_FRAMES + 1)
-
-    # Zmienne dla Zamiany Kwantowej
-    swap_cooldown = 0
-    SWAP_COOLDOWN_FRAMES = 180
-    jump_buffer_frames = 0
-
     # --- OBSŁUGA KONTROLERA XBOX ---
     pygame.joystick.init()
     joysticks = []
@@ -242,7 +236,8 @@ def main():
     browser_cooldown = 0
     browser_delete_pending = False
     browser_status = "Wybierz poziom: strzałki/D-pad, A/Enter gra, N/Y nowy, Delete/B usuń"
-    thumbnail_cache = {}
+    browser_levels = LevelIndex(Path(package_dir) / "levels")
+    browser_thumbnails = ThumbnailLoader()
 
     def open_editor():
         nonlocal state
@@ -250,11 +245,13 @@ def main():
         state = GameState.EDITOR
 
     def open_browser():
-        nonlocal state, browser_selected_index, browser_scroll, thumbnail_cache, browser_delete_pending
+        nonlocal state, browser_selected_index, browser_scroll, browser_delete_pending
         browser_selected_index = 0
         browser_scroll = 0
         browser_delete_pending = False
-        thumbnail_cache = {}
+        # Poziomy mogły zostać zapisane w edytorze, a to nie zmienia mtime katalogu.
+        browser_levels.refresh(force=True)
+        browser_thumbnails.clear()
         state = GameState.LEVEL_BROWSER
 
     def keep_browser_selection_visible(item_count):
@@ -288,8 +285,9 @@ def main():
                 pass
 
     # Funkcja do rozpoczęcia poziomu
-    def start_level(level_filename, level_idx, training=False, level_data=None, arcade=False):
-        nonlocal current_level, player, echo, is_on_second_life, player_history, level_time, state, swap_cooldown, current_level_filename, is_training_mode, swap_count, jump_buffer_frames, is_arcade_mode
+    def start_level(level_filename, level_idx, training=False, level_data=None, arcade=False,
+                    prepared=None):
+        nonlocal simulation, recorder, state, current_level_filename, is_training_mode, is_arcade_mode
         if level_data is None:
             level_path = os.path.join(package_dir, level_filename)
             level_data = load_level(level_path)
@@ -299,20 +297,39 @@ def main():
 
         if level_data:
             current_level_filename = level_filename
-            current_level = Level(level_data, level_idx)
-            player = Player(current_level.start_pos[0], current_level.start_pos[1])
-            echo = Player(current_level.start_pos[0], current_level.start_pos[1], is_echo=True)
-            is_on_second_life = False
-            player_history.clear()
-            level_time = 0
-            swap_cooldown = 0
-            swap_count = 0
-            jump_buffer_frames = 0
+            # ``prepared`` to Simulation zbudowana zawczasu przez ArcadePrefetcher.
+            simulation = prepared or Simulation(level_data, level_idx, second_life=not arcade,
+                                                rewind=training)
+            level_info = {"filename": level_filename, "index": level_idx, "training": training}
+            if arcade:
+                level_info.update(arcade_seed=arcade_manager.seed,
+                                  arcade_level=arcade_manager.level_number)
+            recorder = InputRecorder(simulation, level_data, level_info)
             state = GameState.ARCADE if arcade else GameState.PLAYING
+            if arcade:
+                arcade_prefetcher.request()
         else:
             state = GameState.MENU
             current_level_index = -1
 
+    def restart_attempt():
+        """Ponowna próba tego samego poziomu: przywraca migawkę startową świata."""
+        nonlocal recorder, state
+        stop_music()
+        simulation.restart()
+        recorder = InputRecorder(simulation, recorder.level_data, recorder.level_info)
+        state = GameState.ARCADE if is_arcade_mode else GameState.PLAYING
+
+    def quantum_swap():
+        """Zamiana z Echem wraz z efektami; próba trafia też do nagrania."""
+        recorder.swap()
+        if simulation.swap():
+            play_sfx("swap")
+            particle_system.add_burst(simulation.player.rect.centerx, simulation.player.rect.centery, PURPLE, 40)
+            particle_system.add_burst(simulation.echo.rect.centerx, simulation.echo.rect.centery, PURPLE, 40)
+            # Dodaj wibracje przy zamianie kwantowej
+            set_vibration(controller, left_motor=0.5, right_motor=0.5, duration=300)
+
     running = True
     while running:
         refresh_level_order()
@@ -369,9 +386,10 @@ def main():
                 if event.type == pygame.KEYDOWN:
                     if browser_delete_pending:
                         if event.key in (pygame.K_RETURN, pygame.K_y):
-                            browser_files = discover_levels(Path(package_dir) / "levels")
+                            browser_files = browser_levels.files
                             if browser_files and browser_selected_index < len(browser_files):
                                 if delete_level(browser_files[browser_selected_index], Path(custom_levels_dir)):
+                                    browser_levels.refresh(force=True)
                                     browser_status = "Poziom usunięty wraz z miniaturą."
                                     browser_selected_index = max(0, browser_selected_index - 1)
                                 else:
@@ -396,14 +414,14 @@ def main():
                         browser_delete_pending = True
                         browser_status = "Usunąć wybrany poziom? Enter/Y = tak, ESC/N = nie"
                     elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        browser_files = discover_levels(Path(package_dir) / "levels")
+                        browser_files = browser_levels.files
                         if browser_files and browser_selected_index < len(browser_files):
                             current_level_index = browser_selected_index
                             start_level(os.path.relpath(browser_files[browser_selected_index], package_dir), current_level_index, training=True)
                 elif event.type == pygame.MOUSEWHEEL:
                     browser_scroll = max(0, browser_scroll - event.y * 240)
                 elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    browser_files = discover_levels(Path(package_dir) / "levels")
+                    browser_files = browser_levels.files
                     card_width, card_height, gap = 560, 220, 20
                     origin_x, origin_y = 70, 150
                     if pygame.Rect(1000, 82, 240, 42).collidepoint(event.pos):
@@ -420,6 +438,7 @@ def main():
                                 browser_selected_index = index
                                 if browser_delete_pending:
                                     if delete_level(browser_files[index], Path(custom_levels_dir)):
+                                        browser_levels.refresh(force=True)
                                         browser_status = "Poziom usunięty wraz z miniaturą."
                                         browser_selected_index = max(0, browser_selected_index - 1)
                                     else:
@@ -479,7 +498,7 @@ def main():
                         if not is_training_mode:
                             restart_penalty += 50
                             deaths += 1
-                        start_level(current_level_filename, current_level_index, training=is_training_mode)
+                        restart_attempt()
 
                 # --- Obsługa przycisków w różnych stanach gry ---
                 elif event.key == pygame.K_SPACE:
@@ -517,9 +536,9 @@ def main():
                         else:
                             state = GameState.GAME_COMPLETE
                             input_active = True
-                    elif state in (GameState.PLAYING, GameState.ARCADE) and player:
-                        if not player.jump():
-                            jump_buffer_frames = 3
+                    elif state in (GameState.PLAYING, GameState.ARCADE) and simulation:
+                        simulation.jump()
+                        recorder.jump()
                     elif state == GameState.TRAINING_COMPLETE:
                         state = GameState.MENU
                     elif state == GameState.SETTINGS:
@@ -527,14 +546,23 @@ def main():
 
                 # --- Obsługa Zamiany Kwantowej ---
                 elif event.key == pygame.K_q and state in (GameState.PLAYING, GameState.ARCADE):
-                    if player and echo and swap_cooldown == 0 and not is_on_second_life:
-                        player.rect, echo.rect = echo.rect, player.rect
-                        swap_cooldown = SWAP_COOLDOWN_FRAMES
-                        swap_count += 1
-                        play_sfx("swap")
-                        particle_system.add_burst(player.rect.centerx, player.rect.centery, PURPLE, 40)
-                        particle_system.add_burst(echo.rect.centerx, echo.rect.centery, PURPLE, 40)
-                        set_vibration(controller, left_motor=0.5, right_motor=0.5, duration=300)
+                    if simulation:
+                        quantum_swap()
+
+                # --- Cofanie czasu w trybie treningowym (także po śmierci) ---
+                elif (event.key == pygame.K_BACKSPACE and is_training_mode and simulation
+                      and state in (GameState.PLAYING, GameState.GAME_OVER)):
+                    recorder.rewind()
+                    if simulation.rewind():
+                        state = GameState.PLAYING
+                        particle_system.add_burst(simulation.player.rect.centerx,
+                                                  simulation.player.rect.centery, CYAN, 30)
+
+                # --- Zapis powtórki bieżącej próby (raporty błędów) ---
+                elif event.key == pygame.K_F9 and recorder and state != GameState.MENU:
+                    replay_file = os.path.join(REPLAY_DIR, time.strftime("replay_%Y%m%d_%H%M%S.json"))
+                    save_replay(replay_file, recorder.to_dict())
+                    print(f"Zapisano powtórkę: {replay_file}")
 
                 # --- Obsługa innych klawiszy ---
                 elif event.key == pygame.K_i and state == GameState.MENU:
@@ -642,23 +670,24 @@ def main():
                     else:
                         state = GameState.GAME_COMPLETE
                         input_active = True
-                elif state in (GameState.PLAYING, GameState.ARCADE) and player:
-                    if not player.jump():
-                        jump_buffer_frames = 3
+                elif state in (GameState.PLAYING, GameState.ARCADE) and simulation:
+                    simulation.jump()
+                    recorder.jump()
                 elif state == GameState.TRAINING_COMPLETE:
                     state = GameState.MENU
                 elif state == GameState.LEVEL_BROWSER:
                     if browser_delete_pending:
-                        browser_files = discover_levels(Path(package_dir) / "levels")
+                        browser_files = browser_levels.files
                         if browser_files and browser_selected_index < len(browser_files):
                             if delete_level(browser_files[browser_selected_index], Path(custom_levels_dir)):
+                                browser_levels.refresh(force=True)
                                 browser_status = "Poziom usunięty wraz z miniaturą."
                                 browser_selected_index = max(0, browser_selected_index - 1)
                             else:
                                 browser_status = "Nie można usunąć poziomu kampanii."
                         browser_delete_pending = False
                     else:
-                        browser_files = discover_levels(Path(package_dir) / "levels")
+                        browser_files = browser_levels.files
                         if browser_files and browser_selected_index < len(browser_files):
                             current_level_index = browser_selected_index
                             start_level(os.path.relpath(browser_files[browser_selected_index], package_dir), current_level_index, training=True)
@@ -702,15 +731,8 @@ def main():
 
             # Zamiana kwantowa (X button)
             if controller_swap_current and not controller_swap_pressed and state in (GameState.PLAYING, GameState.ARCADE):
-                if player and echo and swap_cooldown == 0 and not is_on_second_life:
-                    player.rect, echo.rect = echo.rect, player.rect
-                    swap_cooldown = SWAP_COOLDOWN_FRAMES
-                    swap_count += 1
-                    play_sfx("swap")
-                    particle_system.add_burst(player.rect.centerx, player.rect.centery, PURPLE, 40)
-                    particle_system.add_burst(echo.rect.centerx, echo.rect.centery, PURPLE, 40)
-                    # Dodaj wibracje przy zamianie kwantowej
-                    set_vibration(controller, left_motor=0.5, right_motor=0.5, duration=300)
+                if simulation:
+                    quantum_swap()
 
             # Pauza (Start button)
             if controller_pause_current and not controller_pause_pressed:
@@ -722,7 +744,7 @@ def main():
                     if not is_training_mode:
                         restart_penalty += 50
                         deaths += 1
-                    start_level(current_level_filename, current_level_index, training=is_training_mode)
+                    restart_attempt()
 
         # Aktualizuj stan przycisków
         controller_jump_pressed = controller_jump_current
@@ -743,58 +765,31 @@ def main():
 
         # --- Aktualizacja logiki gry ---
         player_vel_x_for_parallax = 0
-        if state in (GameState.PLAYING, GameState.ARCADE) and player and current_level:
-            level_time += 1
-            if swap_cooldown > 0:
-                swap_cooldown -= 1
-
+        if state in (GameState.PLAYING, GameState.ARCADE) and simulation:
             keys = pygame.key.get_pressed()
 
-            if jump_buffer_frames > 0:
-                jump_buffer_frames -= 1
-
             # --- INTEGRACJA KONTROLERA Z RUCHEM ---
-            # Bezpieczniejsza integracja kontrolera
             left_pressed = keys[pygame.K_LEFT] or keys[pygame.K_a] or controller_left
             right_pressed = keys[pygame.K_RIGHT] or keys[pygame.K_d] or controller_right
 
-            # Tworzymy własny obiekt klawiszy
-            class KeyState:
-                def __getitem__(self, key):
-                    if key == pygame.K_LEFT or key == pygame.K_a:
-                        return left_pressed
-                    elif key == pygame.K_RIGHT or key == pygame.K_d:
-                        return right_pressed
-                    # Dla innych klawiszy zwracamy False (lub oryginalną wartość jeśli istnieje)
-                    return False
-
-            # --- Aktualizacja gracza ---
-            player.handle_input(KeyState())
+            # Cała logika klatki żyje w Simulation, więc gra i testy bez
+            # okna wykonują dokładnie te same kroki.
+            result = simulation.step(left_pressed, right_pressed)
+            # Klatkę zamykamy od razu: obsługa wyniku może już uruchomić
+            # kolejną próbę z nowym nagraniem.
+            recorder.end_frame(left_pressed, right_pressed)
+            player = simulation.player
             player_vel_x_for_parallax = player.vel_x
 
-            # Świat aktualizujemy przed wyznaczeniem kolizji. Dzięki temu
-            # cache platform jest ważny przez całą klatkę.
-            current_level.update(player_vel_x_for_parallax, player.vel_y)
-
-            # Sprawdzenie, czy gracz ma drugie życie
-            # Ograniczenie historii gracza do ostatnich ECHO_DELAY_FRAMES
-            solid_platforms = current_level.get_solid_platforms()
-            result = player.update(solid_platforms, current_level.hazards,
-                                   current_level.collectibles, current_level.keys,
-                                   time_dilation_zones=current_level.time_dilation_zones)
-
-            if not is_on_second_life:
-                # Zapisujemy stan po fizyce, dzięki czemu Echo odtwarza pełną
-                # klatkę i nie wymaga kosztownego wyszukiwania w deque.
-                player_history.append(player.rect.topleft)
-
-            # Jeśli skok został wciśnięty tuż przed lądowaniem, wykonaj go
-            # natychmiast po wykryciu podłoża.
-            if jump_buffer_frames > 0 and player.jump():
-                jump_buffer_frames = 0
-
             # Sprawdzenie, czy gracz zginął lub zebrał przedmiot
-            if result == "hit" or result == "fell":
+            if result == "echo_takeover":
+                # Gracz umiera, ale ma Echo
+                play_sfx("death")
+                particle_system.add_burst(simulation.death_position[0], simulation.death_position[1], CYAN, 50)
+                # Dodaj wibracje przy śmierci
+                set_vibration(controller, left_motor=0.5, right_motor=0.5, duration=500)
+
+            elif result == "hit" or result == "fell":
                 if is_arcade_mode:
                     deaths += 1
                     play_sfx("death")
@@ -803,30 +798,9 @@ def main():
                     set_vibration(controller, left_motor=1.0, right_motor=1.0, duration=800)
                     particle_system.add_burst(player.rect.centerx, player.rect.centery, RED, 30)
                     if arcade_lives == float("inf") or arcade_lives > 0:
-                        start_level(None, arcade_manager.level_number - 1,
-                                    level_data=arcade_manager.restart_level(), arcade=True)
+                        restart_attempt()
                     else:
                         state = GameState.GAME_OVER
-                elif not is_on_second_life and echo:
-                    # Gracz umiera, ale ma Echo
-                    play_sfx("death")
-                    is_on_second_life = True
-                    particle_system.add_burst(player.rect.centerx, player.rect.centery, CYAN, 50)
-                    # Dodaj wibracje przy śmierci
-                    set_vibration(controller, left_motor=0.5, right_motor=0.5, duration=500)
-
-                    # Przeniesienie stanu gracza do Echa
-                    echo.has_double_jump = player.has_double_jump
-                    echo.invincible = player.invincible
-                    echo.invincible_timer = player.invincible_timer
-
-                    # Przeniesienie historii gracza do Echa
-                    player, echo = echo, player
-                    player.is_echo = False
-                    player.color = BLUE
-                    player.image.fill(player.color)
-
-                    echo = None  # Usuń Echo, aby nie było już aktywne
                 else:
                     if not is_training_mode:
                         deaths += 1
@@ -854,46 +828,60 @@ def main():
                 # Dodaj wibracje przy tarczy
                 set_vibration(controller, left_motor=0.5, right_motor=0.5, duration=300)
 
-            # Sprawdzenie, czy gracz zebrał klucz
-            if echo:
-                history_pos = player_history[0] if len(player_history) == player_history.maxlen else None
-                echo.update(solid_platforms, [], [], [], history_pos=history_pos,
-                            paradox_switches=current_level.paradox_switches)
-
             particle_system.update()
 
             # Sprawdzenie, czy gracz dotarł do strefy wyjścia
-            if player.rect.colliderect(current_level.exit_zone.rect) and not current_level.exit_zone.locked:
+            if simulation.reached_exit():
                 if is_training_mode:
                     state = GameState.TRAINING_COMPLETE
                 elif is_arcade_mode:
                     score += 1000
-                    total_swap_count += swap_count
+                    total_swap_count += simulation.swap_count
                     particle_system.add_burst(player.rect.centerx, player.rect.centery, GREEN, 100)
-                    start_level(None, arcade_manager.level_number,
-                                level_data=arcade_manager.generate_level(), arcade=True)
+                    level_data, prepared = arcade_prefetcher.next_level()
+                    start_level(None, arcade_manager.level_number, level_data=level_data, arcade=True,
+                                prepared=prepared)
                 else:
                     state = GameState.LEVEL_COMPLETE
                     score += 1000
-                    total_swap_count += swap_count
+                    total_swap_count += simulation.swap_count
                     particle_system.add_burst(player.rect.centerx, player.rect.centery, GREEN, 100)
         else:
+            if state == GameState.PAUSED and recorder:
+                recorder.end_frame(paused=True)
             starfield.update(1)
 
         # --- Rysowanie ---
+        if state in (GameState.PLAYING, GameState.ARCADE) and settings["dirty_rects"]:
+            # Obraz bazowy przykrywa cały ekran, więc czyszczenie jest zbędne.
+            restored = dirty_renderer.begin(simulation.level)
+            dirty = simulation.level.draw_dynamic(screen)
+            dirty.append(simulation.player.draw(screen))
+            if simulation.echo: dirty.append(simulation.echo.draw(screen))
+            if simulation.echoes: dirty += simulation.echoes.draw(screen)
+            dirty += particle_system.draw(screen)
+            dirty.append(draw_hud(screen, simulation.player, simulation.gems_left(), not simulation.is_on_second_life,
+                                  simulation.level_time, simulation.swap_cooldown,
+                                  arcade_lives if is_arcade_mode else None,
+                                  arcade_manager.level_number if is_arcade_mode else None))
+            dirty_renderer.finish(restored, dirty)
+            clock.tick(FPS)
+            continue
+
+        dirty_renderer.invalidate()
         screen.fill(BLACK)
 
         # Rysowanie tła
         if state in (GameState.PLAYING, GameState.ARCADE):
-            if current_level:
-                # Tło musi być pierwszą warstwą sceny po wyczyszczeniu ekranu.
-                current_level.background.draw(screen)
-                current_level.draw(screen, draw_background=False)
-            if player: player.draw(screen)
-            if echo: echo.draw(screen)
+            # Tło musi być pierwszą warstwą sceny po wyczyszczeniu ekranu.
+            simulation.level.background.draw(screen)
+            simulation.level.draw(screen, draw_background=False)
+            simulation.player.draw(screen)
+            if simulation.echo: simulation.echo.draw(screen)
+            if simulation.echoes: simulation.echoes.draw(screen)
             particle_system.draw(screen)
-            gems_left = len([c for c in current_level.collectibles if c.type == "gem"])
-            draw_hud(screen, player, gems_left, not is_on_second_life, level_time, swap_cooldown,
+            draw_hud(screen, simulation.player, simulation.gems_left(), not simulation.is_on_second_life,
+                     simulation.level_time, simulation.swap_cooldown,
                      arcade_lives if is_arcade_mode else None,
                      arcade_manager.level_number if is_arcade_mode else None)
 
@@ -1050,7 +1038,8 @@ def main():
             editor_screen.draw(screen, font_small)
 
         elif state == GameState.LEVEL_BROWSER:
-            browser_files = discover_levels(Path(package_dir) / "levels")
+            browser_levels.refresh()
+            browser_files = browser_levels.files
             if browser_files:
                 browser_selected_index = min(browser_selected_index, len(browser_files) - 1)
             else:
@@ -1066,27 +1055,29 @@ def main():
             draw_text("+ NOWY POZIOM (N / Y)", font_small, WHITE, screen, 1120, 103, center=True)
             card_width, card_height, gap = 560, 220, 20
             origin_x, origin_y = 70, 150
-            for index, level_path in enumerate(browser_files):
+            # Rysujemy tylko wiersze przecinające ekran.
+            first_row = max(0, (browser_scroll - origin_y) // (card_height + gap))
+            last_row = (browser_scroll + SCREEN_HEIGHT - origin_y) // (card_height + gap)
+            custom_root = Path(custom_levels_dir)
+            visible = range(first_row * 2, min(len(browser_files), (last_row + 1) * 2))
+            browser_thumbnails.retain(browser_files[index] for index in visible)
+            for index in visible:
+                level_path = browser_files[index]
+                entry = browser_entry(level_path, custom_root)
                 column, row = index % 2, index // 2
                 rect = pygame.Rect(origin_x + column * (card_width + gap),
                                    origin_y + row * (card_height + gap) - browser_scroll, card_width, card_height)
                 selected = index == browser_selected_index
                 pygame.draw.rect(screen, (45, 55, 82) if selected else (30, 36, 58), rect, border_radius=8)
-                cache_key = str(level_path)
-                if cache_key not in thumbnail_cache:
-                    thumbnail_cache[cache_key] = load_thumbnail(level_path)
-                thumbnail = thumbnail_cache[cache_key]
+                # Do czasu wczytania miniatury rysujemy zaślepkę.
+                thumbnail = browser_thumbnails.get(level_path)
                 if thumbnail:
-                    preview = pygame.transform.scale(thumbnail, (320, 180))
-                    screen.blit(preview, (rect.x + 12, rect.y + 12))
-                title = level_path.stem.replace("_", " ")
-                draw_text(title, font_medium, WHITE, screen, rect.x + 350, rect.y + 45)
+                    screen.blit(thumbnail, (rect.x + 12, rect.y + 12))
+                else:
+                    pygame.draw.rect(screen, (22, 27, 45), (rect.x + 12, rect.y + 12, 320, 180))
+                draw_text(entry.title, font_medium, WHITE, screen, rect.x + 350, rect.y + 45)
                 draw_text("KLIKNIJ, ABY GRAĆ", font_small, GREEN, screen, rect.x + 350, rect.y + 95)
-                try:
-                    deletable = level_path.resolve().relative_to(Path(custom_levels_dir).resolve()) is not None
-                except ValueError:
-                    deletable = False
-                if deletable:
+                if entry.deletable:
                     pygame.draw.rect(screen, (115, 45, 55), (rect.x + 350, rect.y + 145, 190, 35), border_radius=4)
                     draw_text("USUŃ (DELETE / B)", font_small, WHITE, screen, rect.x + 445, rect.y + 163, center=True)
             draw_text(browser_status, font_small, YELLOW if browser_delete_pending else GRAY,
@@ -1097,15 +1088,16 @@ def main():
 
         # Pauza
         elif state == GameState.PAUSED:
-            if current_level:
-                current_level.background.draw(screen)
-                current_level.draw(screen, draw_background=False)
-            if player: player.draw(screen)
-            if echo: echo.draw(screen)
+            if simulation:
+                simulation.level.background.draw(screen)
+                simulation.level.draw(screen, draw_background=False)
+                simulation.player.draw(screen)
+                if simulation.echo: simulation.echo.draw(screen)
+                if simulation.echoes: simulation.echoes.draw(screen)
             particle_system.draw(screen)
-            gems_left = len([c for c in current_level.collectibles if c.type == "gem"]) if current_level else 0
-            if player:
-                draw_hud(screen, player, gems_left, not is_on_second_life, level_time, swap_cooldown,
+            if simulation:
+                draw_hud(screen, simulation.player, simulation.gems_left(), not simulation.is_on_second_life,
+                         simulation.level_time, simulation.swap_cooldown,
                          arcade_lives if is_arcade_mode else None,
                          arcade_manager.level_number if is_arcade_mode else None)
 
@@ -1153,9 +1145,9 @@ def main():
             draw_text(f"Wynik: {score - restart_penalty}", font_medium, WHITE, screen, SCREEN_WIDTH // 2, y_pos,
                       center=True)
             y_pos += 50
-            draw_text(f"Czas: {level_time // 60}s", font_medium, WHITE, screen, SCREEN_WIDTH // 2, y_pos, center=True)
+            draw_text(f"Czas: {simulation.level_time // 60}s", font_medium, WHITE, screen, SCREEN_WIDTH // 2, y_pos, center=True)
             y_pos += 50
-            draw_text(f"Użyte zamiany: {swap_count}", font_medium, WHITE, screen, SCREEN_WIDTH // 2, y_pos, center=True)
+            draw_text(f"Użyte zamiany: {simulation.swap_count}", font_medium, WHITE, screen, SCREEN_WIDTH // 2, y_pos, center=True)
             if restart_penalty > 0:
                 y_pos += 50
                 draw_text(f"Kara za restarty: -{restart_penalty} pkt", font_medium, RED, screen, SCREEN_WIDTH // 2,
@@ -1255,7 +1247,7 @@ def main():
             pygame.draw.rect(screen, WHITE, input_box_rect, 2)
 
             # Rysuj tekst gracza
-            player_text_surf = font_medium.render(player_name, True, WHITE)
+            player_text_surf = render_text(font_medium, player_name, WHITE)
             player_text_rect = player_text_surf.get_rect(center=input_box_rect.center)
             screen.blit(player_text_surf, player_text_rect)
 
@@ -1307,4 +1299,6 @@ def main():
         pygame.display.flip()
         clock.tick(FPS)
 
+    arcade_prefetcher.shutdown()
+    browser_thumbnails.shutdown()
     pygame.quit()
@@ -3,22 +3,62 @@
 Generator rozdziela "Golden Path" od elementów dodatkowych. Golden Path jest
 tworzony wyłącznie w granicach wynikających z fizyki Playera, więc losowość nie
 może wylosować obowiązkowego skoku, którego gracz nie jest w stanie wykonać.
+
+Marginesy nie wykluczają jednak kolizji z resztą układu (np. platforma odnogi
+nad miejscem wybicia), dlatego każdy poziom sprawdza ``solver.solve``. Układ
+bez przejścia start -> klucz -> wyjście jest naprawiany (platformy czasowe
+stają się stałe) albo losowany ponownie. Wynik jest zapamiętany dla pary
+(seed, numer poziomu), więc ponowne wygenerowanie poziomu nie uruchamia solvera.
 """
 
 import math
 import random
+from typing import NamedTuple
 
 from .config import (GRAVITY, JUMP_FORCE, PLAYER_HEIGHT, PLAYER_SPEED,
                      PLAYER_WIDTH, SCREEN_HEIGHT, SCREEN_WIDTH)
+from .solver import solve
+from .spatial import IntervalIndex
+
+# Zwiększ przy każdej zmianie, która zmienia wygenerowane poziomy (unieważnia LevelCache).
+# Wersja 2: solver uwzględnia kolce, więc część układów jest naprawiana lub losowana ponownie.
+GENERATOR_VERSION = 2
+MAX_LAYOUT_ATTEMPTS = 8
+
+# (seed, numer poziomu) -> (próba, czy naprawiony, czy zweryfikowany); wspólne dla procesu.
+_VERIFIED_LAYOUTS = {}
+
+
+def solidify_temporal(level_data):
+    """Kopia poziomu, w której platformy czasowe są zwykłymi platformami."""
+    solid = [{key: platform[key] for key in ("x", "y", "width", "height")}
+             for platform in level_data.get("temporal_platforms", [])]
+    return {**level_data, "platforms": level_data["platforms"] + solid, "temporal_platforms": []}
+
+
+class ArcadeLevel(NamedTuple):
+    number: int
+    data: dict
+    golden_path: list
+    attempt: int = 0
+    repaired: bool = False
+    verified: bool = True  # Czy solver potwierdził przejście start -> klucz -> wyjście
 
 
 class ArcadeManager:
-    def __init__(self, seed=None):
+    golden_path_segments = 18
+
+    def __init__(self, seed=None, cache=None):
         self.seed = seed if seed is not None else random.randrange(1 << 30)
+        # Opcjonalny LevelCache (level_cache.py) z poziomami zapisanymi na dysku.
+        self.cache = cache
         self.level_number = 0
         self.difficulty_level = 0
         self.current_data = None
         self.golden_path = []
+        self.layout_attempt = 0
+        self.layout_repaired = False
+        self.layout_verified = True
         # Player.rect ma obecnie 40 px wysokości. Headroom dotyczy tylko
         # platform, które przecinają ten sam pionowy korytarz ruchu gracza.
         self.player_width = PLAYER_WIDTH
@@ -40,11 +80,17 @@ class ArcadeManager:
         Platformy rozdzielone poziomo nie tworzą sufitu nad graczem, dlatego
         analizujemy tylko te, które mają wspólny korytarz X. To pozwala budować
         wykonalne rozpadliny, ale odrzuca układy z niskim sufitem.
+        ``platforms`` może być listą albo ``IntervalIndex`` po osi X; indeks
+        zawęża przegląd do platform, które mogą mieć wspólny korytarz. Opłaca
+        się to dopiero przy układach szerszych niż ekran: generator trzyma
+        listę, bo w granicach SCREEN_WIDTH korytarz X niczego nie odrzuca.
         """
         candidate_left = candidate["x"]
         candidate_right = candidate["x"] + candidate["width"]
         candidate_top = candidate["y"]
         candidate_bottom = candidate["y"] + candidate["height"]
+        if isinstance(platforms, IntervalIndex):
+            platforms = platforms.candidates(candidate_left, candidate_right)
         for platform in platforms:
             left = platform["x"]
             right = platform["x"] + platform["width"]
@@ -71,6 +117,7 @@ class ArcadeManager:
         """
         start = {"x": 0, "y": 680, "width": 280, "height": 40}
         path = [start]
+        placed = [start]
         y = start["y"]
         vertical_phase = "up"
         step = 0
@@ -78,7 +125,7 @@ class ArcadeManager:
 
         # Stała liczba segmentów daje czas na dojście do obu ekstremów
         # ekranu, zamiast kończyć poziom zaraz po pierwszym ruchu w prawo.
-        while step < 18:
+        while step < self.golden_path_segments:
             previous = path[-1]
             gap = rng.randint(self.player_width + 10, max_gap)
             width = rng.randint(155, 205)
@@ -110,7 +157,7 @@ class ArcadeManager:
                 vertical_phase = "up"
 
             platform = {"x": int(next_x), "y": int(next_y), "width": width, "height": 24}
-            if not self.has_sufficient_airspace(platform, path):
+            if not self.has_sufficient_airspace(platform, placed):
                 # Wymuś rozdzielenie korytarzy X, zachowując kierunek skoku.
                 if next_x >= previous["x"]:
                     platform["x"] = min(SCREEN_WIDTH - width,
@@ -118,33 +165,82 @@ class ArcadeManager:
                 else:
                     platform["x"] = max(0, previous["x"] - width - self.player_width - 10)
             path.append(platform)
+            placed.append(platform)
             y = platform["y"]
             step += 1
         return path
 
+    def _layout_rng(self, level_number, attempt):
+        # Próba 0 zachowuje pierwotne ziarno, więc poprawne poziomy się nie zmieniają.
+        return random.Random(self.seed + level_number * 7919 + attempt * 104729)
+
     def generate_level(self):
-        self.level_number += 1
-        rng = random.Random(self.seed + self.level_number * 7919)
-        self.difficulty_level = self.level_number
-        difficulty = self.difficulty_level
+        return self.accept(self.build(self.level_number + 1))
+
+    def accept(self, level):
+        """Ustawia zbudowany poziom jako bieżący i zwraca jego dane."""
+        self.level_number = self.difficulty_level = level.number
+        self.current_data = level.data
+        self.golden_path = level.golden_path
+        self.layout_attempt = level.attempt
+        self.layout_repaired = level.repaired
+        self.layout_verified = level.verified
+        return self.current_data
+
+    def build(self, level_number):
+        """Buduje i weryfikuje poziom bez zmiany stanu menedżera (także w innym wątku)."""
+        if self.cache is not None:
+            entry = self.cache.load(self.seed, level_number)
+            if entry is not None:
+                fields = {name: entry[name] for name in ArcadeLevel._fields}
+                return ArcadeLevel(**fields)
+        difficulty = level_number
+        key = (self.seed, level_number)
+        verified = True
+        if key in _VERIFIED_LAYOUTS:
+            attempt, repaired, verified = _VERIFIED_LAYOUTS[key]
+            data, golden_path = self._build_level(self._layout_rng(level_number, attempt), difficulty)
+            if repaired:
+                data = solidify_temporal(data)
+        else:
+            for attempt in range(MAX_LAYOUT_ATTEMPTS):
+                data, golden_path = self._build_level(self._layout_rng(level_number, attempt),
+                                                      difficulty)
+                repaired = False
+                if solve(data).solvable:
+                    break
+                data = solidify_temporal(data)
+                repaired = True
+                if solve(data).solvable:
+                    break
+            else:
+                # Gdy żadna próba nie przejdzie, zostaje ostatni, naprawiony układ.
+                verified = False
+            _VERIFIED_LAYOUTS[key] = (attempt, repaired, verified)
+        level = ArcadeLevel(level_number, data, golden_path, attempt, repaired, verified)
+        if self.cache is not None:
+            self.cache.store(self.seed, level_number, level._asdict())
+        return level
+
+    def _build_level(self, rng, difficulty):
         max_gap = min(self.safe_horizontal_reach, 70 + min(55, difficulty * 8))
-        self.golden_path = self._make_golden_path(rng, difficulty)
+        golden_path = self._make_golden_path(rng, difficulty)
 
         # Klucz znajduje się w środku ścieżki: najpierw gracz musi dotrzeć do
         # niego, dopiero potem może kontynuować do zablokowanego wyjścia.
-        key_index = max(1, min(len(self.golden_path) - 2,
-                               len(self.golden_path) // 2))
+        key_index = max(1, min(len(golden_path) - 2,
+                               len(golden_path) // 2))
 
         temporal_ratio = min(0.40, 0.28 + difficulty * 0.02)
-        temporal_count = max(1, math.ceil(len(self.golden_path) * temporal_ratio))
-        temporal_candidates = [index for index in range(1, len(self.golden_path) - 1)
+        temporal_count = max(1, math.ceil(len(golden_path) * temporal_ratio))
+        temporal_candidates = [index for index in range(1, len(golden_path) - 1)
                                if index != key_index]
         rng.shuffle(temporal_candidates)
         temporal_indices = set(temporal_candidates[:min(temporal_count, len(temporal_candidates))])
 
         platforms = []
         temporal = []
-        for index, platform in enumerate(self.golden_path):
+        for index, platform in enumerate(golden_path):
             if index in temporal_indices:
                 temporal.append({**platform, "initial_state": "solid",
                                  "solid_time": max(90, 180 - difficulty * 3),
@@ -158,7 +254,7 @@ class ArcadeManager:
         optional_platforms = []
         branches = []
         for branch_index in range(branch_count):
-            anchor = self.golden_path[2 + (branch_index * 4) % max(1, len(self.golden_path) - 3)]
+            anchor = golden_path[2 + (branch_index * 4) % max(1, len(golden_path) - 3)]
             branch = []
             previous = anchor
             direction = -1 if anchor["x"] > SCREEN_WIDTH // 2 else 1
@@ -191,7 +287,7 @@ class ArcadeManager:
         # Golden Path nie ma kolców na górnej powierzchni lądowania. Część
         # kolców trafia pod platformy (ryzyko przy skoku), reszta na odnogi,
         # ale nie na ich końcowe platformy z nagrodą.
-        for index, platform in enumerate(self.golden_path[1:]):
+        for index, platform in enumerate(golden_path[1:]):
             if len(hazards) >= hazard_count:
                 break
             if index % 2 == 0:
@@ -214,12 +310,12 @@ class ArcadeManager:
                 collectibles.append({"x": reward_platform["x"] + 20 + offset * 38,
                                      "y": reward_platform["y"] - 32, "type": collectible_type})
 
-        key_platform = self.golden_path[key_index]
+        key_platform = golden_path[key_index]
         buttons = [{"x": key_platform["x"] + key_platform["width"] // 2 - 20,
                     "y": key_platform["y"] - 40}]
 
-        last = self.golden_path[-1]
-        self.current_data = {
+        last = golden_path[-1]
+        data = {
             "platforms": platforms,
             "temporal_platforms": temporal,
             "hazards": hazards,
@@ -231,7 +327,4 @@ class ArcadeManager:
             "difficulty_level": difficulty,
             "branches": branches,
         }
-        return self.current_data
-
-    def restart_level(self):
-        return self.current_data
+        return data, golden_path
@@ -0,0 +1,88 @@
+"""Scalanie kafli z edytora w duże prostokąty podczas wczytywania poziomu.
+
+Edytor zapisuje każdą zamalowaną komórkę jako osobną platformę 32x32. Bez
+scalania każda z nich dostaje własną powierzchnię z teksturą i jest osobno
+sprawdzana w kolizjach. Tutaj sąsiadujące elementy tego samego rodzaju są
+łączone w prostokąty, które dokładnie pokrywają ten sam obszar.
+"""
+
+# Pola (z wartościami domyślnymi jak w ``Level``), które muszą być równe,
+# aby dwa elementy można było połączyć.
+TEMPORAL_KEYS = {'initial_state': 'solid', 'solid_time': 180, 'phased_time': 120}
+HAZARD_KEYS = {'type': 'spike'}
+
+
+def compact_level_data(level_data):
+    """Zwraca kopię danych poziomu ze scalonymi platformami i pułapkami.
+
+    Ruchome platformy zostają bez zmian. Pułapki łączymy tylko w poziomie,
+    a liczba zębów kolców (``teeth``) zachowuje ich wygląd.
+    """
+    compacted = dict(level_data)
+    if level_data.get('platforms'):
+        moving = [p for p in level_data['platforms'] if p.get('moving', False)]
+        still = [p for p in level_data['platforms'] if not p.get('moving', False)]
+        compacted['platforms'] = merge_rects(still) + moving
+    if level_data.get('temporal_platforms'):
+        compacted['temporal_platforms'] = merge_rects(level_data['temporal_platforms'], TEMPORAL_KEYS)
+    if level_data.get('hazards'):
+        compacted['hazards'] = merge_rects(level_data['hazards'], HAZARD_KEYS, vertical=False,
+                                           count='teeth')
+    return compacted
+
+
+def merge_rects(items, keys=None, vertical=True, count=None):
+    """Łączy stykające się prostokąty o tych samych wartościach ``keys``.
+
+    Dwa prostokąty są łączone tylko wtedy, gdy mają wspólną całą krawędź, więc
+    wynik pokrywa dokładnie ten sam obszar. Kolejność wyniku odpowiada
+    pierwszemu wystąpieniu elementu w danych wejściowych. Pole ``count``
+    (domyślnie 1 na element) jest sumowane przy łączeniu.
+    """
+    keys = keys or {}
+    groups = {}
+    for index, item in enumerate(items):
+        signature = tuple(item.get(key, default) for key, default in keys.items())
+        merged = dict(item)
+        merged['_order'] = index
+        groups.setdefault(signature, []).append(merged)
+
+    result = []
+    for group in groups.values():
+        changed = True
+        while changed:
+            changed = _merge_pass(group, True, count)
+            if vertical:
+                changed = _merge_pass(group, False, count) or changed
+        result.extend(group)
+
+    result.sort(key=lambda item: item['_order'])
+    for item in result:
+        del item['_order']
+    return result
+
+
+def _merge_pass(group, horizontal, count):
+    """Jeden przebieg łączenia w wierszach (lub kolumnach); zwraca True przy zmianie."""
+    if horizontal:
+        lane = lambda item: (item['y'], item['height'])
+        start, size = 'x', 'width'
+    else:
+        lane = lambda item: (item['x'], item['width'])
+        start, size = 'y', 'height'
+
+    group.sort(key=lambda item: (lane(item), item[start]))
+    merged = []
+    for item in group:
+        previous = merged[-1] if merged else None
+        if (previous is not None and lane(previous) == lane(item)
+                and previous[start] + previous[size] == item[start]):
+            previous[size] += item[size]
+            previous['_order'] = min(previous['_order'], item['_order'])
+            if count:
+                previous[count] = previous.get(count, 1) + item.get(count, 1)
+            continue
+        merged.append(item)
+    changed = len(merged) != len(group)
+    group[:] = merged
+    return changed
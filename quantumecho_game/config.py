@@ -11,6 +11,14 @@ JUMP_FORCE = -15
 PLAYER_WIDTH = 40
 PLAYER_HEIGHT = 40
 
+# Mechaniki czasu: opóźnienie Echa, odnowienie Zamiany i bufor skoku.
+ECHO_DELAY_FRAMES = 600
+SWAP_COOLDOWN_FRAMES = 180
+JUMP_BUFFER_FRAMES = 3
+# Cofanie czasu w treningu: migawka co pół sekundy, pamięć 20 sekund.
+REWIND_INTERVAL_FRAMES = 30
+REWIND_SNAPSHOTS = 40
+
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 BLUE = (100, 149, 237)
@@ -0,0 +1,100 @@
+"""Wiele jednoczesnych Ech o różnych opóźnieniach.
+
+Poziom może podać listę ``echo_delays`` (w klatkach). Najdłuższe opóźnienie
+obsługuje zwykłe Echo z ``Simulation`` (zamiana, przejęcie po śmierci), a
+pozostałe trafiają do ``EchoGroup``. Grupa czyta wspólną ``EchoHistory``
+jednym wsadowym przebiegiem NumPy: pozycje wszystkich Ech, test nacisku
+przełączników i lista blitów powstają bez osobnego ``Player.update`` dla
+każdego Echa.
+"""
+
+import math
+
+import numpy as np
+import pygame
+
+from .config import CYAN, PLAYER_HEIGHT, PLAYER_WIDTH
+from .history import FIELDS
+
+GLOW_PHASES = 32
+GLOW_MARGIN = 5
+
+
+class EchoGroup:
+    """Zbiór Ech odtwarzających tę samą historię z różnym opóźnieniem."""
+
+    def __init__(self, history, delays, start_pos, switches=()):
+        self.history = history
+        self.delays = np.array(sorted(delays), dtype=np.intp)
+        if len(self.delays) and self.delays[-1] >= history.capacity:
+            raise ValueError("Opóźnienie Echa przekracza długość historii.")
+        # Widok bez kopiowania: bufor historii nie zmienia rozmiaru.
+        self._frames = np.frombuffer(history.data, dtype=np.float64).reshape(-1, FIELDS)
+        self.positions = np.tile(np.array(start_pos, dtype=np.int32), (len(self.delays), 1))
+        self.switches = list(switches)
+        rects = [switch.rect for switch in self.switches]
+        self._switch_boxes = np.array([(r.left, r.top, r.right, r.bottom) for r in rects],
+                                      dtype=np.int32).reshape(-1, 4)
+        self.pulse_effect = 0.0
+
+    def __len__(self):
+        return len(self.delays)
+
+    def update(self):
+        """Ustawia wszystkie Echa i naciska przełączniki; zwraca wynik jak ``Player.update``."""
+        self.pulse_effect = (self.pulse_effect + 0.1) % (2 * math.pi)
+        history = self.history
+        ready = self.delays < len(history)
+        if ready.any():
+            rows = (history.head - 1 - self.delays[ready]) % history.capacity
+            self.positions[ready] = self._frames[rows, :2]
+
+        if not self.switches:
+            return None
+        x = self.positions[:, 0:1]
+        y = self.positions[:, 1:2]
+        boxes = self._switch_boxes
+        # Macierz Ech x przełączników, taka sama reguła jak Rect.colliderect.
+        overlap = ((x < boxes[:, 2]) & (x + PLAYER_WIDTH > boxes[:, 0])
+                   & (y < boxes[:, 3]) & (y + PLAYER_HEIGHT > boxes[:, 1]))
+        result = None
+        for index in np.flatnonzero(overlap.any(axis=0)):
+            if self.switches[index].activate():
+                result = "paradox_switch"
+        return result
+
+    def snapshot(self):
+        return self.positions.copy(), self.pulse_effect
+
+    def restore(self, snapshot):
+        positions, self.pulse_effect = snapshot
+        self.positions[:] = positions
+
+    def rects(self):
+        return [pygame.Rect(int(x), int(y), PLAYER_WIDTH, PLAYER_HEIGHT) for x, y in self.positions]
+
+    def draw(self, surface):
+        """Rysuje wszystkie Echa; zwraca listę zmienionych prostokątów."""
+        frame = _echo_frames()[int(self.pulse_effect / (2 * math.pi) * GLOW_PHASES) % GLOW_PHASES]
+        return surface.blits([(frame, (int(x) - GLOW_MARGIN, int(y) - GLOW_MARGIN))
+                              for x, y in self.positions])
+
+
+_ECHO_FRAMES = []
+
+
+def _echo_frames():
+    """Klatki pulsującej poświaty z ciałem Echa, tworzone raz na proces."""
+    if not _ECHO_FRAMES:
+        size = (PLAYER_WIDTH + 2 * GLOW_MARGIN, PLAYER_HEIGHT + 2 * GLOW_MARGIN)
+        body = pygame.Surface((PLAYER_WIDTH, PLAYER_HEIGHT))
+        body.fill(CYAN)
+        body.set_alpha(100)
+        center = (size[0] // 2, size[1] // 2)
+        for phase in range(GLOW_PHASES):
+            radius = PLAYER_WIDTH // 2 + int(GLOW_MARGIN * math.sin(2 * math.pi * phase / GLOW_PHASES))
+            frame = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.circle(frame, (*CYAN, 50), center, radius)
+            frame.blit(body, (GLOW_MARGIN, GLOW_MARGIN))
+            _ECHO_FRAMES.append(frame)
+    return _ECHO_FRAMES
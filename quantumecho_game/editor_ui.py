@@ -8,8 +8,14 @@ drugiej pętli Pygame.
 from __future__ import annotations
 
 import copy
+import functools
 import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 import pygame
 
@@ -20,6 +26,9 @@ CANVAS_HEIGHT = 640
 PANEL_WIDTH = 320
 CELL_SIZE = 32
 THUMBNAIL_SIZE = (320, 180)
+INDEX_POLL_INTERVAL = 1.0  # Sekundy między sprawdzeniami mtime katalogów
+THUMBNAIL_CACHE_SIZE = 64  # Miniatur trzymanych w pamięci przeglądarki
+BROWSER_ENTRY_CACHE_SIZE = 4096
 
 TOOLS = [
     ("platform", "Platforma", (115, 75, 50)),
@@ -79,14 +88,19 @@ def _draw_preview(surface: pygame.Surface, data: dict) -> None:
         pygame.draw.rect(surface, color, rect_for(item), 2)
 
 
+def render_preview(data: dict, size: tuple[int, int] = THUMBNAIL_SIZE) -> pygame.Surface:
+    preview = pygame.Surface(size)
+    _draw_preview(preview, data)
+    return preview
+
+
 def save_level(data: dict, path: Path) -> Path:
     """Atomowo zapisuje JSON i generuje miniaturę z ``pygame.Surface``."""
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8") as stream:
         json.dump(data, stream, indent=4, ensure_ascii=False)
         stream.write("\n")
-    thumbnail = pygame.Surface(THUMBNAIL_SIZE)
-    _draw_preview(thumbnail, data)
+    thumbnail = render_preview(data)
     thumbnail_file = thumbnail_path(path)
     thumbnail_file.parent.mkdir(parents=True, exist_ok=True)
     pygame.image.save(thumbnail, str(thumbnail_file))
@@ -96,8 +110,7 @@ def save_level(data: dict, path: Path) -> Path:
 def ensure_thumbnail(path: Path) -> Path:
     thumbnail = thumbnail_path(path)
     if not thumbnail.exists():
-        preview = pygame.Surface(THUMBNAIL_SIZE)
-        _draw_preview(preview, read_level(path))
+        preview = render_preview(read_level(path))
         thumbnail.parent.mkdir(parents=True, exist_ok=True)
         pygame.image.save(preview, str(thumbnail))
     return thumbnail
@@ -113,12 +126,29 @@ def load_thumbnail(path: Path) -> pygame.Surface | None:
         return None
 
 
-def delete_level(path: Path, custom_root: Path) -> bool:
-    """Usuwa wyłącznie poziom użytkownika i jego miniaturę."""
+def is_custom_level(path: Path, custom_root: Path) -> bool:
     try:
         path.resolve().relative_to(custom_root.resolve())
     except ValueError:
         return False
+    return True
+
+
+class BrowserEntry(NamedTuple):
+    title: str
+    deletable: bool
+
+
+@functools.lru_cache(maxsize=BROWSER_ENTRY_CACHE_SIZE)
+def browser_entry(path: Path, custom_root: Path) -> BrowserEntry:
+    """Opis karty przeglądarki; liczony raz na ścieżkę (``resolve`` sięga do dysku)."""
+    return BrowserEntry(path.stem.replace("_", " "), is_custom_level(path, custom_root))
+
+
+def delete_level(path: Path, custom_root: Path) -> bool:
+    """Usuwa wyłącznie poziom użytkownika i jego miniaturę."""
+    if not is_custom_level(path, custom_root):
+        return False
     if not path.is_file():
         return False
     path.unlink()
@@ -243,3 +273,126 @@ class LevelEditor:
 
 def discover_levels(level_dir: Path) -> list[Path]:
     return sorted((path for path in level_dir.rglob("*.json") if path.is_file()), key=lambda p: str(p).lower())
+
+
+def _mtime(directory: Path) -> int | None:
+    try:
+        return directory.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+class LevelIndex:
+    """Lista poziomów jak z ``discover_levels``, odświeżana tylko po zmianach.
+
+    Dodanie lub usunięcie pliku zmienia mtime katalogu, więc zamiast pełnego
+    ``rglob`` co klatkę wystarczy co ``interval`` sekund sprawdzić mtime
+    znanych katalogów. Nadpisanie istniejącego pliku nie jest wykrywane —
+    przeglądarka wymusza wtedy odświeżenie przy każdym otwarciu.
+    """
+
+    def __init__(self, level_dir: Path, interval: float = INDEX_POLL_INTERVAL):
+        self.level_dir = Path(level_dir)
+        self.interval = interval
+        self.files: list[Path] = []
+        self._directories: dict[Path, int | None] = {}
+        self._checked = None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Aktualizuje ``files``; zwraca True, gdy katalog został przeskanowany."""
+        now = time.monotonic()
+        if not force and self._checked is not None and now - self._checked < self.interval:
+            return False
+        self._checked = now
+        if not force and self._directories and all(
+                _mtime(directory) == mtime for directory, mtime in self._directories.items()):
+            return False
+        files, self._directories = [], {}
+        self._scan(self.level_dir, files)
+        self.files = sorted(files, key=lambda p: str(p).lower())
+        return True
+
+    def _scan(self, directory: Path, files: list[Path]) -> None:
+        # mtime przed listowaniem, aby zmiana w trakcie skanu wymusiła kolejny
+        self._directories[directory] = _mtime(directory)
+        try:
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                self._scan(Path(entry.path), files)
+            elif entry.name.endswith(".json") and entry.is_file():
+                files.append(Path(entry.path))
+
+
+def _load_scaled_thumbnail(path: Path, size: tuple[int, int]) -> pygame.Surface | None:
+    try:
+        thumbnail = pygame.image.load(str(ensure_thumbnail(path)))
+    except (pygame.error, OSError, ValueError):
+        return None
+    if thumbnail.get_size() != size:
+        thumbnail = pygame.transform.scale(thumbnail, size)
+    return thumbnail
+
+
+class ThumbnailLoader:
+    """Miniatury poziomów wczytywane i skalowane w wątku roboczym.
+
+    ``get`` nigdy nie czeka: zwraca gotową miniaturę albo None (do czasu
+    wczytania przeglądarka rysuje zaślepkę). Gotowe miniatury trzyma cache
+    LRU o rozmiarze ``capacity``. Przeglądarka co klatkę podaje ``retain``
+    karty widoczne na ekranie, dzięki czemu przewinięte karty nie czekają w
+    kolejce przed widocznymi i nie trzymają pamięci poza cache.
+    """
+
+    def __init__(self, size: tuple[int, int] = THUMBNAIL_SIZE, capacity: int = THUMBNAIL_CACHE_SIZE):
+        self.size = size
+        self.capacity = capacity
+        self._ready: OrderedDict[str, pygame.Surface | None] = OrderedDict()
+        self._pending = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+
+    def get(self, path: Path) -> pygame.Surface | None:
+        key = str(path)
+        if key in self._ready:
+            self._ready.move_to_end(key)
+            return self._ready[key]
+        future = self._pending.get(key)
+        if future is None:
+            self._pending[key] = self._executor.submit(_load_scaled_thumbnail, path, self.size)
+            return None
+        if not future.done():
+            return None
+        return self._collect(key)
+
+    def retain(self, paths) -> None:
+        """Odbiera gotowe wyniki i porzuca niezaczęte wczytywania spoza ``paths``."""
+        keep = {str(path) for path in paths}
+        for key, future in list(self._pending.items()):
+            if future.done():
+                self._collect(key)
+            elif key not in keep and future.cancel():
+                del self._pending[key]
+
+    def _collect(self, key: str) -> pygame.Surface | None:
+        """Przenosi ukończone wczytywanie do cache LRU."""
+        thumbnail = self._pending.pop(key).result()
+        if thumbnail is not None and pygame.display.get_surface() is not None:
+            thumbnail = thumbnail.convert()
+        self._ready[key] = thumbnail
+        while len(self._ready) > self.capacity:
+            self._ready.popitem(last=False)
+        return thumbnail
+
+    def clear(self) -> None:
+        """Porzuca miniatury (np. po edycji poziomów) i niezaczęte wczytywania."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._ready.clear()
+
+    def shutdown(self) -> None:
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,13 +1,38 @@
 """Ostre efekty pixel-art, klasyczne niebo i lekkie cząsteczki."""
 
+import functools
 import math
 import random
 
+import numpy as np
 import pygame
 
 from .config import SCREEN_HEIGHT
 
 
+# Pulsujące poświaty zmieniają alfę co klatkę; zaokrąglenie do kroku 8 jest
+# niezauważalne, a ogranicza liczbę różnych sprite'ów w cache.
+GLOW_ALPHA_STEP = 8
+GLOW_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=GLOW_CACHE_SIZE)
+def _glow_sprite(radius, color, alpha):
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, (*color, alpha), (radius, radius), radius)
+    return surface
+
+
+def glow_sprite(radius, color, alpha):
+    """Wspólny sprite okrągłej poświaty o promieniu ``radius``.
+
+    Sprite'y są współdzielone (nie wolno po nich rysować) i trzymane w cache
+    LRU o rozmiarze ``GLOW_CACHE_SIZE``.
+    """
+    alpha = max(0, min(255, round(alpha / GLOW_ALPHA_STEP) * GLOW_ALPHA_STEP))
+    return _glow_sprite(radius, tuple(color[:3]), alpha)
+
+
 class Starfield:
     """Tło ekranów menu — niezależne od tła konkretnego poziomu."""
 
@@ -32,7 +57,17 @@ class Starfield:
 
 
 class LevelBackground:
-    """Czyste niebo z ostrymi prostokątnymi chmurami i gwiazdami."""
+    """Czyste niebo z ostrymi prostokątnymi chmurami i gwiazdami.
+
+    Gwiazdy i chmury są tablicami NumPy przesuwanymi jednym krokiem
+    wektorowym. Gwiazdy o zbliżonej paralaksie dzielą warstwę głębi, a każda
+    warstwa jest wypalana raz na powierzchnię z colorkey. Po pierwszym blicie
+    RLE trzyma tylko piksele gwiazd, a rysowanie to cztery blity na warstwę
+    (zawinięcie na krawędziach), niezależnie od liczby gwiazd.
+    """
+
+    STAR_DEPTHS = 2
+    STAR_COLORKEY = (0, 0, 0)
 
     PALETTES = (
         {"name": "Noc", "top": (9, 18, 48), "bottom": (27, 42, 78),
@@ -49,7 +84,8 @@ class LevelBackground:
          "celestial": (244, 158, 94), "body": "sun"},
     )
 
-    def __init__(self, level_index, width, height):
+    def __init__(self, level_index, width, height, rng=None):
+        self.rng = rng or random
         self.level_index = level_index
         self.width = width
         self.height = height
@@ -61,9 +97,26 @@ class LevelBackground:
         self.celestial_color = palette["celestial"]
 
         self.background_surface = self._create_gradient(palette["top"], palette["bottom"])
-        self.clouds = [self._create_cloud(index) for index in range(random.randint(8, 14))]
+        clouds = [self._create_cloud(index) for index in range(self.rng.randint(8, 14))]
+        self.cloud_surfaces = [cloud["surface"] for cloud in clouds]
+        self.cloud_positions = np.array([cloud["pos"] for cloud in clouds], dtype=float)
+        self.cloud_speeds = np.array([cloud["speed"] for cloud in clouds])
+        self.cloud_factors = np.array([(cloud["factor_x"], cloud["factor_y"]) for cloud in clouds])
+        self.cloud_widths = np.array([surface.get_width() for surface in self.cloud_surfaces])
+
         star_count = 0 if self.time_of_day == "Dzień" else (80 if self.time_of_day == "Świt" else 150)
-        self.stars = [self._create_star() for _ in range(star_count)]
+        stars = [self._create_star() for _ in range(star_count)]
+        self.star_positions = np.array([star["pos"] for star in stars], dtype=float).reshape(-1, 2)
+        self.star_sizes = np.array([star["size"] for star in stars], dtype=np.int32)
+        factors = np.array([(star["factor_x"], star["factor_y"]) for star in stars]).reshape(-1, 2)
+        # Warstwa głębi przesuwa się ze średnią paralaksą swoich gwiazd.
+        self.star_depths = np.minimum((factors[:, 0] - 0.025) / 0.055 * self.STAR_DEPTHS,
+                                      self.STAR_DEPTHS - 1).astype(np.intp)
+        self.depth_factors = np.array([factors[self.star_depths == depth].mean(axis=0)
+                                       if (self.star_depths == depth).any() else (0.0, 0.0)
+                                       for depth in range(self.STAR_DEPTHS)])
+        self.star_offsets = np.zeros((self.STAR_DEPTHS, 2))
+        self._star_layers = None  # Wypalane przy pierwszym rysowaniu
         self.celestial_surface = self._create_celestial(palette["body"])
         self.celestial_position = [int(width * 0.78), int(height * 0.18)]
         self.celestial_offset = [0.0, 0.0]
@@ -92,17 +145,17 @@ class LevelBackground:
 
     def _create_cloud(self, index):
         """Pierwotny, charakterystyczny styl chmur Quantum Echo."""
-        cloud_width = random.randint(20, 40)
-        cloud_height = random.randint(10, 20)
+        cloud_width = self.rng.randint(20, 40)
+        cloud_height = self.rng.randint(10, 20)
         base_surface = pygame.Surface((cloud_width, cloud_height), pygame.SRCALPHA)
 
         # Kilka nachodzących na siebie kół dawało pierwotny, przyjemny kształt
         # chmur. Powiększenie nearest-neighbor zachowuje retro krawędzie.
-        for _ in range(random.randint(4, 7)):
-            radius = random.randint(max(2, cloud_height // 3), max(3, cloud_height // 2))
-            x = random.randint(radius, max(radius, cloud_width - radius))
-            y = random.randint(radius, max(radius, cloud_height - radius))
-            color = tuple(max(0, min(255, channel + random.randint(-10, 10)))
+        for _ in range(self.rng.randint(4, 7)):
+            radius = self.rng.randint(max(2, cloud_height // 3), max(3, cloud_height // 2))
+            x = self.rng.randint(radius, max(radius, cloud_width - radius))
+            y = self.rng.randint(radius, max(radius, cloud_height - radius))
+            color = tuple(max(0, min(255, channel + self.rng.randint(-10, 10)))
                           for channel in self.cloud_color)
             pygame.draw.circle(base_surface, color, (x, y), radius)
 
@@ -110,18 +163,21 @@ class LevelBackground:
         scaled_surface = pygame.transform.scale(base_surface,
                                                  (cloud_width * 3, cloud_height * 3))
         return {"surface": scaled_surface,
-                "pos": [random.randint(0, self.width), random.randint(20, int(self.height * 0.6))],
-                "speed": random.uniform(0.2, 0.6),
+                "pos": [self.rng.randint(0, self.width), self.rng.randint(20, int(self.height * 0.6))],
+                "speed": self.rng.uniform(0.2, 0.6),
                 "factor_x": 0.12 + (index % 4) * 0.06,
                 "factor_y": 0.08 + (index % 3) * 0.04}
 
     def _create_star(self):
-        size = random.choice((1, 1, 2, 2, 3))
-        return {"pos": [random.randint(0, self.width), random.randint(0, self.height)],
-                "size": size, "alpha": random.randint(100, 255),
-                "factor_x": random.uniform(0.025, 0.08),
-                "factor_y": random.uniform(0.02, 0.06),
-                "twinkle": random.uniform(0, math.pi * 2)}
+        # Pola "alpha" i "twinkle" nie są używane (gwiazdy zawsze były
+        # rysowane pełnym kolorem), ale losowanie zostaje: ziarno poziomu musi
+        # dawać dalszym elementom tę samą sekwencję liczb.
+        size = self.rng.choice((1, 1, 2, 2, 3))
+        return {"pos": [self.rng.randint(0, self.width), self.rng.randint(0, self.height)],
+                "size": size, "alpha": self.rng.randint(100, 255),
+                "factor_x": self.rng.uniform(0.025, 0.08),
+                "factor_y": self.rng.uniform(0.02, 0.06),
+                "twinkle": self.rng.uniform(0, math.pi * 2)}
 
     def _create_celestial(self, body):
         surface = pygame.Surface((96, 96), pygame.SRCALPHA)
@@ -137,82 +193,138 @@ class LevelBackground:
             pygame.draw.rect(surface, (*self.celestial_color, 190), (8, 45, 80, 6))
         return surface
 
+    def _create_star_layers(self):
+        """Warstwy [głębia] z gwiazdami w pełnym kolorze, zawiniętymi jak torus."""
+        layers = []
+        positions = self.star_positions.astype(int)
+        for depth in range(self.STAR_DEPTHS):
+            layer = pygame.Surface((self.width, self.height))
+            layer.fill(self.STAR_COLORKEY)
+            in_depth = self.star_depths == depth
+            for (x, y), size in zip(positions[in_depth].tolist(), self.star_sizes[in_depth].tolist()):
+                # Gwiazda na krawędzi wystaje po drugiej stronie warstwy.
+                for shift_x in (0, self.width) if x + size > self.width else (0,):
+                    for shift_y in (0, self.height) if y + size > self.height else (0,):
+                        pygame.draw.rect(layer, self.star_color, (x - shift_x, y - shift_y, size, size))
+            layer.set_colorkey(self.STAR_COLORKEY, pygame.RLEACCEL)
+            layers.append(layer)
+        return layers
+
     def update(self, camera_delta_x=0.0, camera_delta_y=0.0):
         self.celestial_offset[0] = (self.celestial_offset[0] - camera_delta_x * 0.03) % self.width
         self.celestial_offset[1] = (self.celestial_offset[1] - camera_delta_y * 0.025) % self.height
-        for cloud in self.clouds:
-            cloud["pos"][0] -= cloud["speed"] + camera_delta_x * cloud["factor_x"]
-            cloud["pos"][1] -= camera_delta_y * cloud["factor_y"]
-            if cloud["pos"][0] < -cloud["surface"].get_width():
-                cloud["pos"][0] = self.width
-            cloud["pos"][1] %= self.height
-        for star in self.stars:
-            star["pos"][0] -= camera_delta_x * star["factor_x"]
-            star["pos"][1] -= camera_delta_y * star["factor_y"]
-            star["twinkle"] += 0.04
-            star["alpha"] = max(80, min(255, int(180 + 75 * math.sin(star["twinkle"]))))
-            star["pos"][0] %= self.width
-            star["pos"][1] %= self.height
+        positions = self.cloud_positions
+        positions[:, 0] -= self.cloud_speeds + camera_delta_x * self.cloud_factors[:, 0]
+        positions[:, 1] -= camera_delta_y * self.cloud_factors[:, 1]
+        positions[positions[:, 0] < -self.cloud_widths, 0] = self.width
+        positions[:, 1] %= self.height
+        self.star_offsets -= self.depth_factors * (camera_delta_x, camera_delta_y)
+        self.star_offsets %= (self.width, self.height)
 
     def draw(self, surface):
         surface.blit(self.background_surface, (0, 0))
         celestial_x = self.celestial_position[0] + int(self.celestial_offset[0])
         celestial_y = self.celestial_position[1] + int(self.celestial_offset[1])
         surface.blit(self.celestial_surface, (celestial_x - 48, celestial_y - 48))
-        for star in self.stars:
-            color = (*self.star_color, star["alpha"])
-            pygame.draw.rect(surface, color,
-                             (int(star["pos"][0]), int(star["pos"][1]), star["size"], star["size"]))
-        for cloud in self.clouds:
-            surface.blit(cloud["surface"], (int(cloud["pos"][0]), int(cloud["pos"][1])))
-
-
-class Particle:
-    def __init__(self, x, y, color, velocity, lifetime):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.vx, self.vy = velocity
-        self.lifetime = lifetime
-        self.max_lifetime = lifetime
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-        self.vy += 0.2
-        self.lifetime -= 1
-
-    def draw(self, surface):
-        if self.lifetime > 0:
-            alpha = int(255 * (self.lifetime / self.max_lifetime))
-            size = int(3 * (self.lifetime / self.max_lifetime))
-            if size > 0:
-                pygame.draw.circle(surface, (*self.color, alpha),
-                                   (int(self.x), int(self.y)), size)
+        if len(self.star_sizes):
+            if self._star_layers is None:
+                self._star_layers = self._create_star_layers()
+            # Każda warstwa głębi zawija się na krawędziach ekranu; bliższa
+            # warstwa przykrywa dalszą.
+            surface.blits([(layer, (x - shift_x, y - shift_y))
+                           for layer, (x, y) in zip(self._star_layers, self.star_offsets.astype(int).tolist())
+                           for shift_x in (0, self.width) for shift_y in (0, self.height)],
+                          doreturn=False)
+        surface.blits([(cloud, (int(x), int(y))) for cloud, (x, y)
+                       in zip(self.cloud_surfaces, self.cloud_positions.tolist())], doreturn=False)
 
 
 class ParticleSystem:
-    def __init__(self):
-        self.particles = []
+    """Pula cząsteczek w układzie struktury tablic NumPy.
+
+    Żywe cząsteczki zajmują pierwsze ``count`` wierszy tablic. ``update``
+    przesuwa je jednym krokiem wektorowym, a ``draw`` rysuje je jednym
+    ``blits`` z gotowych sprite'ów (kolor × rozmiar). Gdy pula jest pełna,
+    nadmiarowe cząsteczki nowego wybuchu są pomijane.
+    """
+
+    CAPACITY = 2048
+    MAX_SIZE = 3
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.lifetime = np.zeros(capacity, dtype=np.int32)
+        self.max_lifetime = np.ones(capacity, dtype=np.int32)
+        self.color = np.zeros(capacity, dtype=np.int32)  # Indeks w self.colors
+        self.colors = []
+        self.count = 0
+        self._sprites = {}
+        self._rng = np.random.default_rng()
+
+    def __len__(self):
+        return self.count
+
+    def _color_index(self, color):
+        color = tuple(color[:3])
+        if color not in self.colors:
+            self.colors.append(color)
+        return self.colors.index(color)
+
+    def _spawn(self, x, y, color, velocity, lifetime):
+        count = min(len(lifetime), self.capacity - self.count)
+        if count <= 0:
+            return
+        rows = slice(self.count, self.count + count)
+        self.position[rows] = (x, y)
+        self.velocity[rows] = velocity[:count]
+        self.lifetime[rows] = lifetime[:count]
+        self.max_lifetime[rows] = lifetime[:count]
+        self.color[rows] = self._color_index(color)
+        self.count += count
 
     def add_burst(self, x, y, color, count=20):
-        for _ in range(count):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 5)
-            self.particles.append(Particle(x, y, color,
-                                           (math.cos(angle) * speed, math.sin(angle) * speed),
-                                           random.randint(20, 40)))
+        angle = self._rng.uniform(0, 2 * math.pi, count)
+        speed = self._rng.uniform(1, 5, count)
+        velocity = np.column_stack((np.cos(angle) * speed, np.sin(angle) * speed))
+        self._spawn(x, y, color, velocity, self._rng.integers(20, 41, count))
 
     def emit_trail(self, x, y, color):
-        self.particles.append(Particle(x, y, color,
-                                       (random.uniform(-0.5, 0.5), random.uniform(0.5, 1.5)),
-                                       random.randint(15, 30)))
+        velocity = np.column_stack((self._rng.uniform(-0.5, 0.5, 1), self._rng.uniform(0.5, 1.5, 1)))
+        self._spawn(x, y, color, velocity, self._rng.integers(15, 31, 1))
 
     def update(self):
-        self.particles = [particle for particle in self.particles if particle.lifetime > 0]
-        for particle in self.particles:
-            particle.update()
+        count = self.count
+        self.position[:count] += self.velocity[:count]
+        self.velocity[:count, 1] += 0.2
+        self.lifetime[:count] -= 1
+        alive = np.flatnonzero(self.lifetime[:count] > 0)
+        if len(alive) < count:
+            self.count = len(alive)
+            for array in (self.position, self.velocity, self.lifetime, self.max_lifetime, self.color):
+                array[:self.count] = array[alive]
+
+    def _sprite(self, color, size):
+        """Koło o promieniu ``size``, takie samo jak z ``pygame.draw.circle``."""
+        key = color, size
+        if key not in self._sprites:
+            rgb = self.colors[color]
+            # Colorkey w kolorze dopełniającym nigdy nie zlewa się z cząsteczką.
+            colorkey = tuple(255 - channel for channel in rgb)
+            sprite = pygame.Surface((size * 2, size * 2))
+            sprite.fill(colorkey)
+            pygame.draw.circle(sprite, rgb, (size, size), size)
+            sprite.set_colorkey(colorkey, pygame.RLEACCEL)
+            self._sprites[key] = sprite
+        return self._sprites[key]
 
     def draw(self, surface):
-        for particle in self.particles:
-            particle.draw(surface)
+        """Rysuje cząsteczki; zwraca listę zmienionych prostokątów."""
+        count = self.count
+        sizes = self.MAX_SIZE * self.lifetime[:count] // self.max_lifetime[:count]
+        visible = np.flatnonzero(sizes > 0)
+        sizes = sizes[visible]
+        corners = self.position[visible].astype(np.intp) - sizes[:, None]
+        return surface.blits([(self._sprite(color, size), (x, y)) for (x, y), color, size
+                              in zip(corners.tolist(), self.color[visible].tolist(), sizes.tolist())])
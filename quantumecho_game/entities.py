@@ -2,16 +2,26 @@
 
 import math
 import random
+
+import numpy as np
 import pygame
 
 from .config import (
     BLACK, BLUE, CYAN, GRAVITY, JUMP_FORCE, ORANGE, PLAYER_SPEED, RED, SCREEN_HEIGHT,
     SCREEN_WIDTH, WHITE, YELLOW, PURPLE, PLAYER_WIDTH, PLAYER_HEIGHT,
 )
-from .runtime import font_medium, font_small
+from .effects import glow_sprite
+from .fonts import font_medium, font_small, render_text
+from .schedule import TemporalSchedule
+from .spatial import nearby
+from .textures import TOP_HEIGHT, texture_cache, texture_variant, tiled_noise, to_surface
 
 class Player(pygame.sprite.Sprite):
     audio_callback = None
+    # Stan zapisywany przez snapshot() poza pozycją prostokąta
+    SNAPSHOT_FIELDS = ('vel_x', 'vel_y', 'on_ground', 'is_echo', 'color', 'has_double_jump',
+                       'double_jump_used', 'invincible', 'invincible_timer', 'animation_timer',
+                       'pulse_effect', 'time_scale', '_motion_accumulator')
 
     @classmethod
     def set_audio_callback(cls, callback):
@@ -65,7 +75,7 @@ class Player(pygame.sprite.Sprite):
                 self.rect.topleft = history_pos
             # Echo jest fizyczne dla przełączników, ale nie zużywa zasobów
             # gracza i nie przejmuje jego kolizji obrażeń/przedmiotów.
-            for switch in paradox_switches:
+            for switch in nearby(paradox_switches, self.rect):
                 if not switch.pressed and self.rect.colliderect(switch.rect):
                     switch.activate()
                     collision_result = "paradox_switch"
@@ -87,6 +97,15 @@ class Player(pygame.sprite.Sprite):
 
         return collision_result
 
+    def snapshot(self):
+        return (self.rect.topleft,) + tuple(getattr(self, name) for name in self.SNAPSHOT_FIELDS)
+
+    def restore(self, snapshot):
+        self.rect.topleft = snapshot[0]
+        for name, value in zip(self.SNAPSHOT_FIELDS, snapshot[1:]):
+            setattr(self, name, value)
+        self.image.fill(self.color)
+
     # Obsługuje wejście gracza
     def handle_input(self, keys):
         # Ruch poziomy
@@ -112,9 +131,11 @@ class Player(pygame.sprite.Sprite):
         return False
 
     def _apply_physics(self, platforms):
-        # Ruch poziomy i kolizje z platformami
+        # Ruch poziomy i kolizje z platformami. Przy indeksie przestrzennym
+        # sprawdzamy tylko platformy wokół drogi przebytej w tej klatce.
+        previous_rect = self.rect.copy()
         self.rect.x += self.vel_x
-        for platform in platforms:
+        for platform in nearby(platforms, previous_rect.union(self.rect)):
             if self.rect.colliderect(platform.rect):
                 if self.vel_x > 0:
                     self.rect.right = platform.rect.left
@@ -125,11 +146,12 @@ class Player(pygame.sprite.Sprite):
         self.vel_y += GRAVITY
         if self.vel_y > 20:
             self.vel_y = 20
+        previous_rect = self.rect.copy()
         self.rect.y += self.vel_y
         self.on_ground = False
 
         # Sprawdź kolizje z platformami
-        for platform in platforms:
+        for platform in nearby(platforms, previous_rect.union(self.rect)):
             if self.rect.colliderect(platform.rect):
                 if self.vel_y > 0:
                     self.rect.bottom = platform.rect.top
@@ -145,7 +167,7 @@ class Player(pygame.sprite.Sprite):
     def _check_other_collisions(self, hazards, collectibles, keys):
         # Kolizje z przeszkodami
         if not self.invincible:
-            if pygame.sprite.spritecollideany(self, hazards):
+            if pygame.sprite.spritecollideany(self, nearby(hazards, self.rect)):
                 return "hit"
 
         # Kolizje z przedmiotami
@@ -187,12 +209,8 @@ class Player(pygame.sprite.Sprite):
     def draw(self, surface):
         # Pulsująca poświata
         pulse_radius = self.rect.width // 2 + int(5 * math.sin(self.pulse_effect))
-        glow_color = (*self.color, 50)
-
-        # Użyj osobnej powierzchni dla poświaty, aby poprawnie obsłużyć alfę
-        glow_surface = pygame.Surface((pulse_radius * 2, pulse_radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, glow_color, (pulse_radius, pulse_radius), pulse_radius)
-        surface.blit(glow_surface, (self.rect.centerx - pulse_radius, self.rect.centery - pulse_radius))
+        glow_surface = glow_sprite(pulse_radius, self.color, 50)
+        dirty = surface.blit(glow_surface, (self.rect.centerx - pulse_radius, self.rect.centery - pulse_radius))
 
         # Ustaw przezroczystość dla echa
         if self.is_echo:
@@ -205,22 +223,22 @@ class Player(pygame.sprite.Sprite):
             shield_radius = self.rect.width // 2 + 8
             shield_alpha = 100 + int(50 * math.sin(self.animation_timer * 2))
             shield_color = (*ORANGE, shield_alpha)
-            pygame.draw.circle(surface, shield_color, self.rect.center, shield_radius, 2)
+            dirty.union_ip(pygame.draw.circle(surface, shield_color, self.rect.center, shield_radius, 2))
 
-        # Rysowanie gracza
-        surface.blit(self.image, self.rect)
+        # Rysowanie gracza; zwracamy obszar ekranu zmieniony przez całą metodę
+        dirty.union_ip(surface.blit(self.image, self.rect))
+        return dirty
 
 # Klasy elementów poziomu
 class Platform(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, moving=False, move_range=100):
         super().__init__()
-        self.image = pygame.Surface((width, height))
+        # Tekstura jest wspólna (zob. textures.py); ParadoxDoor robi własną kopię.
+        self.image = texture_cache.get("dirt", width, height, texture_variant(x, y), self._create_texture)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
 
-        self._create_texture()
-
         # Ruchome platformy
         self.moving = moving
         self.move_range = move_range
@@ -228,39 +246,30 @@ class Platform(pygame.sprite.Sprite):
         self.direction = 1
         self.speed = 2
 
-    def _create_texture(self):
+    @staticmethod
+    def _create_texture(width, height, generator):
         """Tworzy teksturę pixel art dla platformy z większymi 'pikselami' i różnymi odcieniami."""
-        tile_size = 24  # Zwiększony rozmiar "piksela"
         dirt_palette = [
             (87, 56, 40),   # Ciemny brąz
             (70, 45, 32),   # Bardzo ciemny brąz
             (105, 67, 48),  # Jaśniejszy brąz
             (95, 60, 42)    # Inny odcień
         ]
+        pixels = tiled_noise(width, height, dirt_palette, 15, generator)
 
-        # Rysuj większe "piksele" o różnych odcieniach
-        for x_pos in range(0, self.rect.width, tile_size):
-            for y_pos in range(0, self.rect.height, tile_size):
-                tile_color = random.choice(dirt_palette)
-                pygame.draw.rect(self.image, tile_color, (x_pos, y_pos, tile_size, tile_size))
-
-        # Dodaj trochę "szumu" dla lepszej tekstury
-        for _ in range(int(self.rect.width * self.rect.height / 25)):
-            px = random.randint(0, self.rect.width - 1)
-            py = random.randint(0, self.rect.height - 1)
-            base_pixel_color = self.image.get_at((px, py))
-            color_mod = random.randint(-15, 15)
-            dot_color = tuple(max(0, min(255, c + color_mod)) for c in base_pixel_color)
-            self.image.set_at((px, py), dot_color)
-
-        # Dodaj warstwę trawy na wierzchu
-        grass_height = 5
+        # Dodaj warstwę trawy na wierzchu z jaśniejszymi źdźbłami
         grass_color = (60, 140, 70)
-        pygame.draw.rect(self.image, grass_color, (0, 0, self.rect.width, grass_height))
-        for i in range(self.rect.width // 2):
-            px = random.randint(0, self.rect.width - 1)
-            py = random.randint(0, grass_height - 1)
-            pygame.draw.rect(self.image, (grass_color[0]+20, grass_color[1]+20, grass_color[2]+20), (px, py, 1, 1))
+        pixels[:, :TOP_HEIGHT] = grass_color
+        blades = width // 2
+        pixels[generator.integers(width, size=blades),
+               generator.integers(min(TOP_HEIGHT, height), size=blades)] = [c + 20 for c in grass_color]
+        return to_surface(pixels)
+
+    def snapshot(self):
+        return self.rect.x, self.direction
+
+    def restore(self, snapshot):
+        self.rect.x, self.direction = snapshot
 
     # Aktualizacja pozycji platformy, jeśli jest ruchoma
     def update(self):
@@ -270,87 +279,125 @@ class Platform(pygame.sprite.Sprite):
                 self.direction *= -1
     # Rysowanie platformy na powierzchni
     def draw(self, surface):
-        surface.blit(self.image, self.rect)
+        return surface.blit(self.image, self.rect)
 
 # Klasa reprezentująca platformę czasową
+FADE_FRAMES = 12  # Klatki rampy zanikania w każdym stanie
+# Przezroczystość tekstury na początku i na końcu stanu
+FADE_ALPHA = {'solid': (255, 100), 'phased': (30, 100)}
+
+
 class TemporalPlatform(pygame.sprite.Sprite):
     def __init__(self, x, y, width, height, initial_state='solid', solid_time=180, phased_time=120):
         super().__init__()
         self.rect = pygame.Rect(x, y, width, height)
-        self.image = pygame.Surface((width, height), pygame.SRCALPHA)
 
         # Inicjalizacja stanu platformy
         self.state = initial_state
         self.solid_duration = solid_time
         self.phased_duration = phased_time
         self.timer = 0
-
-        # Tekstury dla różnych stanów
-        self.solid_texture = self._create_texture((40, 87, 56), (70, 140, 90))
-        self.phased_texture = self._create_texture((30, 50, 90), (60, 90, 140))
-
-    def _create_texture(self, base_color, top_color):
+        self.schedule = TemporalSchedule(solid_time, phased_time, initial_state)
+        # Level podpina tu funkcję wywoływaną przy każdej zmianie stanu
+        self.on_state_change = None
+
+        # Tekstury dla różnych stanów (wspólne, zob. textures.py)
+        self.variant = texture_variant(x, y)
+        self.solid_texture = texture_cache.get(
+            "temporal_solid", width, height, self.variant,
+            lambda w, h, generator: self._create_texture(w, h, generator, (40, 87, 56), (70, 140, 90)))
+        self.phased_texture = texture_cache.get(
+            "temporal_phased", width, height, self.variant,
+            lambda w, h, generator: self._create_texture(w, h, generator, (30, 50, 90), (60, 90, 140)))
+        self.image = self._frame()
+
+    @staticmethod
+    def _create_texture(width, height, generator, base_color, top_color):
         """Tworzy teksturę na podstawie podanych kolorów z większymi 'pikselami'."""
-        texture_surface = pygame.Surface(self.rect.size)
-        tile_size = 24
-
         # Stwórz paletę na podstawie koloru bazowego
         color_palette = [
             base_color,
             tuple(max(0, min(255, c - 15)) for c in base_color),
             tuple(max(0, min(255, c + 15)) for c in base_color)
         ]
-
-        # Rysuj większe "piksele" o różnych odcieniach
-        for x_pos in range(0, self.rect.width, tile_size):
-            for y_pos in range(0, self.rect.height, tile_size):
-                tile_color = random.choice(color_palette)
-                pygame.draw.rect(texture_surface, tile_color, (x_pos, y_pos, tile_size, tile_size))
-
-        # Dodaj "szum"
-        for _ in range(int(self.rect.width * self.rect.height / 25)):
-            px = random.randint(0, self.rect.width - 1)
-            py = random.randint(0, self.rect.height - 1)
-            base_pixel_color = texture_surface.get_at((px, py))
-            mod = random.randint(-10, 10)
-            dot_color = tuple(max(0, min(255, c + mod)) for c in base_pixel_color)
-            texture_surface.set_at((px, py), dot_color)
+        pixels = tiled_noise(width, height, color_palette, 10, generator)
 
         # Dodaj warstwę trawy na wierzchu
-        top_height = 5
-        pygame.draw.rect(texture_surface, top_color, (0, 0, self.rect.width, top_height))
-        return texture_surface
+        pixels[:, :TOP_HEIGHT] = top_color
+        return to_surface(pixels)
+
+    @staticmethod
+    def _create_frame(texture, alpha):
+        """Tekstura wtopiona w czerń z przezroczystością ``alpha`` i cyjanową ramką.
+
+        Klatka jest nieprzezroczysta, więc rysuje się ją zwykłą kopią pikseli.
+        """
+        faded = texture.copy()
+        faded.set_alpha(alpha)
+        frame = pygame.Surface(texture.get_size())
+        frame.blit(faded, (0, 0))
+        pygame.draw.rect(frame, CYAN, frame.get_rect(), 1)
+        return frame
+
+    def _frame(self):
+        """Klatka rampy dla bieżącego stanu, wspólna przez ``texture_cache``.
+
+        Rampa ma ``FADE_FRAMES`` kroków na stan niezależnie od czasu trwania
+        stanu. Klatki liczą się do budżetu cache jak same tekstury, więc przy
+        braku miejsca wypierane są klatki, a nie tekstury bazowe.
+        """
+        state, step = self._fade_step()
+        texture = self.solid_texture if state == 'solid' else self.phased_texture
+        start, end = FADE_ALPHA[state]
+        alpha = round(start + (end - start) * step / (FADE_FRAMES - 1))
+        return texture_cache.get(
+            f"temporal_{state}@{step}", self.rect.width, self.rect.height, self.variant,
+            lambda w, h, generator: self._create_frame(texture, alpha))
+
+    def _fade_step(self):
+        """(stan, krok rampy) w bieżącej klatce."""
+        duration = self.solid_duration if self.state == 'solid' else self.phased_duration
+        return self.state, min(FADE_FRAMES - 1, self.timer * FADE_FRAMES // max(1, duration))
+
+    def snapshot(self):
+        return self.state, self.timer
+
+    def restore(self, snapshot):
+        state, self.timer = snapshot
+        if state != self.state:
+            self._set_state(state)
+
+    def _set_state(self, state):
+        self.state = state
+        if self.on_state_change:
+            self.on_state_change(self)
+
+    def state_at(self, frame):
+        """Stan w klatce ``frame`` poziomu, bez krokowania platformy."""
+        return self.schedule.phase_at(frame)[0]
+
+    def advance(self, frames):
+        """Przeskakuje ``frames`` klatek w O(1); wynik jak po tylu wywołaniach ``update``."""
+        state, self.timer = self.schedule.advance(self.state, self.timer, frames)
+        if state != self.state:
+            self._set_state(state)
 
     # Aktualizacja stanu platformy
     def update(self):
         self.timer += 1
         if self.state == 'solid':
             if self.timer > self.solid_duration:
-                self.state = 'phased'
                 self.timer = 0
+                self._set_state('phased')
         else: # self.state == 'phased'
             if self.timer > self.phased_duration:
-                self.state = 'solid'
                 self.timer = 0
+                self._set_state('solid')
 
     # Rysowanie platformy na powierzchni
     def draw(self, surface):
-        self.image.fill((0, 0, 0, 0))
-
-        if self.state == 'solid':
-            progress = self.timer / self.solid_duration
-            alpha = int(255 - 155 * progress)
-            self.solid_texture.set_alpha(alpha)
-            self.image.blit(self.solid_texture, (0, 0))
-        else:
-            progress = self.timer / self.phased_duration
-            alpha = int(30 + 70 * progress)
-            self.phased_texture.set_alpha(alpha)
-            self.image.blit(self.phased_texture, (0, 0))
-
-        # Rysowanie platformy z przezroczystością
-        surface.blit(self.image, self.rect)
-        pygame.draw.rect(surface, (*CYAN, 50), self.rect, 1)
+        self.image = self._frame()
+        return surface.blit(self.image, self.rect)
 
 
 class TimeDilationZone(pygame.sprite.Sprite):
@@ -368,7 +415,7 @@ class TimeDilationZone(pygame.sprite.Sprite):
         pass
 
     def draw(self, surface):
-        surface.blit(self.image, self.rect)
+        return surface.blit(self.image, self.rect)
 
 
 # Czytelna nazwa alternatywna dla edytora i starszych eksperymentów.
@@ -382,6 +429,8 @@ class ParadoxSwitch(pygame.sprite.Sprite):
         super().__init__()
         self.rect = pygame.Rect(x, y, width, height)
         self.pressed = False
+        # Level podpina tu funkcję wywoływaną przy zmianie wyglądu
+        self.on_state_change = None
         self.image = pygame.Surface(self.rect.size, pygame.SRCALPHA)
         self._redraw()
 
@@ -390,6 +439,8 @@ class ParadoxSwitch(pygame.sprite.Sprite):
         color = (70, 220, 255) if self.pressed else (210, 60, 220)
         pygame.draw.rect(self.image, color, self.image.get_rect(), border_radius=4)
         pygame.draw.rect(self.image, WHITE, self.image.get_rect(), 2, border_radius=4)
+        if self.on_state_change:
+            self.on_state_change(self)
 
     def activate(self):
         if not self.pressed:
@@ -398,11 +449,16 @@ class ParadoxSwitch(pygame.sprite.Sprite):
             return True
         return False
 
+    def restore(self, pressed):
+        if pressed != self.pressed:
+            self.pressed = pressed
+            self._redraw()
+
     def update(self):
         pass
 
     def draw(self, surface):
-        surface.blit(self.image, self.rect)
+        return surface.blit(self.image, self.rect)
 
 
 ParadoxButton = ParadoxSwitch
@@ -414,20 +470,35 @@ class ParadoxDoor(Platform):
     def __init__(self, x, y, width, height, initially_locked=True):
         super().__init__(x, y, width, height, moving=False)
         self.locked = bool(initially_locked)
+        # Drzwi zmieniają przezroczystość, więc nie mogą dzielić tekstury z cache.
+        self.image = self.image.copy()
         self.image.set_alpha(210)
+        # Level podpina tu funkcję wywoływaną przy otwarciu/zamknięciu
+        self.on_state_change = None
 
     def open(self):
-        self.locked = False
-        self.image.set_alpha(0)
+        if self.locked:
+            self.locked = False
+            self.image.set_alpha(0)
+            if self.on_state_change:
+                self.on_state_change(self)
+
+    def close(self):
+        if not self.locked:
+            self.locked = True
+            self.image.set_alpha(210)
+            if self.on_state_change:
+                self.on_state_change(self)
 
     def draw(self, surface):
         if self.locked:
-            super().draw(surface)
+            return super().draw(surface)
+        return None
 
 
 # Klasa reprezentująca niebezpieczeństwa (np. kolce)
 class Hazard(pygame.sprite.Sprite):
-    def __init__(self, x, y, width, height, hazard_type="spike"):
+    def __init__(self, x, y, width, height, hazard_type="spike", rng=None, teeth=1):
         super().__init__()
         self.image = pygame.Surface((width, height))
         self.image.fill(RED)
@@ -435,9 +506,11 @@ class Hazard(pygame.sprite.Sprite):
         self.rect.x = x
         self.rect.y = y
         self.type = hazard_type
+        # Scalony rząd kolców zachowuje wygląd pojedynczych kafli
+        self.teeth = max(1, teeth)
 
         # Animacja
-        self.animation_timer = random.uniform(0, 2 * math.pi)
+        self.animation_timer = (rng or random).uniform(0, 2 * math.pi)
 
     def update(self):
         self.animation_timer += 0.1
@@ -448,18 +521,24 @@ class Hazard(pygame.sprite.Sprite):
     def draw(self, surface):
         # Rysuj kolce jako trójkąty
         if self.type == "spike":
-            points = [
-                (self.rect.centerx, self.rect.top),
-                (self.rect.left, self.rect.bottom),
-                (self.rect.right, self.rect.bottom)
-            ]
-            pygame.draw.polygon(surface, self.image.get_at((0, 0)), points)
-        else:
-            surface.blit(self.image, self.rect)
+            color = self.image.get_at((0, 0))
+            rect = self.rect
+            dirty = pygame.Rect(rect.topleft, (0, 0))
+            for tooth in range(self.teeth):
+                left = rect.left + tooth * rect.width // self.teeth
+                right = rect.left + (tooth + 1) * rect.width // self.teeth
+                points = [
+                    ((left + right) // 2, rect.top),
+                    (left, rect.bottom),
+                    (right, rect.bottom)
+                ]
+                dirty.union_ip(pygame.draw.polygon(surface, color, points))
+            return dirty
+        return surface.blit(self.image, self.rect)
 
 # Klasa reprezentująca przedmioty do zbierania (np. klejnoty, power-upy)
 class Collectible(pygame.sprite.Sprite):
-    def __init__(self, x, y, collectible_type="gem"):
+    def __init__(self, x, y, collectible_type="gem", rng=None):
         super().__init__()
         self.type = collectible_type
         self.size = 30
@@ -477,11 +556,18 @@ class Collectible(pygame.sprite.Sprite):
         self.rect.x = x
         self.rect.y = y
 
-        # Animacja
-        self.float_offset = random.uniform(0, 2 * math.pi)
+        # Animacja. Faza unoszenia zmienia rect, więc wpływa na kolizje i musi
+        # pochodzić z ziarna poziomu, aby powtórki były deterministyczne.
+        self.float_offset = (rng or random).uniform(0, 2 * math.pi)
         self.original_y = y
         self.rotation = 0
 
+    def snapshot(self):
+        return self.rect.y, self.float_offset, self.rotation
+
+    def restore(self, snapshot):
+        self.rect.y, self.float_offset, self.rotation = snapshot
+
     def update(self):
         # Efekt unoszenia
         self.float_offset += 0.05
@@ -497,12 +583,8 @@ class Collectible(pygame.sprite.Sprite):
             # Efekt poświaty
             glow_radius = self.size // 2 + 5
             glow_alpha = 100 + int(50 * math.sin(self.float_offset * 2))
-            glow_color = (*self.color, glow_alpha)
-
-            # Użyj osobnej powierzchni dla poświaty, aby poprawnie obsłużyć alfę
-            glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), glow_radius)
-            surface.blit(glow_surface, (center[0] - glow_radius, center[1] - glow_radius))
+            glow_surface = glow_sprite(glow_radius, self.color, glow_alpha)
+            dirty = surface.blit(glow_surface, (center[0] - glow_radius, center[1] - glow_radius))
 
             # Rysuj różne kształty dla różnych typów
             if self.type == "gem":
@@ -513,33 +595,34 @@ class Collectible(pygame.sprite.Sprite):
                     angle += math.radians(36)
                     inner_point = (center[0] + self.size/4 * math.cos(angle), center[1] + self.size/4 * math.sin(angle))
                     points.extend([outer_point, inner_point])
-                pygame.draw.polygon(surface, self.color, points)
+                dirty.union_ip(pygame.draw.polygon(surface, self.color, points))
 
             # Rysowanie innych typów przedmiotów
             elif self.type == "double_jump":
-                pygame.draw.circle(surface, self.color, center, self.size // 3)
+                dirty.union_ip(pygame.draw.circle(surface, self.color, center, self.size // 3))
                 pygame.draw.circle(surface, WHITE, center, self.size // 3, 2)
                 angle1 = math.radians(self.rotation)
                 angle2 = math.radians(self.rotation + 180)
                 y_offset = self.size / 2.5
-                pygame.draw.line(surface, self.color, (center[0], center[1] - y_offset), (center[0] + 10 * math.cos(angle1), center[1] - y_offset + 10 * math.sin(angle1)), 3)
-                pygame.draw.line(surface, self.color, (center[0], center[1] + y_offset), (center[0] + 10 * math.cos(angle2), center[1] + y_offset + 10 * math.sin(angle2)), 3)
+                dirty.union_ip(pygame.draw.line(surface, self.color, (center[0], center[1] - y_offset), (center[0] + 10 * math.cos(angle1), center[1] - y_offset + 10 * math.sin(angle1)), 3))
+                dirty.union_ip(pygame.draw.line(surface, self.color, (center[0], center[1] + y_offset), (center[0] + 10 * math.cos(angle2), center[1] + y_offset + 10 * math.sin(angle2)), 3))
 
             # Rysowanie tarczy
             elif self.type == "shield":
-                pygame.draw.rect(surface, self.color, self.rect, 4, border_radius=5)
-                pygame.draw.line(surface, WHITE, self.rect.topleft, self.rect.bottomright, 2)
+                dirty.union_ip(pygame.draw.rect(surface, self.color, self.rect, 4, border_radius=5))
+                dirty.union_ip(pygame.draw.line(surface, WHITE, self.rect.topleft, self.rect.bottomright, 2))
+            return dirty
 
 # Klasa reprezentująca klucz do odblokowania wyjścia
 class Key(pygame.sprite.Sprite):
-    def __init__(self, x, y):
+    def __init__(self, x, y, rng=None):
         super().__init__()
         self.size = 40
         self.image = self._create_image()
         self.rect = self.image.get_rect(center=(x + self.size // 2, y + self.size // 2))
 
         # Animacja
-        self.float_offset = random.uniform(0, 2 * math.pi)
+        self.float_offset = (rng or random).uniform(0, 2 * math.pi)
         self.original_y = y
 
     def _create_image(self):
@@ -564,6 +647,12 @@ class Key(pygame.sprite.Sprite):
         # Lekko obrócony dla lepszego wyglądu
         return pygame.transform.rotate(surface, -45)
 
+    def snapshot(self):
+        return self.rect.y, self.float_offset
+
+    def restore(self, snapshot):
+        self.rect.y, self.float_offset = snapshot
+
     def update(self):
         # Efekt unoszenia się
         self.float_offset += 0.05
@@ -574,28 +663,75 @@ class Key(pygame.sprite.Sprite):
         center = self.rect.center
         glow_radius = self.size // 2 + 3
         glow_alpha = 100 + int(50 * math.sin(self.float_offset * 2))
-        glow_color = (*YELLOW, glow_alpha)
-
-        # Użyj osobnej powierzchni dla poświaty, aby poprawnie obsłużyć alfę
-        glow_surface = pygame.Surface((glow_radius * 2, glow_radius * 2), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, glow_color, (glow_radius, glow_radius), glow_radius)
-        surface.blit(glow_surface, (center[0] - glow_radius, center[1] - glow_radius))
+        glow_surface = glow_sprite(glow_radius, YELLOW, glow_alpha)
+        dirty = surface.blit(glow_surface, (center[0] - glow_radius, center[1] - glow_radius))
 
         # Rysowanie klucza
-        surface.blit(self.image, self.rect)
+        dirty.union_ip(surface.blit(self.image, self.rect))
+        return dirty
+
+# Cząsteczki portalu: promień 1..5 co pół piksela, alfa w 16 krokach.
+PORTAL_PARTICLES = 50
+PORTAL_LIFETIME = 60
+PORTAL_RADIUS_STEPS = 9
+PORTAL_ALPHA_STEPS = 16
+PORTAL_CELL = 12
+
 
 # Klasa reprezentująca strefę wyjścia
 class ExitZone(pygame.sprite.Sprite):
+    # Kamienna brama wygląda tak samo na każdym poziomie, więc powstaje raz.
+    # Renderuje napis fontem, dlatego musi ją zbudować wątek główny (zob.
+    # ``prefetch``), zanim poziom powstanie w tle.
+    _gate_structure = None
+    # Grafiki otwartego portalu (arkusz cząsteczek i poświata), też raz na proces
+    _portal_sprites = None
+
     def __init__(self, x, y):
         super().__init__()
         self.rect = pygame.Rect(x, y, 80, 80)
         self.animation_timer = 0
         self.locked = True
         self.key_icon = self._create_key_icon()
-        self.portal_particles = []
+        # Płaska tablica wierszy (x, y, krok promienia, czas życia); żywe są
+        # pierwsze ``portal_count`` wiersze.
+        self.portal_particles = np.zeros((PORTAL_PARTICLES, 4), dtype=np.int32)
+        self.portal_count = 0
 
         # --- Pre-renderowanie statycznej kamiennej struktury ---
-        self.gate_structure_surface, self.gate_pos = self._create_gate_structure()
+        self.gate_structure_surface = self.gate_structure()
+        width, height = self.gate_structure_surface.get_size()
+        self.gate_pos = (self.rect.left - (width - self.rect.width) // 2,
+                         self.rect.top - (height - self.rect.height))
+
+    @classmethod
+    def gate_structure(cls):
+        if cls._gate_structure is None:
+            cls._gate_structure = cls._create_gate_structure()
+        return cls._gate_structure
+
+    @classmethod
+    def portal_sprites(cls):
+        if cls._portal_sprites is None:
+            cls._portal_sprites = cls._create_portal_sprites()
+        return cls._portal_sprites
+
+    @staticmethod
+    def _create_portal_sprites():
+        """Zwraca (arkusz, komórki, poświata); wiersz arkusza to promień, kolumna to alfa."""
+        sheet = pygame.Surface((PORTAL_CELL * PORTAL_ALPHA_STEPS, PORTAL_CELL * PORTAL_RADIUS_STEPS),
+                               pygame.SRCALPHA)
+        cells = []
+        for row in range(PORTAL_RADIUS_STEPS):
+            cells.append([])
+            for column in range(PORTAL_ALPHA_STEPS):
+                cell = pygame.Rect(column * PORTAL_CELL, row * PORTAL_CELL, PORTAL_CELL, PORTAL_CELL)
+                alpha = 255 * (column + 1) // PORTAL_ALPHA_STEPS
+                pygame.draw.circle(sheet, (*CYAN, alpha), cell.center, 1 + row / 2)
+                cells[-1].append(cell)
+        glow = pygame.Surface((80 + 32, 80 + 32), pygame.SRCALPHA)
+        pygame.draw.ellipse(glow, (60, 220, 255, 45), glow.get_rect(), 8)
+        return sheet, cells, glow
 
     def _create_key_icon(self):
         """Tworzy małą, prostą ikonę klucza."""
@@ -606,12 +742,13 @@ class ExitZone(pygame.sprite.Sprite):
         pygame.draw.line(icon_surf, key_color, (5, 11), (8, 11), 2)
         return icon_surf
 
-    def _create_gate_structure(self):
+    @staticmethod
+    def _create_gate_structure():
         """Tworzy dopracowaną, statyczną powierzchnię dla kamiennej bramy."""
         pillar_width = 16  # Użyjmy wielokrotności 8 dla łatwiejszego rysowania bloków
-        pillar_height = self.rect.height
+        pillar_height = 80
         arch_thickness = 24
-        arch_rect_width = self.rect.width + 2 * pillar_width
+        arch_rect_width = 80 + 2 * pillar_width
         arch_rect_height = 40
 
         # Oblicz całkowitą szerokość i wysokość struktury
@@ -683,31 +820,36 @@ class ExitZone(pygame.sprite.Sprite):
         for rune_x in range(pillar_width + 8, total_width - pillar_width, 16):
             pygame.draw.line(structure_surf, (125, 90, 205),
                              (rune_x, 8), (rune_x + 4, 18), 2)
-
-        # --- Pozycja bramy ---
-        gate_pos = (self.rect.left - pillar_width, self.rect.top - arch_rect_height)
-        return structure_surf, gate_pos
+        return structure_surf
 
     # Klasa reprezentująca strefę wyjścia z animacją portalu
     def update(self):
         self.animation_timer += 0.1
         if not self.locked:
             # Generuj nowe cząsteczki portalu
-            if len(self.portal_particles) < 50:
+            if self.portal_count < PORTAL_PARTICLES:
                 p_x = self.rect.centerx + random.uniform(-self.rect.width/3, self.rect.width/3)
                 p_y = self.rect.centery + random.uniform(-self.rect.height/3, self.rect.height/3)
                 p_radius = random.uniform(1, 5)
-                p_lifetime = random.randint(20, 60)
-                self.portal_particles.append([p_x, p_y, p_radius, p_lifetime])
+                p_lifetime = random.randint(20, PORTAL_LIFETIME)
+                self.portal_particles[self.portal_count] = (p_x, p_y, round((p_radius - 1) * 2), p_lifetime)
+                self.portal_count += 1
+
+            # Zmniejsz czas życia i przesuń żywe cząsteczki na początek tablicy
+            live = self.portal_particles[:self.portal_count]
+            live[:, 3] -= 1
+            alive = live[live[:, 3] > 0]
+            self.portal_count = len(alive)
+            self.portal_particles[:self.portal_count] = alive
 
-            # Aktualizuj istniejące cząsteczki
-            for p in self.portal_particles:
-                p[3] -= 1 # Zmniejsz czas życia
-            self.portal_particles = [p for p in self.portal_particles if p[3] > 0]
+    def draw(self, surface, remaining_keys=0, draw_gate=True):
+        # Ramka obejmuje wnętrze portalu; bramę, poświatę i napis dołączamy niżej.
+        dirty = self.rect.inflate(2, 2)
 
-    def draw(self, surface, remaining_keys=0):
         # --- Rysowanie gotowej, statycznej struktury bramy ---
-        surface.blit(self.gate_structure_surface, self.gate_pos)
+        # (Level wypala ją we własnej warstwie statycznej i podaje draw_gate=False)
+        if draw_gate:
+            dirty.union_ip(surface.blit(self.gate_structure_surface, self.gate_pos))
 
         # --- Rysowanie ramy portalu i efektów wewnątrz bramy ---
         frame_color = (80, 80, 90)
@@ -726,17 +868,16 @@ class ExitZone(pygame.sprite.Sprite):
             surface.blit(self.key_icon, (icon_pos_x, icon_pos_y))
 
             # Wyświetl liczbę pozostałych kluczy
-            keys_text = font_medium.render(f"x {remaining_keys}", True, WHITE)
+            keys_text = render_text(font_medium, f"x {remaining_keys}", WHITE)
             text_rect = keys_text.get_rect(midleft=(icon_pos_x + 20, self.rect.centery))
-            surface.blit(keys_text, text_rect)
+            dirty.union_ip(surface.blit(keys_text, text_rect))
             pygame.draw.circle(surface, (220, 80, 105), (self.rect.centerx, self.rect.bottom - 12), 3)
         else:
             # Rysuj aktywną ramę i wirujący portal
             active_frame_color = (150, 150, 180)
             inner_rect = self.rect.inflate(-frame_thickness * 2, -frame_thickness * 2)
-            glow = pygame.Surface((self.rect.width + 32, self.rect.height + 32), pygame.SRCALPHA)
-            pygame.draw.ellipse(glow, (60, 220, 255, 45), glow.get_rect(), 8)
-            surface.blit(glow, (self.rect.x - 16, self.rect.y - 16))
+            sheet, cells, glow = self.portal_sprites()
+            dirty.union_ip(surface.blit(glow, (self.rect.x - 16, self.rect.y - 16)))
             pygame.draw.rect(surface, (8, 12, 32), inner_rect, border_radius=8)
             pygame.draw.rect(surface, active_frame_color, self.rect, frame_thickness, border_radius=7)
             pygame.draw.arc(surface, CYAN, inner_rect.inflate(-8, -4), self.animation_timer,
@@ -744,10 +885,11 @@ class ExitZone(pygame.sprite.Sprite):
             pygame.draw.arc(surface, PURPLE, inner_rect.inflate(-14, -10),
                             -self.animation_timer, -self.animation_timer + math.pi * 1.4, 3)
 
-            # Rysuj cząsteczki portalu
-            for x, y, radius, lifetime in self.portal_particles:
-                alpha = int(255 * (lifetime / 60))
-                color = (*CYAN, alpha)
-                temp_surf = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-                pygame.draw.circle(temp_surf, color, (radius, radius), radius)
-                surface.blit(temp_surf, (x - radius, y - radius), special_flags=pygame.BLEND_RGBA_ADD)
+            # Rysuj cząsteczki portalu jednym blits z komórek arkusza
+            live = self.portal_particles[:self.portal_count]
+            alpha_steps = (live[:, 3] * PORTAL_ALPHA_STEPS - 1) // PORTAL_LIFETIME
+            half = PORTAL_CELL // 2
+            surface.blits([(sheet, (x - half, y - half), cells[radius][alpha], pygame.BLEND_RGBA_ADD)
+                           for (x, y, radius, _), alpha in zip(live.tolist(), alpha_steps.tolist())],
+                          doreturn=False)
+        return dirty
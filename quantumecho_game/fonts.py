@@ -0,0 +1,37 @@
+"""Czcionki gry wczytywane bez otwierania okna.
+
+Moduł inicjalizuje wyłącznie ``pygame.font``. Dzięki temu encje poziomu mogą
+renderować napisy (np. "EXIT" na bramie) także w symulacji bez ekranu.
+``render_text`` trzyma wyrenderowane napisy w cache LRU, bo interfejs
+rysuje te same teksty w każdej klatce.
+"""
+
+import functools
+import os
+import pygame
+
+pygame.font.init()
+
+PACKAGE_DIR = os.path.dirname(__file__)
+FONT_PATH = os.path.join(PACKAGE_DIR, "fonts", "VT323-Regular.ttf")
+try:
+    font_small = pygame.font.Font(FONT_PATH, 24)
+    font_medium = pygame.font.Font(FONT_PATH, 40)
+    font_large = pygame.font.Font(FONT_PATH, 80)
+except (pygame.error, FileNotFoundError):
+    print(f"Błąd: Nie można wczytać czcionki z '{FONT_PATH}'. Używam czcionki domyślnej.")
+    font_small = pygame.font.Font(None, 24)
+    font_medium = pygame.font.Font(None, 36)
+    font_large = pygame.font.Font(None, 72)
+
+TEXT_CACHE_SIZE = 512
+
+
+@functools.lru_cache(maxsize=TEXT_CACHE_SIZE)
+def _render_text(font, text, color, antialias):
+    return font.render(text, antialias, color)
+
+
+def render_text(font, text, color, antialias=True):
+    """Wyrenderowany napis ze wspólnego cache; powierzchni nie wolno modyfikować."""
+    return _render_text(font, text, tuple(color), antialias)
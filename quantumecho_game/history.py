@@ -0,0 +1,98 @@
+"""Historia ruchów gracza odtwarzana przez Echo.
+
+Bufor cykliczny jest zaalokowany raz, na starcie poziomu, jako płaska tablica
+liczb. Każda klatka zajmuje ``FIELDS`` kolejnych pól: pozycję, prędkość i
+flagi stanu. Zapis klatki nie tworzy nowych obiektów, a odczyt dowolnego
+opóźnienia jest O(1), co pozwala mieć różne opóźnienia Echa na poziomach,
+podgląd ścieżki Echa i cofanie czasu.
+"""
+
+from array import array
+
+FIELDS = 5
+X, Y, VEL_X, VEL_Y, FLAGS = range(FIELDS)
+
+FLAG_ON_GROUND = 1
+FLAG_INVINCIBLE = 2
+FLAG_DOUBLE_JUMP = 4
+
+
+class EchoHistory:
+    """Ostatnie ``capacity`` klatek gracza; opóźnienie 0 to klatka najnowsza."""
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("Pojemność historii musi być dodatnia.")
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * FIELDS * capacity))
+        self._head = 0  # Indeks klatki, która zostanie zapisana jako następna
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def data(self):
+        """Surowa tablica ``capacity * FIELDS`` (do odczytów wsadowych)."""
+        return self._data
+
+    @property
+    def head(self):
+        return self._head
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def record(self, player):
+        """Zapisuje stan gracza po fizyce bieżącej klatki."""
+        flags = ((FLAG_ON_GROUND if player.on_ground else 0)
+                 | (FLAG_INVINCIBLE if player.invincible else 0)
+                 | (FLAG_DOUBLE_JUMP if player.has_double_jump else 0))
+        base = self._head * FIELDS
+        data = self._data
+        data[base] = player.rect.x
+        data[base + 1] = player.rect.y
+        data[base + 2] = player.vel_x
+        data[base + 3] = player.vel_y
+        data[base + 4] = flags
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def _offset(self, delay):
+        if not 0 <= delay < self._count:
+            raise IndexError(f"Brak klatki sprzed {delay} klatek w historii.")
+        return ((self._head - 1 - delay) % self.capacity) * FIELDS
+
+    def position(self, delay):
+        """Pozycja (x, y) sprzed ``delay`` klatek albo None, gdy historia jest za krótka."""
+        if delay >= self._count:
+            return None
+        base = self._offset(delay)
+        return int(self._data[base]), int(self._data[base + 1])
+
+    def state(self, delay):
+        """Pełny zapis klatki: (x, y, vel_x, vel_y, flags)."""
+        base = self._offset(delay)
+        x, y, vel_x, vel_y, flags = self._data[base:base + FIELDS]
+        return int(x), int(y), vel_x, vel_y, int(flags)
+
+    def path(self, oldest_delay, newest_delay=0, step=1):
+        """Pozycje od ``oldest_delay`` do ``newest_delay`` (np. podgląd drogi Echa)."""
+        oldest_delay = min(oldest_delay, self._count - 1)
+        return [self.position(delay) for delay in range(oldest_delay, newest_delay - 1, -step)]
+
+    def snapshot(self):
+        return self._data[:], self._head, self._count
+
+    def restore(self, snapshot):
+        data, self._head, self._count = snapshot
+        # Kopiujemy w miejscu, bo widoki NumPy (EchoGroup) wskazują na bufor.
+        self._data[:] = data
+
+    def truncate(self, frames):
+        """Usuwa ``frames`` najnowszych klatek, np. po cofnięciu czasu."""
+        frames = min(frames, self._count)
+        self._head = (self._head - frames) % self.capacity
+        self._count -= frames
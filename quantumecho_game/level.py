@@ -1,16 +1,77 @@
-"""Wczytywanie i reprezentacja poziomów."""
+"""Wczytywanie i reprezentacja poziomów.
+
+Elementy, które się nie ruszają (zwykłe platformy, przełączniki, kamienna
+brama, strefy dylatacji i zamknięte drzwi), są wypalane w warstwy statyczne.
+Platformy trafiają na powierzchnię z colorkey (blit RLE jest niemal darmowy),
+pozostałe na listę kafli z alfą przemnożoną przez kolor, rysowaną jednym
+wywołaniem ``blits``. Kolce pulsują kolorem w każdej klatce, więc zostają
+dynamiczne. ``draw`` rysuje co klatkę tylko elementy ruchome i animowane, a
+warstwy są wypalane ponownie dopiero po zmianie przełącznika lub drzwi.
+``draw_static`` i ``draw_dynamic`` rozdzielają te dwa etapy dla renderera
+prostokątów zmian (``render.DirtyRectRenderer``).
+
+Kolejność rysowania jest taka jak przy rysowaniu encja po encji: platformy,
+platformy czasowe, strefy, kolce, przedmioty, klucze, przełączniki, drzwi i
+brama. Kafel, pod który może wjechać lub wpaść element dynamiczny (albo
+który przykrywa taki kafel), nie jest wypalany, lecz rysowany co klatkę na
+swoim miejscu w tej kolejności.
+"""
+
+import random
 
 import pygame
 
 from .config import SCREEN_HEIGHT, SCREEN_WIDTH
+from .compaction import compact_level_data
 from .effects import LevelBackground
+from .spatial import SpatialGrid
 from .entities import (
     Collectible, ExitZone, Hazard, Key, Platform, Player, TemporalPlatform,
     TimeDilationZone, ParadoxSwitch, ParadoxDoor,
 )
 
+STATIC_COLORKEY = (255, 0, 255)
+# Zapas na poświatę i unoszenie się przedmiotów przy wyznaczaniu ich zasięgu
+DRAW_MARGIN = 24
+
+
+def _premultiplied(image):
+    """Kopia obrazu z kolorem przemnożonym przez alfę (także alfę całej powierzchni)."""
+    if image.get_masks()[3]:  # Alfa na piksel
+        return image.premul_alpha()
+    tile = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+    tile.fill((0, 0, 0, 255))
+    tile.blit(image, (0, 0), special_flags=pygame.BLEND_RGB_MAX)
+    alpha = image.get_alpha()
+    if alpha is not None:
+        tile.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+    return tile.premul_alpha()
+
+
+def _draw_reach(entity):
+    """Prostokąt, w którym element dynamiczny może kiedykolwiek coś narysować."""
+    rect = entity.rect.copy()
+    if getattr(entity, 'moving', False):
+        travel = entity.move_range + abs(entity.speed)
+        rect.x = entity.start_x - travel
+        rect.width += 2 * travel
+    if hasattr(entity, 'original_y'):
+        rect.y = entity.original_y
+    return rect.inflate(2 * DRAW_MARGIN, 2 * DRAW_MARGIN)
+
+
+def _tile(image, rect):
+    return _premultiplied(image), rect.topleft, None, pygame.BLEND_PREMULTIPLIED
+
+
 class Level:
-    def __init__(self, level_data, level_index):
+    def __init__(self, level_data, level_index, rng=None, compact=True):
+        # Wszystkie losowe elementy poziomu (tekstury, fazy animacji, tło)
+        # korzystają z jednego generatora, więc ziarno odtwarza cały świat.
+        rng = rng or random
+        # Kafle z edytora łączymy w duże prostokąty: mniej tekstur i kolizji.
+        if compact:
+            level_data = compact_level_data(level_data)
         self.platforms = pygame.sprite.Group()
         self.temporal_platforms = pygame.sprite.Group()
         self.hazards = pygame.sprite.Group()
@@ -21,10 +82,23 @@ class Level:
         self.paradox_doors = pygame.sprite.Group()
         self.exit_zone = None
         self._solid_platforms_cache = None
-        self._solid_platforms_signature = None
+        # Broadphase kolizji: statyczne platformy trafiają do siatki raz,
+        # a elementy dynamiczne są w niej aktualizowane przyrostowo.
+        self.solid_grid = SpatialGrid()
+        self.hazard_grid = SpatialGrid()
+        self.switch_grid = SpatialGrid()
+        self._moving_platforms = []
+        self._static_layer = None
+        self._overlay_tiles = []  # Wypalone kafle, rysowane przez draw_static
+        self._zone_tiles = []  # Kafle nad platformami ruchomymi i czasowymi
+        self._upper_tiles = []  # Kafle nad kolcami, przedmiotami i kluczami
+        self._static_dirty = True
+        self._overlay_dirty = True
+        # Rośnie przy każdej zmianie warstw statycznych (zob. render.py).
+        self.static_version = 0
 
         # Wczytujemy dane poziomu z pliku JSON
-        self.background = LevelBackground(level_index, SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.background = LevelBackground(level_index, SCREEN_WIDTH, SCREEN_HEIGHT, rng=rng)
 
         # Wczytujemy platformy, przeszkody, przedmioty i strefę wyjścia
         for platform_data in level_data.get('platforms', []):
@@ -61,17 +135,18 @@ class Level:
 
         # Wczytujemy niebezpieczeństwa (np. kolce)
         for hazard_data in level_data.get('hazards', []):
-            h = Hazard(hazard_data['x'], hazard_data['y'], hazard_data['width'], hazard_data['height'])
+            h = Hazard(hazard_data['x'], hazard_data['y'], hazard_data['width'], hazard_data['height'], rng=rng,
+                       teeth=hazard_data.get('teeth', 1))
             self.hazards.add(h)
 
         # Wczytujemy przedmioty do zbierania
         for collectible_data in level_data.get('collectibles', []):
-            c = Collectible(collectible_data['x'], collectible_data['y'], collectible_data.get('type', 'gem'))
+            c = Collectible(collectible_data['x'], collectible_data['y'], collectible_data.get('type', 'gem'), rng=rng)
             self.collectibles.append(c)
 
         # Wczytujemy klucze (używając starego pola 'buttons' z JSON dla kompatybilności)
         for key_data in level_data.get('buttons', []):
-            self.keys.append(Key(key_data['x'], key_data['y']))
+            self.keys.append(Key(key_data['x'], key_data['y'], rng=rng))
 
         # Wczytujemy strefę wyjścia
         self.start_pos = (level_data['start']['x'], level_data['start']['y'])
@@ -81,18 +156,132 @@ class Level:
         # Wyjście jest zablokowane, jeśli na poziomie są jakiekolwiek klucze
         self.exit_zone.locked = bool(self.keys) or bool(end_data.get('locked', False))
 
+        self._build_spatial_index()
+        self._bake_static_layers()
+
+    def _build_spatial_index(self):
+        """Indeksuje kolizje w kolejności zgodnej z ``get_solid_platforms``."""
+        order = 0
+        for platform in self.platforms:
+            self.solid_grid.insert(platform, order)
+            if platform.moving:
+                self._moving_platforms.append(platform)
+            order += 1
+        for platform in self.temporal_platforms:
+            if platform.state == 'solid':
+                self.solid_grid.insert(platform, order)
+            platform.solid_order = order
+            platform.on_state_change = self._on_solid_change
+            order += 1
+        for door in self.paradox_doors:
+            if door.locked:
+                self.solid_grid.insert(door, order)
+            door.solid_order = order
+            door.on_state_change = self._on_solid_change
+            order += 1
+        for hazard in self.hazards:
+            self.hazard_grid.insert(hazard)
+        for switch in self.paradox_switches:
+            self.switch_grid.insert(switch)
+            switch.on_state_change = self._on_static_change
+
+    def _on_solid_change(self, entity):
+        """Platforma czasowa lub drzwi zmieniły stan: poprawiamy tylko ten element."""
+        if isinstance(entity, ParadoxDoor):
+            solid = entity.locked
+            self._overlay_dirty = True
+            self.static_version += 1
+        else:
+            solid = entity.state == 'solid'
+        if solid:
+            self.solid_grid.insert(entity, entity.solid_order)
+        else:
+            self.solid_grid.remove(entity)
+        self._solid_platforms_cache = None
+
+    def _on_static_change(self, entity):
+        self._overlay_dirty = True
+        self.static_version += 1
+
+    def _bake_static_layers(self):
+        """Wypala warstwy statyczne, które są nieaktualne."""
+        if self._static_dirty:
+            layer = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            layer.fill(STATIC_COLORKEY)
+            for platform in self.platforms:
+                if not platform.moving:
+                    platform.draw(layer)
+            layer.set_colorkey(STATIC_COLORKEY, pygame.RLEACCEL)
+            self._static_layer = layer
+            self._static_dirty = False
+        if self._overlay_dirty:
+            # Brama ma wygładzony napis, więc też musi trafić do warstwy z alfą.
+            gate = self.exit_zone.gate_structure_surface
+            zones = [(zone.image, zone.rect) for zone in self.time_dilation_zones]
+            upper = [(switch.image, switch.rect) for switch in self.paradox_switches]
+            upper += [(door.image, door.rect) for door in self.paradox_doors if door.locked]
+            upper.append((gate, gate.get_rect(topleft=self.exit_zone.gate_pos)))
+            below_zones = [_draw_reach(p) for p in self._moving_platforms]
+            below_zones += [_draw_reach(p) for p in self.temporal_platforms]
+            below_upper = below_zones + [_draw_reach(item) for item in
+                                         (*self.hazards, *self.collectibles, *self.keys)]
+            # Osobne kafle zamiast jednej powierzchni: odległe elementy nie
+            # tworzą wielkiego obszaru blitowanego z alfą w każdej klatce.
+            self._overlay_tiles, self._zone_tiles, self._upper_tiles = [], [], []
+            live = []
+            for overlays, below, tiles in ((zones, below_zones, self._zone_tiles),
+                                           (upper, below_upper, self._upper_tiles)):
+                for image, rect in overlays:
+                    if rect.collidelist(below) != -1 or rect.collidelist(live) != -1:
+                        tiles.append(_tile(image, rect))
+                        live.append(rect)
+                    else:
+                        self._overlay_tiles.append(_tile(image, rect))
+            self._overlay_dirty = False
+
+    def snapshot(self):
+        """Zapisuje stan rozgrywki poziomu (bez tekstur i tła).
+
+        Listy przedmiotów i kluczy przechowują same obiekty, więc migawka jest
+        ważna tylko dla tej instancji ``Level``.
+        """
+        return {
+            'moving': [p.snapshot() for p in self._moving_platforms],
+            'temporal': [p.snapshot() for p in self.temporal_platforms],
+            'switches': [s.pressed for s in self.paradox_switches],
+            'doors': [d.locked for d in self.paradox_doors],
+            'collectibles': [(c, c.snapshot()) for c in self.collectibles],
+            'keys': [(k, k.snapshot()) for k in self.keys],
+            'exit_locked': self.exit_zone.locked,
+        }
+
+    def restore(self, snapshot):
+        for platform, state in zip(self._moving_platforms, snapshot['moving']):
+            platform.restore(state)
+            self.solid_grid.update(platform)
+        # Zmiany stanu platform i drzwi same aktualizują siatkę kolizji
+        for platform, state in zip(self.temporal_platforms, snapshot['temporal']):
+            platform.restore(state)
+        for switch, pressed in zip(self.paradox_switches, snapshot['switches']):
+            switch.restore(pressed)
+        for door, locked in zip(self.paradox_doors, snapshot['doors']):
+            if locked:
+                door.close()
+            else:
+                door.open()
+        self.collectibles[:] = [c for c, _state in snapshot['collectibles']]
+        for collectible, state in snapshot['collectibles']:
+            collectible.restore(state)
+        self.keys[:] = [k for k, _state in snapshot['keys']]
+        for key, state in snapshot['keys']:
+            key.restore(state)
+        self.exit_zone.locked = snapshot['exit_locked']
+
     # Jeśli nie ma kluczy, odblokuj wyjście
     def get_solid_platforms(self):
-        """Zwraca cache'owaną listę kolizji; nie alokuje grupy co klatkę."""
-        signature = tuple(p.state for p in self.temporal_platforms) + tuple(
-            door.locked for door in self.paradox_doors)
-        if signature != self._solid_platforms_signature:
-            self._solid_platforms_cache = list(self.platforms)
-            self._solid_platforms_cache.extend(
-                p for p in self.temporal_platforms if p.state == 'solid')
-            self._solid_platforms_cache.extend(
-                door for door in self.paradox_doors if door.locked)
-            self._solid_platforms_signature = signature
+        """Zwraca cache'owaną listę kolizji, odbudowywaną tylko po zmianie stanu."""
+        if self._solid_platforms_cache is None:
+            self._solid_platforms_cache = list(self.solid_grid)
         return self._solid_platforms_cache
 
     def get_time_scale(self, actor):
@@ -100,11 +289,18 @@ class Level:
                    if actor.rect.colliderect(zone.rect)]
         return min(factors, default=1.0)
 
+    def advance_temporal(self, frames):
+        """Przesuwa wszystkie platformy czasowe o ``frames`` klatek naraz."""
+        for platform in self.temporal_platforms:
+            platform.advance(frames)
+
     # Aktualizacja stanu poziomu
     def update(self, player_vel_x, player_vel_y=0):
-        previous_temporal_states = tuple(p.state for p in self.temporal_platforms)
         self.background.update(player_vel_x, player_vel_y)
         self.platforms.update()
+        for platform in self._moving_platforms:
+            self.solid_grid.update(platform)
+        # Przejścia stanów trafiają do _on_solid_change, bez porównywania krotek
         self.temporal_platforms.update()
         self.time_dilation_zones.update()
         self.paradox_switches.update()
@@ -121,32 +317,32 @@ class Level:
             self.exit_zone.locked = False
             Player.play_sfx("gate_open")
 
-        for switch in self.paradox_switches:
-            if switch.pressed:
-                for door in self.paradox_doors:
-                    door.open()
-        current_temporal_states = tuple(p.state for p in self.temporal_platforms)
-        if current_temporal_states != previous_temporal_states:
-            self._solid_platforms_signature = None
+        if any(switch.pressed for switch in self.paradox_switches):
+            for door in self.paradox_doors:
+                door.open()
 
     # Sprawdź, czy gracz zebrał wszystkie przedmioty
     def draw(self, surface, draw_background=True):
         if draw_background:
             self.background.draw(surface)
-        for platform in self.platforms:
-            platform.draw(surface)
-        for platform in self.temporal_platforms:
-            platform.draw(surface)
-        for zone in self.time_dilation_zones:
-            zone.draw(surface)
-        for hazard in self.hazards:
-            hazard.draw(surface)
-        for collectible in self.collectibles:
-            collectible.draw(surface)
-        for key in self.keys:
-            key.draw(surface)
-        for switch in self.paradox_switches:
-            switch.draw(surface)
-        for door in self.paradox_doors:
-            door.draw(surface)
-        self.exit_zone.draw(surface, remaining_keys=len(self.keys))
+        self.draw_static(surface)
+        self.draw_dynamic(surface)
+
+    def draw_static(self, surface):
+        """Rysuje warstwy statyczne, w razie potrzeby wypalając je od nowa."""
+        self._bake_static_layers()
+        surface.blit(self._static_layer, (0, 0))
+        surface.blits(self._overlay_tiles, doreturn=False)
+
+    def draw_dynamic(self, surface):
+        """Rysuje elementy ruchome i animowane; zwraca listę zmienionych prostokątów."""
+        self._bake_static_layers()
+        dirty = [platform.draw(surface) for platform in self._moving_platforms]
+        dirty += [platform.draw(surface) for platform in self.temporal_platforms]
+        dirty += surface.blits(self._zone_tiles)
+        dirty += [hazard.draw(surface) for hazard in self.hazards]
+        dirty += [collectible.draw(surface) for collectible in self.collectibles]
+        dirty += [key.draw(surface) for key in self.keys]
+        dirty += surface.blits(self._upper_tiles)
+        dirty.append(self.exit_zone.draw(surface, remaining_keys=len(self.keys), draw_gate=False))
+        return dirty
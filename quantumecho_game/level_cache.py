@@ -0,0 +1,80 @@
+"""Trwały cache wygenerowanych poziomów Arcade.
+
+Poziom Arcade zależy tylko od ziarna, numeru poziomu i wersji generatora,
+więc te trzy wartości wyznaczają klucz (skrót SHA-256). Wpis przechowuje dane
+poziomu, Golden Path i werdykt solvera. Zmiana ``GENERATOR_VERSION`` zmienia
+wszystkie klucze, dlatego stare wpisy nigdy nie są odczytane.
+
+Cache ma sens tylko dla stałych ziaren (wyzwanie dnia, powtórki z tabeli
+wyników). Zwykła gra losuje ziarno przy każdym uruchomieniu i nigdy by z niego
+nie skorzystała, dlatego ``main()`` nie przekazuje go do ``ArcadeManager``.
+Po zapisie wpisy ponad ``max_entries`` są usuwane od najstarszego (także te
+ze starszych wersji generatora).
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+CACHE_FORMAT = 1
+MAX_ENTRIES = 256
+
+
+def cache_key(seed, level_number, generator_version):
+    identity = json.dumps([CACHE_FORMAT, generator_version, seed, level_number])
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class LevelCache:
+    """Katalog wpisów ``<klucz[:2]>/<klucz>.json``."""
+
+    def __init__(self, directory, generator_version, max_entries=MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.generator_version = generator_version
+        self.max_entries = max_entries
+
+    def _path(self, seed, level_number, suffix):
+        key = cache_key(seed, level_number, self.generator_version)
+        return self.directory / key[:2] / f"{key}{suffix}"
+
+    def load(self, seed, level_number):
+        """Wpis poziomu albo None (brak, uszkodzony plik lub inny klucz)."""
+        try:
+            with self._path(seed, level_number, ".json").open(encoding="utf-8") as stream:
+                entry = json.load(stream)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get("key") != [self.generator_version, seed, level_number]:
+            return None
+        return entry
+
+    def store(self, seed, level_number, entry):
+        """Zapisuje wpis atomowo, aby przerwany zapis nie zostawił połowy pliku."""
+        path = self._path(seed, level_number, ".json")
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with temporary.open("w", encoding="utf-8") as stream:
+                json.dump({**entry, "key": [self.generator_version, seed, level_number]}, stream)
+            os.replace(temporary, path)
+        except OSError:
+            # Cache jest tylko przyspieszeniem; brak miejsca lub uprawnień nie przerywa gry.
+            temporary.unlink(missing_ok=True)
+            return
+        self._prune()
+
+    def _prune(self):
+        """Usuwa najstarsze wpisy ponad ``max_entries``."""
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except OSError:
+                continue  # Usunięty w międzyczasie
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
@@ -0,0 +1,66 @@
+"""Przygotowanie kolejnego poziomu Arcade w tle.
+
+Zbudowanie poziomu to generator, solver i ``Simulation`` z teksturami oraz
+tłem, co trwa dłużej niż jedna klatka. ``ArcadePrefetcher`` robi to w wątku
+roboczym, gdy gracz jest jeszcze na bieżącym poziomie, a przejście przez
+wyjście tylko podmienia gotowe obiekty. Wątek tworzy wyłącznie własne
+powierzchnie; wspólne tekstury z napisami (brama wyjścia) powstają wcześniej
+w wątku głównym.
+"""
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from .entities import ExitZone
+from .simulation import Simulation
+
+
+class ArcadePrefetcher:
+    """Jeden wątek roboczy budujący następny poziom ``ArcadeManager``."""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="arcade-prefetch")
+        self._pending = None  # ((seed, numer poziomu), Future)
+
+    def _next_key(self):
+        return self.manager.seed, self.manager.level_number + 1
+
+    def request(self):
+        """Zleca budowę poziomu następującego po bieżącym (o ile nie jest już zlecona)."""
+        key = self._next_key()
+        if self._pending and self._pending[0] == key:
+            return
+        self.cancel()
+        ExitZone.gate_structure()
+        # Ziarno świata losujemy tutaj, aby wątek nie korzystał z globalnego ``random``.
+        seed = random.randrange(1 << 30)
+        self._pending = (key, self._executor.submit(self._build, key[1], seed))
+
+    def _build(self, level_number, seed):
+        level = self.manager.build(level_number)
+        return level, Simulation(level.data, level_number, second_life=False, seed=seed)
+
+    def next_level(self):
+        """Przechodzi do kolejnego poziomu; zwraca (dane, Simulation).
+
+        Gdy poziom jest zlecony, czeka na wątek (zwykle już skończył), w
+        przeciwnym razie buduje go od razu.
+        """
+        pending, self._pending = self._pending, None
+        if pending and pending[0] == self._next_key():
+            level, simulation = pending[1].result()
+        else:
+            if pending:
+                pending[1].cancel()
+            level, simulation = self._build(self._next_key()[1], random.randrange(1 << 30))
+        return self.manager.accept(level), simulation
+
+    def cancel(self):
+        if self._pending:
+            self._pending[1].cancel()
+            self._pending = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,63 @@
+"""Renderer prostokątów zmian (dirty rects) dla ekranu rozgrywki.
+
+Zwykła ścieżka co klatkę czyści ekran, rysuje tło, cały poziom i wysyła
+całą ramkę 1280×720 przez ``display.flip``. Przy renderowaniu programowym
+to właśnie kopiowanie pikseli jest najdroższe. ``DirtyRectRenderer``
+trzyma obraz bazowy (tło i warstwy statyczne poziomu), przywraca go tylko
+pod prostokątami narysowanymi w poprzedniej klatce i wysyła do okna same
+zmienione obszary przez ``display.update``.
+
+Tło jest w tym trybie zamrożone: chmury i warstwy gwiazd zostają w
+położeniu z chwili zbudowania obrazu bazowego.
+"""
+
+import pygame
+
+
+class DirtyRectRenderer:
+    """Przyrostowe rysowanie jednej sceny na ekranie."""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.base = None
+        self._background = None
+        self._level = None
+        self._static_version = None
+        self._previous = []
+
+    def invalidate(self):
+        """Ekran został narysowany inną drogą; następna klatka będzie pełna."""
+        self._static_version = None
+
+    def begin(self, level):
+        """Przygotowuje ekran pod elementy dynamiczne.
+
+        Zwraca None, gdy trzeba wysłać całą ramkę (nowy poziom, zmiana warstw
+        statycznych albo powrót z innego ekranu), a w przeciwnym razie listę
+        prostokątów przywróconych z obrazu bazowego.
+        """
+        if level is not self._level:
+            self._background = pygame.Surface(self.screen.get_size(), 0, self.screen)
+            level.background.draw(self._background)
+            self._level = level
+            self._static_version = None
+        if self._static_version != level.static_version:
+            self.base = self._background.copy()
+            level.draw_static(self.base)
+            self._static_version = level.static_version
+            self.screen.blit(self.base, (0, 0))
+            self._previous = []
+            return None
+        restored = self._previous
+        self.screen.blits([(self.base, rect, rect) for rect in restored], doreturn=False)
+        return restored
+
+    def finish(self, restored, dirty):
+        """Wysyła do okna przywrócone i nowo narysowane obszary."""
+        bounds = self.screen.get_rect()
+        current = [rect.clip(bounds) for rect in dirty if rect]
+        self._previous = [rect for rect in current if rect]
+        if restored is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(restored + self._previous)
@@ -0,0 +1,174 @@
+"""Nagrywanie wejścia klatka po klatce i odtwarzanie prób bez renderowania.
+
+Nagranie zawiera dane poziomu, jego tożsamość, ziarno świata oraz wejście
+każdej klatki zakodowane jako mała maska bitowa. Powtórka buduje ``Simulation``
+z tym samym ziarnem i wykonuje kroki bez okna i bez ``clock.tick(FPS)``, więc
+próbę z raportu błędu da się odtworzyć wielokrotnie szybciej niż w grze.
+"""
+
+import json
+import os
+from typing import NamedTuple
+
+from .simulation import Simulation
+
+# Wersja 3: tekstury platform nie korzystają już z generatora świata (są
+# wspólne, zob. textures.py), więc to samo ziarno daje dalszym elementom
+# świata inne fazy animacji niż we wcześniejszych wersjach.
+REPLAY_VERSION = 3
+
+LEFT_BIT = 1
+RIGHT_BIT = 2
+SWAP_BIT = 4
+PAUSE_BIT = 8
+JUMP_SHIFT = 4
+MAX_JUMPS_PER_FRAME = 3
+REWIND_BIT = 64
+
+
+class FrameInput(NamedTuple):
+    """Wejście jednej klatki pętli ``main()``."""
+
+    left: bool = False
+    right: bool = False
+    jumps: int = 0
+    swap: bool = False
+    paused: bool = False
+    rewind: bool = False
+
+    def encode(self):
+        return (LEFT_BIT * bool(self.left) | RIGHT_BIT * bool(self.right)
+                | SWAP_BIT * bool(self.swap) | PAUSE_BIT * bool(self.paused)
+                | REWIND_BIT * bool(self.rewind)
+                | min(self.jumps, MAX_JUMPS_PER_FRAME) << JUMP_SHIFT)
+
+    @classmethod
+    def decode(cls, mask):
+        return cls(bool(mask & LEFT_BIT), bool(mask & RIGHT_BIT),
+                   (mask >> JUMP_SHIFT) & MAX_JUMPS_PER_FRAME,
+                   bool(mask & SWAP_BIT), bool(mask & PAUSE_BIT), bool(mask & REWIND_BIT))
+
+
+class InputRecorder:
+    """Zbiera wejście jednej próby przejścia poziomu.
+
+    Skok i zamiana są zgłaszane w chwili obsługi zdarzenia, a ``end_frame``
+    zamyka klatkę razem ze stanem kierunków. Klatka pauzy jest zapisywana, ale
+    nie wykonuje kroku symulacji.
+    """
+
+    def __init__(self, simulation, level_data, level_info=None):
+        self.simulation = simulation
+        self.level_data = level_data
+        self.level_info = dict(level_info or {})
+        self.frames = []
+        self._jumps = 0
+        self._swap = False
+        self._rewind = False
+
+    def jump(self):
+        self._jumps += 1
+
+    def swap(self):
+        self._swap = True
+
+    def rewind(self):
+        # Cofnięcie przywraca pełną migawkę, więc wcześniejsze skoki i zamiany
+        # z tej samej klatki nie mają już wpływu na stan gry.
+        self._rewind = True
+        self._jumps = 0
+        self._swap = False
+
+    def end_frame(self, left=False, right=False, paused=False):
+        self.frames.append(FrameInput(left, right, self._jumps, self._swap, paused,
+                                      self._rewind).encode())
+        self._jumps = 0
+        self._swap = False
+        self._rewind = False
+
+    def to_dict(self):
+        player = self.simulation.player
+        return {
+            "version": REPLAY_VERSION,
+            "level": self.level_info,
+            "level_data": self.level_data,
+            "seed": self.simulation.seed,
+            "second_life": self.simulation.second_life,
+            "rewind": self.simulation.rewind_snapshots is not None,
+            "frames": encode_frames(self.frames),
+            "final": {"frame_count": len(self.frames),
+                      "level_time": self.simulation.level_time,
+                      "player": list(player.rect.topleft)},
+        }
+
+
+def encode_frames(masks):
+    """Koduje maski klatek jako pary [maska, liczba powtórzeń]."""
+    runs = []
+    for mask in masks:
+        if runs and runs[-1][0] == mask:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+    return runs
+
+
+def iter_frames(recording):
+    for mask, count in recording["frames"]:
+        frame_input = FrameInput.decode(mask)
+        for _ in range(count):
+            yield frame_input
+
+
+def replay(recording, on_frame=None):
+    """Odtwarza nagranie z maksymalną prędkością i zwraca końcową symulację.
+
+    ``on_frame(simulation, frame_input, result)`` jest wywoływane po każdej
+    klatce, co pozwala narzędziom szukać momentu wystąpienia błędu.
+    """
+    simulation = Simulation(recording["level_data"], recording["level"].get("index", 0),
+                            second_life=recording.get("second_life", True),
+                            seed=recording["seed"], rewind=recording.get("rewind", False))
+    for frame_input in iter_frames(recording):
+        if frame_input.rewind:
+            simulation.rewind()
+        for _ in range(frame_input.jumps):
+            simulation.jump()
+        if frame_input.swap:
+            simulation.swap()
+        result = None if frame_input.paused else simulation.step(frame_input.left, frame_input.right)
+        if on_frame:
+            on_frame(simulation, frame_input, result)
+    return simulation
+
+
+def verify_replay(recording):
+    """Sprawdza, czy powtórka kończy się w tym samym stanie co nagranie."""
+    simulation = replay(recording)
+    final = recording["final"]
+    return (simulation.level_time == final["level_time"]
+            and list(simulation.player.rect.topleft) == final["player"])
+
+
+def save_replay(filename, recording):
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(filename, "w", encoding="utf-8") as file:
+        json.dump(recording, file, ensure_ascii=False)
+
+
+def load_replay(filename):
+    try:
+        with open(filename, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        print(f"Błąd: Nie można znaleźć pliku powtórki: {filename}")
+        return None
+    except json.JSONDecodeError as error:
+        print(f"Błąd: Niepoprawny format pliku powtórki '{filename}': {error}")
+        return None
+    if data.get("version") != REPLAY_VERSION:
+        print(f"Błąd: Nieobsługiwana wersja powtórki '{filename}'.")
+        return None
+    return data
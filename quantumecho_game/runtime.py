@@ -1,9 +1,15 @@
-"""Współdzielone zasoby Pygame."""
+"""Współdzielone zasoby Pygame wymagające okna i miksera.
+
+Import tego modułu otwiera okno pełnoekranowe. Kod symulacji (``Level``,
+``Player``, ``simulation``) nie może z niego korzystać.
+"""
 
-import os
 import pygame
 
 from .config import SCREEN_WIDTH, SCREEN_HEIGHT
+# Czcionki nie wymagają okna, dlatego żyją w osobnym module współdzielonym
+# z symulacją bez ekranu. Tutaj jedynie je re-eksportujemy dla app.py i ui.py.
+from .fonts import FONT_PATH, font_large, font_medium, font_small
 
 # Mikser musi być gotowy przed pygame.init(), ponieważ app.py ładuje dźwięki
 # podczas inicjalizacji współdzielonych zasobów.
@@ -23,14 +29,3 @@ screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREE
 pygame.display.set_caption("Quantum Echo - Manipuluj Czasem!")
 clock = pygame.time.Clock()
 
-PACKAGE_DIR = os.path.dirname(__file__)
-FONT_PATH = os.path.join(PACKAGE_DIR, "fonts", "VT323-Regular.ttf")
-try:
-    font_small = pygame.font.Font(FONT_PATH, 24)
-    font_medium = pygame.font.Font(FONT_PATH, 40)
-    font_large = pygame.font.Font(FONT_PATH, 80)
-except (pygame.error, FileNotFoundError):
-    print(f"Błąd: Nie można wczytać czcionki z '{FONT_PATH}'. Używam czcionki domyślnej.")
-    font_small = pygame.font.Font(None, 24)
-    font_medium = pygame.font.Font(None, 36)
-    font_large = pygame.font.Font(None, 72)
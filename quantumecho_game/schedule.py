@@ -0,0 +1,49 @@
+"""Analityczny harmonogram platform czasowych.
+
+``TemporalPlatform.update`` zwiększa licznik co klatkę i zmienia stan po
+przekroczeniu progu, więc stan stały trwa ``solid_time + 1`` klatek, a
+niematerialny ``phased_time + 1``. Cykl ma zatem stałą długość i stan w
+dowolnej klatce da się policzyć w O(1), bez krokowania świata. Korzystają z
+tego przeskoki symulacji, generator Arcade i narzędzia do analizy poziomów.
+"""
+
+from typing import NamedTuple
+
+
+class TemporalSchedule(NamedTuple):
+    """Harmonogram liczony od klatki 0, czyli od wczytania poziomu."""
+
+    solid_time: int = 180
+    phased_time: int = 120
+    initial_state: str = 'solid'
+
+    @property
+    def period(self):
+        return self.solid_time + self.phased_time + 2
+
+    def _offset(self, state, timer):
+        """Położenie stanu (state, timer) w cyklu zaczynającym się od fazy stałej."""
+        return timer if state == 'solid' else self.solid_time + 1 + timer
+
+    def _at_offset(self, offset):
+        offset %= self.period
+        if offset <= self.solid_time:
+            return 'solid', offset
+        return 'phased', offset - self.solid_time - 1
+
+    def phase_at(self, frame):
+        """Zwraca (state, timer) po ``frame`` wywołaniach ``update``."""
+        return self._at_offset(self._offset(self.initial_state, 0) + frame)
+
+    def is_solid_at(self, frame):
+        return self.phase_at(frame)[0] == 'solid'
+
+    def advance(self, state, timer, frames):
+        """Stan po kolejnych ``frames`` klatkach, licząc od (state, timer)."""
+        return self._at_offset(self._offset(state, timer) + frames)
+
+    def frames_until_change(self, frame):
+        """Ile klatek po ``frame`` nastąpi najbliższa zmiana stanu."""
+        state, timer = self.phase_at(frame)
+        duration = self.solid_time if state == 'solid' else self.phased_time
+        return duration - timer + 1
@@ -0,0 +1,216 @@
+"""Rdzeń rozgrywki działający bez okna i bez miksera.
+
+``Simulation`` wykonuje dokładnie te same kroki klatki co pętla ``main()``:
+wejście gracza, aktualizację poziomu, fizykę, historię Echa, bufor skoku,
+przejęcie Echa po śmierci i odtwarzanie Echa. Moduł nie importuje
+``runtime.py``, więc można go uruchamiać w testach i zadaniach wsadowych bez
+tworzenia okna i bez ograniczania tempa przez ``clock.tick(FPS)``.
+"""
+
+import random
+from collections import deque
+
+import pygame
+
+from .config import (
+    BLUE, ECHO_DELAY_FRAMES, JUMP_BUFFER_FRAMES, REWIND_INTERVAL_FRAMES, REWIND_SNAPSHOTS,
+    SWAP_COOLDOWN_FRAMES,
+)
+from .echoes import EchoGroup
+from .entities import Player
+from .history import EchoHistory
+from .level import Level
+
+
+class DirectionKeys:
+    """Minimalny odpowiednik ``pygame.key.get_pressed()`` dla ``handle_input``."""
+
+    def __init__(self, left=False, right=False):
+        self.left = left
+        self.right = right
+
+    def __getitem__(self, key):
+        if key == pygame.K_LEFT or key == pygame.K_a:
+            return self.left
+        if key == pygame.K_RIGHT or key == pygame.K_d:
+            return self.right
+        return False
+
+
+class Simulation:
+    """Stan jednej próby przejścia poziomu: świat, gracz, Echo i liczniki."""
+
+    def __init__(self, level_data, level_index=0, second_life=True, seed=None, rewind=False):
+        # Ziarno opisuje wszystkie losowe elementy świata, więc ten sam
+        # poziom z tym samym ziarnem i tym samym wejściem daje tę samą grę.
+        self.seed = seed if seed is not None else random.randrange(1 << 30)
+        self.level = Level(level_data, level_index, rng=random.Random(self.seed))
+        start_x, start_y = self.level.start_pos
+        self.player = Player(start_x, start_y)
+        self.echo = Player(start_x, start_y, is_echo=True)
+        # Poziom może mieć własne opóźnienie Echa; domyślnie 10 sekund.
+        # Przy kilku Echach (``echo_delays``) zwykłe Echo ma najdłuższe
+        # opóźnienie, a krótsze są obsługiwane wsadowo przez EchoGroup.
+        delays = sorted({int(delay) for delay in level_data.get('echo_delays', ())})
+        self.echo_delay = delays[-1] if delays else int(level_data.get('echo_delay_frames', ECHO_DELAY_FRAMES))
+        self.player_history = EchoHistory(self.echo_delay + 1)
+        self.echoes = None
+        if len(delays) > 1:
+            self.echoes = EchoGroup(self.player_history, delays[:-1], self.level.start_pos,
+                                    self.level.paradox_switches)
+        # Tryb Arcade nie daje drugiego życia: śmierć kończy próbę.
+        self.second_life = second_life
+        self.is_on_second_life = False
+        self.level_time = 0
+        self.swap_cooldown = 0
+        self.swap_count = 0
+        self.jump_buffer_frames = 0
+        self.death_position = None
+        # Obie postacie żyją przez całą próbę; po śmierci zmieniają się tylko
+        # role, więc migawka może przywrócić stan sprzed przejęcia Echa.
+        self._bodies = (self.player, self.echo)
+        self._echoes = self.echoes
+        self.initial_snapshot = self.snapshot()
+        self.rewind_snapshots = None
+        if rewind:
+            self.rewind_snapshots = deque([self.initial_snapshot], maxlen=REWIND_SNAPSHOTS)
+
+    def snapshot(self):
+        """Kompaktowy zapis całej symulacji (świat, postacie, historia, liczniki)."""
+        return {
+            'level': self.level.snapshot(),
+            'bodies': tuple(body.snapshot() for body in self._bodies),
+            'history': self.player_history.snapshot(),
+            'echoes': self._echoes.snapshot() if self._echoes else None,
+            'is_on_second_life': self.is_on_second_life,
+            'level_time': self.level_time,
+            'swap_cooldown': self.swap_cooldown,
+            'swap_count': self.swap_count,
+            'jump_buffer_frames': self.jump_buffer_frames,
+            'death_position': self.death_position,
+        }
+
+    def restore(self, snapshot):
+        self.level.restore(snapshot['level'])
+        for body, state in zip(self._bodies, snapshot['bodies']):
+            body.restore(state)
+        self.player_history.restore(snapshot['history'])
+        if self._echoes:
+            self._echoes.restore(snapshot['echoes'])
+        self.is_on_second_life = snapshot['is_on_second_life']
+        if self.is_on_second_life:
+            self.player, self.echo, self.echoes = self._bodies[1], None, None
+        else:
+            self.player, self.echo = self._bodies
+            self.echoes = self._echoes
+        for name in ('level_time', 'swap_cooldown', 'swap_count', 'jump_buffer_frames',
+                     'death_position'):
+            setattr(self, name, snapshot[name])
+
+    def restart(self):
+        """Natychmiastowy restart: przywraca migawkę startową zamiast budować Level od nowa."""
+        self.restore(self.initial_snapshot)
+        if self.rewind_snapshots is not None:
+            self.rewind_snapshots.clear()
+            self.rewind_snapshots.append(self.initial_snapshot)
+
+    def rewind(self):
+        """Cofa świat o co najmniej ``REWIND_INTERVAL_FRAMES`` klatek.
+
+        Zwraca False, gdy cofanie jest wyłączone albo brak starszych migawek.
+        """
+        snapshots = self.rewind_snapshots
+        if not snapshots:
+            return False
+        target = self.level_time - REWIND_INTERVAL_FRAMES
+        while len(snapshots) > 1 and snapshots[-1]['level_time'] > target:
+            snapshots.pop()
+        self.restore(snapshots[-1])
+        return True
+
+    def jump(self):
+        """Skok gracza; nieudane naciśnięcie trafia do krótkiego bufora."""
+        if self.player.jump():
+            return True
+        self.jump_buffer_frames = JUMP_BUFFER_FRAMES
+        return False
+
+    def swap(self):
+        """Kwantowa Zamiana pozycji gracza i Echa. Zwraca True po wykonaniu."""
+        if self.echo is None or self.swap_cooldown or self.is_on_second_life:
+            return False
+        self.player.rect, self.echo.rect = self.echo.rect, self.player.rect
+        self.swap_cooldown = SWAP_COOLDOWN_FRAMES
+        self.swap_count += 1
+        return True
+
+    def step(self, left=False, right=False):
+        """Wykonuje jedną klatkę rozgrywki i zwraca wynik kolizji gracza.
+
+        Oprócz wartości zwracanych przez ``Player.update`` wynikiem może być
+        ``"echo_takeover"``, gdy gracz zginął i przejął kontrolę nad Echem.
+        """
+        level = self.level
+        player = self.player
+        self.level_time += 1
+        if self.swap_cooldown > 0:
+            self.swap_cooldown -= 1
+        if self.jump_buffer_frames > 0:
+            self.jump_buffer_frames -= 1
+
+        player.handle_input(DirectionKeys(left, right))
+
+        # Świat aktualizujemy przed wyznaczeniem kolizji. Dzięki temu
+        # siatka kolizji odpowiada stanowi platform przez całą klatkę.
+        level.update(player.vel_x, player.vel_y)
+        result = player.update(level.solid_grid, level.hazard_grid, level.collectibles, level.keys,
+                               time_dilation_zones=level.time_dilation_zones)
+
+        if not self.is_on_second_life:
+            # Zapisujemy stan po fizyce, dzięki czemu Echo odtwarza pełną klatkę.
+            self.player_history.record(player)
+
+        # Jeśli skok został wciśnięty tuż przed lądowaniem, wykonaj go
+        # natychmiast po wykryciu podłoża.
+        if self.jump_buffer_frames > 0 and player.jump():
+            self.jump_buffer_frames = 0
+
+        if result in ("hit", "fell") and self.second_life and not self.is_on_second_life and self.echo:
+            self._take_over_echo()
+            result = "echo_takeover"
+
+        if self.echo:
+            history_pos = self.player_history.position(self.echo_delay)
+            self.echo.update(level.solid_grid, [], [], [], history_pos=history_pos,
+                             paradox_switches=level.switch_grid)
+        if self.echoes:
+            self.echoes.update()
+
+        if self.rewind_snapshots is not None and self.level_time % REWIND_INTERVAL_FRAMES == 0:
+            self.rewind_snapshots.append(self.snapshot())
+        return result
+
+    def _take_over_echo(self):
+        """Gracz ginie, a sterowanie przechodzi na Echo sprzed ``echo_delay`` klatek."""
+        player, echo = self.player, self.echo
+        self.death_position = player.rect.center
+        self.is_on_second_life = True
+
+        # Przeniesienie stanu gracza do Echa
+        echo.has_double_jump = player.has_double_jump
+        echo.invincible = player.invincible
+        echo.invincible_timer = player.invincible_timer
+
+        echo.is_echo = False
+        echo.color = BLUE
+        echo.image.fill(echo.color)
+        self.player = echo
+        self.echo = None  # Echo nie jest już aktywne
+        self.echoes = None  # Historia nie jest już zapisywana
+
+    def reached_exit(self):
+        exit_zone = self.level.exit_zone
+        return not exit_zone.locked and self.player.rect.colliderect(exit_zone.rect)
+
+    def gems_left(self):
+        return sum(1 for collectible in self.level.collectibles if collectible.type == "gem")
@@ -0,0 +1,386 @@
+"""Solver osiągalności poziomów (start -> klucz -> wyjście).
+
+Graf skoków powstaje z symulacji lotu gracza na ``pygame.Rect`` z tymi samymi
+regułami co ``Player._apply_physics``: ``GRAVITY``, ``JUMP_FORCE``,
+``PLAYER_SPEED``, kolizje osobno w osi X i Y oraz zaokrąglenia prostokąta.
+Z każdej platformy wykonujemy kilka skoków i zejść z krawędzi, sterując w
+stronę platform docelowych, a krawędź grafu to zapis takiego lotu.
+
+Węzłami grafu są odcinki platform, po których da się chodzić: kolce leżące
+na platformie dzielą ją na osobne odcinki, a lot, który w dowolnej klatce
+(także przy lądowaniu) dotyka kolców, jest odrzucany.
+
+Platformy czasowe nie są przeszkodami w samej symulacji. Lot zapamiętuje
+klatki, w których gracz mógłby na nich wylądować albo by się z nimi zderzył,
+a przeszukiwanie po stanach (odcinek, klatka modulo okres harmonogramów)
+rozstrzyga to według ``TemporalSchedule``. Solver jest zachowawczy: zderzenie
+z materialną platformą czasową w locie unieważnia lot, przy zbyt długim
+wspólnym okresie platformy czasowe tylko blokują (nie da się na nich stanąć),
+a ruchome platformy, power-upy i tarcza są pomijane.
+"""
+
+import functools
+import math
+from collections import deque
+from typing import NamedTuple
+
+import pygame
+
+from .config import (
+    GRAVITY, JUMP_FORCE, PLAYER_HEIGHT, PLAYER_SPEED, PLAYER_WIDTH, SCREEN_HEIGHT, SCREEN_WIDTH,
+)
+from .schedule import TemporalSchedule
+
+MAX_AIR_FRAMES = 150
+TAKEOFF_STEP = 2 * PLAYER_WIDTH
+# Powyżej tej liczby klatek wspólnego okresu platformy czasowe tylko blokują.
+MAX_HYPERPERIOD = 6000
+KEY_SIZE = 40
+EXIT_SIZE = 80
+
+
+class Surface(NamedTuple):
+    """Platforma, na której gracz może stanąć."""
+
+    rect: pygame.Rect
+    schedule: TemporalSchedule = None
+
+    def is_solid_at(self, frame):
+        return self.schedule is None or self.schedule.is_solid_at(frame)
+
+
+class SolveResult(NamedTuple):
+    solvable: bool
+    key_reached: bool
+    exit_reached: bool
+    route: tuple = ()  # Indeksy platform (w kolejności ``surfaces``) od startu do wyjścia
+
+
+@functools.lru_cache(maxsize=None)
+def jump_height():
+    """Maksymalne wzniesienie skoku w pikselach, liczone krokowo jak w grze."""
+    rect = pygame.Rect(0, 0, PLAYER_WIDTH, PLAYER_HEIGHT)
+    vel_y = JUMP_FORCE
+    top = 0
+    while vel_y < 0:
+        vel_y += GRAVITY
+        rect.y += vel_y
+        top = min(top, rect.y)
+    return -top
+
+
+def level_surfaces(level_data):
+    """Platformy stałe, potem czasowe, z danych poziomu (bez ruchomych)."""
+    surfaces = [Surface(pygame.Rect(p['x'], p['y'], p['width'], p['height']))
+                for p in level_data.get('platforms', []) if not p.get('moving', False)]
+    for p in level_data.get('temporal_platforms', []):
+        schedule = TemporalSchedule(p.get('solid_time', 180), p.get('phased_time', 120),
+                                    p.get('initial_state', 'solid'))
+        surfaces.append(Surface(pygame.Rect(p['x'], p['y'], p['width'], p['height']), schedule))
+    return surfaces
+
+
+def _standing_range(surface_rect):
+    """Zakres rect.x, w którym gracz stoi na platformie środkiem ciała."""
+    half = PLAYER_WIDTH // 2
+    return surface_rect.left - half, surface_rect.right - half
+
+
+def level_hazards(level_data):
+    return [pygame.Rect(h['x'], h['y'], h['width'], h['height']) for h in level_data.get('hazards', [])]
+
+
+def walkable_segments(surfaces, hazards):
+    """Odcinki platform bez kolców: lista (Surface odcinka, indeks platformy).
+
+    Prostokąt odcinka ma taki ``_standing_range``, jak zakres rect.x gracza
+    stojącego na platformie i niedotykającego żadnych kolców.
+    """
+    half = PLAYER_WIDTH // 2
+    segments = []
+    for owner, surface in enumerate(surfaces):
+        rect = surface.rect
+        intervals = [_standing_range(rect)]
+        for hazard in hazards:
+            if not (hazard.top < rect.top and hazard.bottom > rect.top - PLAYER_HEIGHT):
+                continue
+            # Gracz dotyka kolców dla rect.x od left - szerokość + 1 do right - 1.
+            blocked_low, blocked_high = hazard.left - PLAYER_WIDTH + 1, hazard.right - 1
+            intervals = [piece for low, high in intervals
+                         for piece in ((low, min(high, blocked_low - 1)), (max(low, blocked_high + 1), high))
+                         if piece[0] <= piece[1]]
+        for low, high in intervals:
+            segment = pygame.Rect(low + half, rect.top, high - low, rect.height)
+            segments.append((Surface(segment, surface.schedule), owner))
+    return segments
+
+
+class _Flight:
+    """Symulacja lotu gracza ze sterowaniem w stronę wybranego zakresu X."""
+
+    def __init__(self, surfaces, segments, hazards, temporal_landable=True):
+        self.static = [s.rect for s in surfaces if s.schedule is None]
+        self.static_index = [i for i, s in enumerate(surfaces) if s.schedule is None]
+        self.temporal = [s.rect for s in surfaces if s.schedule is not None]
+        self.temporal_index = [i for i, s in enumerate(surfaces) if s.schedule is not None]
+        self.hazards = hazards
+        self.temporal_landable = temporal_landable
+        # Platforma -> [(od, do, węzeł)] w zakresach rect.x gracza
+        self.segments = {}
+        for node, (segment, owner) in enumerate(segments):
+            self.segments.setdefault(owner, []).append((*_standing_range(segment.rect), node))
+
+    def _node_at(self, owner, x):
+        """Odcinek platformy ``owner``, na który trafia gracz lądujący w rect.x == ``x``.
+
+        Gracz może wylądować samym brzegiem ciała poza zakresem odcinków;
+        bez kolców pod sobą dochodzi wtedy do najbliższego z nich.
+        """
+        segments = self.segments.get(owner)
+        if not segments:
+            return None
+        return min(segments, key=lambda segment: max(segment[0] - x, x - segment[1], 0))[2]
+
+    def run(self, x, y, vel_y, aim, hold_below=None):
+        """Zwraca lot: (zdarzenia, lądowanie na stałej platformie).
+
+        Zdarzenie to (klatka, indeks platformy czasowej, węzeł lądowania albo
+        None, gdy to tylko zderzenie); (klatka, None, None) oznacza kolce.
+        Lądowanie na stałej platformie to (węzeł, klatka) albo None. Przy
+        ``hold_below`` gracz wznosi się pionowo, dopóki jest niżej niż ta
+        wysokość, i dopiero potem skręca (np. aby obejść krawędź platformy).
+        """
+        rect = pygame.Rect(x, y, PLAYER_WIDTH, PLAYER_HEIGHT)
+        aim_low, aim_high = aim
+        rects = self.static
+        temporal = self.temporal
+        hazards = self.hazards
+        events = []
+        for frame in range(1, MAX_AIR_FRAMES + 1):
+            if hold_below is not None and vel_y < 0 and rect.bottom > hold_below:
+                vel_x = 0
+            elif rect.x < aim_low:
+                vel_x = PLAYER_SPEED
+            elif rect.x > aim_high:
+                vel_x = -PLAYER_SPEED
+            else:
+                vel_x = 0
+            rect.x += vel_x
+            for index in rect.collidelistall(rects):
+                if rect.colliderect(rects[index]):
+                    if vel_x > 0:
+                        rect.right = rects[index].left
+                    elif vel_x < 0:
+                        rect.left = rects[index].right
+            # Platforma czasowa zatrzymałaby gracza już w ruchu poziomym
+            for index in rect.collidelistall(temporal):
+                events.append((frame, self.temporal_index[index], None))
+
+            previous_bottom = rect.bottom
+            vel_y = min(vel_y + GRAVITY, 20)
+            rect.y += vel_y
+            for index in rect.collidelistall(temporal):
+                owner, node = self.temporal_index[index], None
+                if self.temporal_landable and vel_y > 0 and previous_bottom <= temporal[index].top:
+                    standing = rect.copy()
+                    standing.bottom = temporal[index].top
+                    if standing.collidelist(hazards) == -1:
+                        node = self._node_at(owner, standing.x)
+                events.append((frame, owner, node))
+            landed = None
+            for index in rect.collidelistall(rects):
+                if rect.colliderect(rects[index]):
+                    if vel_y > 0:
+                        rect.bottom = rects[index].top
+                        vel_y = 0
+                        landed = index
+                    elif vel_y < 0:
+                        rect.top = rects[index].bottom
+                        vel_y = 0
+            if rect.collidelist(hazards) != -1:
+                events.append((frame, None, None))
+                break
+            if landed is not None:
+                node = self._node_at(self.static_index[landed], rect.x)
+                return tuple(events), (node, frame) if node is not None else None
+            rect.x = max(0, min(rect.x, SCREEN_WIDTH - PLAYER_WIDTH))
+            if rect.top > SCREEN_HEIGHT:
+                break
+        return tuple(events), None
+
+
+def _solid_frames(surface, period):
+    """Tablica materialności platformy czasowej w kolejnych klatkach okresu."""
+    if surface.schedule is None:
+        return None
+    return bytes(surface.is_solid_at(frame) for frame in range(period))
+
+
+def _landing(flight, frame, solid, period):
+    """Gdzie kończy się lot rozpoczęty w klatce ``frame``: (węzeł, klatki) albo None."""
+    events, landing = flight
+    for offset, owner, node in events:
+        if owner is None:
+            return None
+        if solid[owner][(frame + offset) % period]:
+            return (node, offset) if node is not None else None
+    return landing
+
+
+def build_graph(nodes, flight):
+    """Zbiór lotów wychodzących z każdego węzła (skoki i zejścia z krawędzi)."""
+    rects = [surface.rect for surface in nodes]
+    reach_up = jump_height() + PLAYER_HEIGHT
+    reach_side = PLAYER_SPEED * MAX_AIR_FRAMES
+    edges = {index: set() for index in range(len(nodes))}
+    for index, source in enumerate(rects):
+        low, high = _standing_range(source)
+        y = source.top - PLAYER_HEIGHT
+        # Skoki z całej długości platformy, w lewo, w prawo i pionowo.
+        for x in set(range(low, high, TAKEOFF_STEP)) | {high}:
+            for aim in ((0, 0), (SCREEN_WIDTH, SCREEN_WIDTH), (x, x)):
+                edges[index].add(flight.run(x, y, JUMP_FORCE, aim))
+        for target_index, target in enumerate(rects):
+            if target_index == index or target.top < source.top - reach_up:
+                continue
+            if target.left - source.right > reach_side or source.left - target.right > reach_side:
+                continue
+            aim = _standing_range(target)
+            # Wybicie z obu krańców platformy, z punktów najbliższych celowi
+            # i tuż obok celu, aby nie uderzyć głową w jego spód.
+            takeoffs = {low, high}
+            for x in (aim[0], aim[1], target.left - PLAYER_WIDTH, target.right):
+                takeoffs.add(max(low, min(high, x)))
+            hold = target.top if target.top < source.top else None
+            for x in takeoffs:
+                for hold_below in {None, hold}:
+                    edges[index].add(flight.run(x, y, JUMP_FORCE, aim, hold_below))
+            # Zejście z krawędzi bez skoku (np. na niższą platformę pod spodem).
+            for x in (source.left - PLAYER_WIDTH, source.right):
+                edges[index].add(flight.run(x, y, 0, aim))
+    return edges
+
+
+def _hyperperiod(surfaces):
+    period = 1
+    for surface in surfaces:
+        if surface.schedule is not None:
+            period = math.lcm(period, surface.schedule.period)
+    return period
+
+
+def _touches(surface_rect, target):
+    """Czy gracz stojący na platformie (lub skaczący pionowo) dotknie celu."""
+    low, high = _standing_range(surface_rect)
+    height = jump_height()
+    reach = pygame.Rect(low, surface_rect.top - PLAYER_HEIGHT - height,
+                        high - low + PLAYER_WIDTH, PLAYER_HEIGHT + height)
+    return reach.colliderect(target)
+
+
+def _search(edges, starts, standing, solid, period):
+    """BFS po stanach (węzeł, klatka mod okres); zwraca słownik poprzedników.
+
+    ``standing`` to materialność platformy pod każdym węzłem, ``solid`` —
+    każdej platformy (dla zdarzeń lotu).
+    """
+    # Loty omijające platformy czasowe kończą się zawsze tak samo.
+    fixed = {node: {landing for events, landing in flights
+                    if not events and landing and landing[0] != node}
+             for node, flights in edges.items()}
+    timed = {node: [flight for flight in flights if flight[0]] for node, flights in edges.items()}
+    parents = {state: None for state in starts}
+    queue = deque(starts)
+    while queue:
+        node, frame = queue.popleft()
+        table = standing[node]
+        following = []
+        if table is None or table[(frame + 1) % period]:
+            following.append((node, (frame + 1) % period))
+        if table is None or table[frame]:
+            landings = set(fixed[node])
+            for flight in timed[node]:
+                landing = _landing(flight, frame, solid, period)
+                if landing and landing[0] != node:
+                    landings.add(landing)
+            for target, offset in landings:
+                following.append((target, (frame + offset) % period))
+        for state in following:
+            if state not in parents:
+                parents[state] = (node, frame)
+                queue.append(state)
+    return parents
+
+
+def _extend_route(route, parents, state):
+    """Dokleja do trasy kolejne platformy prowadzące do ``state``."""
+    stage = []
+    while state is not None:
+        if not stage or stage[-1] != state[0]:
+            stage.append(state[0])
+        state = parents[state]
+    for node in reversed(stage):
+        if not route or route[-1] != node:
+            route.append(node)
+
+
+def _platform_route(route, owners):
+    """Trasa po węzłach jako indeksy platform (kolejne odcinki tej samej scalone)."""
+    platforms = []
+    for node in route:
+        if not platforms or platforms[-1] != owners[node]:
+            platforms.append(owners[node])
+    return tuple(platforms)
+
+
+def solve(level_data, surfaces=None):
+    """Sprawdza, czy z punktu startowego da się zebrać klucze i dojść do wyjścia."""
+    surfaces = surfaces if surfaces is not None else level_surfaces(level_data)
+    hazards = level_hazards(level_data)
+    period = _hyperperiod(surfaces)
+    temporal_landable = period <= MAX_HYPERPERIOD
+    if temporal_landable:
+        solid = [_solid_frames(surface, period) for surface in surfaces]
+    else:
+        # Zbyt długi okres: platformy czasowe zawsze blokują, ale nie da się na nich stanąć.
+        period = 1
+        solid = [None if surface.schedule is None else b'\x01' for surface in surfaces]
+    segments = [(segment, owner) for segment, owner in walkable_segments(surfaces, hazards)
+                if temporal_landable or segment.schedule is None]
+    if not segments:
+        return SolveResult(False, False, False)
+    nodes = [segment for segment, _ in segments]
+    owners = [owner for _, owner in segments]
+    standing = [solid[owner] for owner in owners]
+
+    flight = _Flight(surfaces, segments, hazards, temporal_landable)
+    edges = build_graph(nodes, flight)
+    start = level_data['start']
+    spawn = flight.run(start['x'], start['y'], 0, (start['x'], start['x']))
+    landing = _landing(spawn, 0, solid, period)
+    if landing is None:
+        return SolveResult(False, False, False)
+    starts = [(landing[0], landing[1] % period)]
+
+    keys = [pygame.Rect(key['x'], key['y'], KEY_SIZE, KEY_SIZE) for key in level_data.get('buttons', [])]
+    end = level_data.get('end', {})
+    exit_rect = pygame.Rect(end.get('x', 900), end.get('y', 100), EXIT_SIZE, EXIT_SIZE)
+
+    # Klucze zbieramy po kolei; każdy kolejny etap startuje ze stanów,
+    # w których poprzedni klucz był w zasięgu.
+    route = []
+    for key in keys:
+        parents = _search(edges, starts, standing, solid, period)
+        touching = {index for index, surface in enumerate(nodes) if _touches(surface.rect, key)}
+        reached = [state for state in parents if state[0] in touching]
+        if not reached:
+            return SolveResult(False, False, False, _platform_route(route, owners))
+        _extend_route(route, parents, reached[0])
+        starts = reached
+    parents = _search(edges, starts, standing, solid, period)
+    touching = {index for index, surface in enumerate(nodes) if _touches(surface.rect, exit_rect)}
+    reached = [state for state in parents if state[0] in touching]
+    if not reached:
+        return SolveResult(False, True, False, _platform_route(route, owners))
+    _extend_route(route, parents, reached[0])
+    return SolveResult(True, True, True, _platform_route(route, owners))
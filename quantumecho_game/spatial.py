@@ -0,0 +1,154 @@
+"""Równomierna siatka przestrzenna używana jako broadphase kolizji.
+
+Poziomy z edytora składają się z setek kafli 32x32, a gracz styka się
+jednocześnie z kilkoma z nich. Siatka pozwala sprawdzać tylko obiekty z
+komórek wokół gracza zamiast całej listy platform w każdym przebiegu fizyki.
+"""
+
+import bisect
+
+
+class SpatialGrid:
+    """Indeks sprite'ów według komórek siatki o boku ``cell_size`` pikseli.
+
+    Każdy element ma stały klucz kolejności. ``query`` zwraca kandydatów w tej
+    kolejności, dzięki czemu rozstrzyganie kolizji daje ten sam wynik co pętla
+    po pełnej liście platform.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._entries = {}
+        self._next_order = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item):
+        return item in self._entries
+
+    def __iter__(self):
+        return iter(sorted(self._entries, key=lambda item: self._entries[item][0]))
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        return tuple((cell_x, cell_y)
+                     for cell_x in range(rect.left // size, (rect.right - 1) // size + 1)
+                     for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1))
+
+    def insert(self, item, order=None):
+        """Dodaje element z jego bieżącym ``rect``; ponowne dodanie to update."""
+        if item in self._entries:
+            self.update(item)
+            return
+        if order is None:
+            order = self._next_order
+        self._next_order = max(self._next_order, order + 1)
+        cells = self._cells_for(item.rect)
+        for cell in cells:
+            self._cells.setdefault(cell, {})[item] = order
+        self._entries[item] = (order, cells)
+
+    def remove(self, item):
+        entry = self._entries.pop(item, None)
+        if entry is None:
+            return
+        for cell in entry[1]:
+            bucket = self._cells[cell]
+            del bucket[item]
+            if not bucket:
+                del self._cells[cell]
+
+    def update(self, item):
+        """Przenosi ruchomy element; kosztuje coś tylko przy zmianie komórek."""
+        entry = self._entries.get(item)
+        if entry is None:
+            return
+        order, old_cells = entry
+        cells = self._cells_for(item.rect)
+        if cells == old_cells:
+            return
+        for cell in old_cells:
+            bucket = self._cells[cell]
+            del bucket[item]
+            if not bucket:
+                del self._cells[cell]
+        for cell in cells:
+            self._cells.setdefault(cell, {})[item] = order
+        self._entries[item] = (order, cells)
+
+    def query(self, rect):
+        """Zwraca elementy z komórek pokrywanych przez ``rect`` w stałej kolejności."""
+        found = {}
+        cells = self._cells
+        for cell in self._cells_for(rect):
+            bucket = cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        if len(found) < 2:
+            return list(found)
+        return sorted(found, key=found.__getitem__)
+
+
+def nearby(colliders, rect, margin=None):
+    """Zawęża kolekcję kolizji do otoczenia ``rect``.
+
+    Zwykłe listy i grupy (np. w testach) są zwracane bez zmian. Margines o
+    szerokości komórki chroni przed pominięciem obiektu, gdy rozstrzygnięcie
+    kolizji wypchnie prostokąt poza pierwotnie badany obszar.
+    """
+    if not isinstance(colliders, SpatialGrid):
+        return colliders
+    if margin is None:
+        margin = colliders.cell_size
+    return colliders.query(rect.inflate(margin, margin))
+
+
+class IntervalIndex:
+    """Przedziały [left, right) posortowane po lewym końcu (sweep po osi X).
+
+    Przedział nakłada się na zapytanie [left, right) tylko wtedy, gdy jego
+    lewy koniec leży w (left - najdłuższy przedział, right). Dwa wyszukiwania
+    binarne wyznaczają ten fragment listy, więc zapytanie kosztuje
+    O(log n + k) zamiast przeglądania wszystkich przedziałów.
+    """
+
+    def __init__(self):
+        self._lefts = []
+        self._rights = []
+        self._items = []
+        self._max_length = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def insert(self, left, right, item):
+        index = bisect.bisect_right(self._lefts, left)
+        self._lefts.insert(index, left)
+        self._rights.insert(index, right)
+        self._items.insert(index, item)
+        self._max_length = max(self._max_length, right - left)
+
+    def _window(self, left, right):
+        return (bisect.bisect_right(self._lefts, left - self._max_length),
+                bisect.bisect_left(self._lefts, right))
+
+    def candidates(self, left, right):
+        """Nadzbiór ``overlapping`` bez sprawdzania prawych końców.
+
+        Kolejność jest malejąca po lewym końcu: przedziały zaczynające się tuż
+        przed ``right`` najczęściej naprawdę się nakładają, więc pętla szukająca
+        pierwszego konfliktu kończy się szybciej.
+        """
+        start, stop = self._window(left, right)
+        return self._items[start:stop][::-1]
+
+    def overlapping(self, left, right):
+        """Elementy przedziałów, które mają część wspólną z [left, right)."""
+        start, stop = self._window(left, right)
+        rights = self._rights
+        return [self._items[position] for position in range(start, stop) if rights[position] > left]
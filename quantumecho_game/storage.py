@@ -7,6 +7,8 @@ DEFAULT_SETTINGS = {
     "lives": 3,
     "music_volume": 0.7,
     "sfx_volume": 0.8,
+    # Rysowanie tylko zmienionych obszarów ekranu (wolne karty, renderowanie programowe)
+    "dirty_rects": False,
 }
 
 
@@ -21,6 +23,7 @@ def load_settings(filename):
             settings["lives"] = DEFAULT_SETTINGS["lives"]
         for key in ("music_volume", "sfx_volume"):
             settings[key] = max(0.0, min(1.0, float(settings[key])))
+        settings["dirty_rects"] = settings["dirty_rects"] is True
         return settings
     except (FileNotFoundError, json.JSONDecodeError, OSError, TypeError, ValueError):
         return DEFAULT_SETTINGS.copy()
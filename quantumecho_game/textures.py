@@ -0,0 +1,103 @@
+"""Proceduralne tekstury platform liczone na tablicach NumPy.
+
+Tekstura to siatka kafli 24×24 w losowych odcieniach palety, szum
+pojedynczych pikseli (średnio jeden na 25 pikseli) i jaśniejszy pas u góry.
+Całość powstaje kilkoma operacjami na tablicy i jednym ``blit_array``.
+
+Tekstury są wspólne dla całego procesu: klucz to (rodzaj, szerokość,
+wysokość, wariant), a wariant wynika z położenia platformy. Takie same
+kafle dzielą więc powierzchnię, a ponowne zbudowanie poziomu (kolejna
+próba, powrót z menu) nie generuje niczego. Cache ma budżet pamięci i
+usuwa najdawniej używane tekstury; poziomy, które wciąż z nich korzystają,
+trzymają własne referencje.
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+TILE_SIZE = 24
+TOP_HEIGHT = 5
+NOISE_DENSITY = 25  # Jeden piksel szumu na tyle pikseli tekstury
+TEXTURE_VARIANTS = 16
+TEXTURE_BUDGET = 48 * 1024 * 1024  # Bajty pikseli trzymanych w cache
+
+
+def texture_variant(x, y):
+    """Wariant tekstury platformy stojącej w (x, y).
+
+    Skrót obejmuje wszystkie bity współrzędnych, więc kafle wyrównane do
+    siatki edytora (wielokrotności 32) też dostają różne warianty.
+    """
+    return zlib.crc32(f"{x},{y}".encode()) % TEXTURE_VARIANTS
+
+
+class TextureCache:
+    """Cache LRU powierzchni z budżetem pamięci; bezpieczny dla wątku prefetch."""
+
+    def __init__(self, budget=TEXTURE_BUDGET):
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, kind, width, height, variant, create):
+        """Wspólna tekstura; przy braku wywołuje ``create(width, height, generator)``.
+
+        Zwróconej powierzchni nie wolno modyfikować.
+        """
+        key = kind, width, height, variant
+        with self._lock:
+            surface = self._entries.get(key)
+            if surface is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return surface
+            self.misses += 1
+        generator = np.random.default_rng([zlib.crc32(kind.encode()), width, height, variant])
+        surface = create(width, height, generator)
+        with self._lock:
+            if key in self._entries:  # Inny wątek zdążył ją dodać
+                return self._entries[key]
+            self._entries[key] = surface
+            self.size += width * height * surface.get_bytesize()
+            while self.size > self.budget and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
+        return surface
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = self.hits = self.misses = 0
+
+
+texture_cache = TextureCache()
+
+
+def tiled_noise(width, height, palette, noise, generator):
+    """Tablica (width, height, 3) z kafli w kolorach palety i szumu ±``noise``."""
+    palette = np.asarray(palette, dtype=np.int16)
+    columns, rows = -(-width // TILE_SIZE), -(-height // TILE_SIZE)
+    tiles = palette[generator.integers(len(palette), size=(columns, rows))]
+    pixels = tiles.repeat(TILE_SIZE, axis=0).repeat(TILE_SIZE, axis=1)[:width, :height]
+    count = width * height // NOISE_DENSITY
+    xs = generator.integers(width, size=count)
+    ys = generator.integers(height, size=count)
+    pixels[xs, ys] += generator.integers(-noise, noise + 1, size=(count, 1), dtype=np.int16)
+    return pixels
+
+
+def to_surface(pixels):
+    """Zwykła powierzchnia (bez alfy) z tablicy kolorów, przyciętych do 0..255."""
+    surface = pygame.Surface(pixels.shape[:2])
+    pygame.surfarray.blit_array(surface, np.clip(pixels, 0, 255).astype(np.uint8))
+    return surface
@@ -1,12 +1,15 @@
 """Renderowanie elementów interfejsu gry."""
 
+import functools
+
 import pygame
 
 from .config import GRAY, GREEN, PURPLE, RED, WHITE, YELLOW, CYAN, SCREEN_WIDTH
+from .fonts import render_text
 from .runtime import font_small, font_medium
 
 def draw_text(text, font, color, surface, x, y, center=False):
-    text_obj = font.render(text, True, color)
+    text_obj = render_text(font, text, color)
     text_rect = text_obj.get_rect()
     if center:
         text_rect.center = (x, y)
@@ -66,7 +69,13 @@ def draw_hud(surface, player, collectibles_left, second_life_available, level_ti
         lines.append(("quantum", f"Zamiany [Q]: {cooldown_sec}s", GRAY))
     else:
         lines.append(("quantum", "Zamiany [Q]: GOTOWA", PURPLE))
+    return surface.blit(_hud_surface(tuple(lines)), (10, 10))
+
 
+# Wartości HUD zmieniają się rzadko (czas co sekundę), więc powierzchnia
+# powstaje od nowa tylko wtedy, gdy zmieni się któryś z wierszy.
+@functools.lru_cache(maxsize=1)
+def _hud_surface(lines):
     line_height = 27
     padding_x, padding_y = 16, 12
     hud_height = padding_y * 2 + line_height * len(lines)
@@ -78,7 +87,7 @@ def draw_hud(surface, player, collectibles_left, second_life_available, level_ti
         draw_hud_icon(hud_surface, icon, (padding_x + 9, line_y))
         draw_text(text, font_small, color, hud_surface, padding_x + 25,
                   padding_y + index * line_height)
-    surface.blit(hud_surface, (10, 10))
+    return hud_surface
 
 
 class SettingsMenu:
@@ -93,7 +102,7 @@ class SettingsMenu:
 
     @property
     def items(self):
-        return ("lives", "music_volume", "sfx_volume")
+        return ("lives", "music_volume", "sfx_volume", "dirty_rects")
 
     def move(self, direction):
         self.selected = (self.selected + direction) % len(self.items)
@@ -104,6 +113,8 @@ class SettingsMenu:
             current = self.settings.get(key, 3)
             index = self.LIFE_OPTIONS.index(current) if current in self.LIFE_OPTIONS else 1
             self.settings[key] = self.LIFE_OPTIONS[(index + direction) % len(self.LIFE_OPTIONS)]
+        elif key == "dirty_rects":
+            self.settings[key] = not self.settings.get(key, False)
         else:
             self.settings[key] = max(0.0, min(1.0, round(self.settings.get(key, 0.7) + direction * 0.1, 1)))
         if self.on_change:
@@ -124,15 +135,17 @@ class SettingsMenu:
     def draw(self, surface):
         surface.fill((8, 8, 25))
         draw_text("USTAWIENIA", font_medium, CYAN, surface, SCREEN_WIDTH // 2, 110, center=True)
-        labels = {"lives": "Liczba żyć", "music_volume": "Głośność muzyki", "sfx_volume": "Głośność SFX"}
+        labels = {"lives": "Liczba żyć", "music_volume": "Głośność muzyki", "sfx_volume": "Głośność SFX",
+                  "dirty_rects": "Rysowanie zmian"}
         for index, key in enumerate(self.items):
             y = 240 + index * 90
             color = CYAN if index == self.selected else WHITE
             value = self.settings[key]
             if key == "lives": value = "∞" if value == "infinite" else str(value)
+            elif key == "dirty_rects": value = "WŁ." if value else "WYŁ."
             else: value = f"{int(value * 100)}%"
             draw_text(f"{labels[key]}: {value}", font_medium, color, surface, SCREEN_WIDTH // 2, y, center=True)
-            if key != "lives":
+            if key not in ("lives", "dirty_rects"):
                 pygame.draw.rect(surface, GRAY, (SCREEN_WIDTH // 2 - 180, y + 30, 360, 12), 2)
                 pygame.draw.rect(surface, color, (SCREEN_WIDTH // 2 - 176, y + 34, int(352 * self.settings[key]), 4))
         draw_text("Strzałki/D-pad: wybór i zmiana | Enter/A: zmień | Esc/Back: zapisz", font_small,
@@ -141,8 +154,8 @@ class SettingsMenu:
 # Rysowanie tekstu w stylu pixel art (bez antyaliasingu) z cieniem
 def draw_pixel_text(surface, text, font, center_pos, text_color, shadow_color, shadow_offset=(3, 3)):
     # Renderuj tekst bez wygładzania krawędzi (antyaliasingu)
-    text_surf = font.render(text, False, text_color)
-    shadow_surf = font.render(text, False, shadow_color)
+    text_surf = render_text(font, text, text_color, antialias=False)
+    shadow_surf = render_text(font, text, shadow_color, antialias=False)
 
     # Ustawienie pozycji tekstu i cienia
     text_rect = text_surf.get_rect(center=center_pos)
@@ -0,0 +1,27 @@
+import random
+
+from quantumecho_game.arcade import ArcadeManager
+from quantumecho_game.spatial import IntervalIndex
+
+
+def test_airspace_index_gives_same_answer_as_platform_list():
+    manager = ArcadeManager(seed=1)
+    manager.golden_path_segments = 60
+    path = manager._make_golden_path(random.Random(2), difficulty=5)
+    index = IntervalIndex()
+    for platform in path:
+        index.insert(platform["x"], platform["x"] + platform["width"], platform)
+    rng = random.Random(3)
+
+    for _ in range(300):
+        candidate = {"x": rng.randint(0, 1100), "y": rng.randint(100, 650),
+                     "width": rng.randint(120, 205), "height": 24}
+        assert (manager.has_sufficient_airspace(candidate, index)
+                == manager.has_sufficient_airspace(candidate, path))
+
+
+def test_golden_path_length_follows_segment_setting():
+    manager = ArcadeManager(seed=9)
+    manager.golden_path_segments = 40
+
+    assert len(manager._make_golden_path(random.Random(0), difficulty=3)) == 41
@@ -0,0 +1,33 @@
+import random
+
+import pygame
+
+from quantumecho_game.effects import LevelBackground
+
+
+def test_star_layers_scroll_with_wrapping():
+    background = LevelBackground(0, 320, 180, rng=random.Random(4))
+    surface = pygame.Surface((320, 180))
+    for _ in range(200):
+        background.update(4, -2)
+
+    assert ((background.star_offsets >= 0) & (background.star_offsets < (320, 180))).all()
+    background.star_offsets[:] = (300, 150)
+    background.cloud_surfaces = []
+    background.draw(surface)
+    index = next(i for i, (x, y) in enumerate(background.star_positions.tolist())
+                 if 20 <= x < 300 and 100 <= y < 170)
+    x, y = background.star_positions[index].astype(int)
+    # Przesunięcie o (300, 150) przy ekranie 320x180 to zawinięcie o (20, 30)
+    # w lewo i w górę; kolor gwiazdy nie zależy od nieba pod nią.
+    assert surface.get_at((x - 20, y - 30))[:3] == background.star_color
+    assert len(background._star_layers) == LevelBackground.STAR_DEPTHS
+
+
+def test_clouds_wrap_to_the_right_edge():
+    background = LevelBackground(2, 320, 180, rng=random.Random(4))
+    background.cloud_positions[:, 0] = -background.cloud_widths + 1
+
+    background.update(10, 0)
+
+    assert (background.cloud_positions[:, 0] == 320).all()
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+
+import pygame
+
+from quantumecho_game import editor_ui
+from quantumecho_game.editor_ui import (
+    LevelIndex, ThumbnailLoader, browser_entry, delete_level, empty_level, thumbnail_path,
+)
+
+
+def write_level(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(empty_level()), encoding="utf-8")
+
+
+def test_level_index_rescans_only_after_directory_changes(tmp_path):
+    write_level(tmp_path / "B.json")
+    write_level(tmp_path / "custom" / "a.json")
+    index = LevelIndex(tmp_path, interval=0)
+
+    assert index.refresh()
+    assert index.files == [tmp_path / "B.json", tmp_path / "custom" / "a.json"]
+    assert not index.refresh()
+
+    write_level(tmp_path / "custom" / "c.json")
+    assert index.refresh()
+    assert index.files[-1] == tmp_path / "custom" / "c.json"
+
+    (tmp_path / "B.json").unlink()
+    assert index.refresh()
+    assert tmp_path / "B.json" not in index.files
+
+
+def test_thumbnail_loader_renders_missing_thumbnails_in_background(tmp_path):
+    level = tmp_path / "level.json"
+    write_level(level)
+    loader = ThumbnailLoader(size=(160, 90))
+
+    assert loader.get(level) is None
+    deadline = time.monotonic() + 5
+    thumbnail = None
+    while thumbnail is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+        thumbnail = loader.get(level)
+    loader.shutdown()
+
+    assert thumbnail.get_size() == (160, 90)
+    assert thumbnail_path(level).is_file()
+
+
+def test_browser_entry_is_memoized_and_guards_campaign_levels(tmp_path):
+    custom_root = tmp_path / "custom"
+    campaign = tmp_path / "level_1.json"
+    custom = custom_root / "my_level.json"
+    write_level(campaign)
+    write_level(custom)
+
+    entry = browser_entry(custom, custom_root)
+
+    assert entry == ("my level", True)
+    assert browser_entry(custom, custom_root) is entry
+    assert not browser_entry(campaign, custom_root).deletable
+    assert not delete_level(campaign, custom_root)
+    assert delete_level(custom, custom_root) and not custom.exists()
+
+
+def test_thumbnail_loader_drops_scrolled_past_cards(tmp_path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_load(path, size):
+        started.set()
+        release.wait(5)
+        return pygame.Surface(size)
+
+    monkeypatch.setattr(editor_ui, "_load_scaled_thumbnail", slow_load)
+    loader = ThumbnailLoader(size=(16, 9), capacity=1)
+    first, passed, visible = (tmp_path / f"{name}.json" for name in ("a", "b", "c"))
+    for path in (first, passed, visible):
+        loader.get(path)
+    started.wait(5)
+
+    loader.retain([visible])
+    assert set(loader._pending) == {str(first), str(visible)}
+
+    release.set()
+    for future in list(loader._pending.values()):
+        future.result(5)
+    loader.retain([visible])
+
+    assert not loader._pending
+    assert list(loader._ready) == [str(visible)]
+    loader.shutdown()
@@ -0,0 +1,55 @@
+from quantumecho_game.compaction import compact_level_data, merge_rects
+from quantumecho_game.level import Level
+
+
+def cell(x, y, **extra):
+    return {"x": x * 32, "y": y * 32, "width": 32, "height": 32, **extra}
+
+
+def covered_cells(items):
+    return {(x, y) for item in items
+            for x in range(item["x"], item["x"] + item["width"], 32)
+            for y in range(item["y"], item["y"] + item["height"], 32)}
+
+
+def test_painted_block_becomes_single_rectangle():
+    tiles = [cell(x, y) for y in range(3) for x in range(10)]
+
+    assert merge_rects(tiles) == [{"x": 0, "y": 0, "width": 320, "height": 96}]
+
+
+def test_irregular_shape_keeps_exact_coverage():
+    tiles = [cell(x, 0) for x in range(6)] + [cell(0, y) for y in range(1, 4)] + [cell(8, 0)]
+
+    merged = merge_rects(tiles)
+
+    assert covered_cells(merged) == covered_cells(tiles)
+    assert len(merged) == 3
+
+
+def test_temporal_platforms_merge_only_with_identical_timing():
+    data = {"temporal_platforms": [cell(0, 5), cell(1, 5), cell(2, 5, solid_time=60),
+                                   cell(3, 5, solid_time=180)]}
+
+    merged = compact_level_data(data)["temporal_platforms"]
+
+    assert [(item["x"], item["width"]) for item in merged] == [(0, 64), (64, 32), (96, 32)]
+
+
+def test_hazards_merge_horizontally_and_keep_spike_count():
+    data = {"hazards": [cell(x, 10, type="spike") for x in range(4)] + [cell(0, 11, type="spike")]}
+
+    merged = compact_level_data(data)["hazards"]
+
+    assert merged[0] == {"x": 0, "y": 320, "width": 128, "height": 32, "type": "spike", "teeth": 4}
+    assert len(merged) == 2
+
+
+def test_level_builds_fewer_sprites_for_editor_tiles():
+    data = {"platforms": [cell(x, 20) for x in range(40)] + [{"x": 0, "y": 100, "width": 64,
+                                                              "height": 20, "moving": True}],
+            "start": {"x": 32, "y": 600}}
+
+    assert len(Level(data, 0).platforms) == 2
+    assert len(Level(data, 0, compact=False).platforms) == 41
+    assert len(data["platforms"]) == 41
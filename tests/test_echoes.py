@@ -0,0 +1,54 @@
+import pygame
+
+from quantumecho_game.simulation import Simulation
+
+
+def multi_echo_level(delays, switches=()):
+    return {"platforms": [{"x": 0, "y": 700, "width": 1280, "height": 20}],
+            "paradox_switches": list(switches),
+            "start": {"x": 100, "y": 660}, "end": {"x": 1200, "y": 620},
+            "echo_delays": delays}
+
+
+def test_each_echo_follows_history_at_its_delay():
+    simulation = Simulation(multi_echo_level([20, 50, 90]))
+
+    for _ in range(120):
+        simulation.step(right=True)
+
+    history = simulation.player_history
+    assert simulation.echo_delay == 90
+    assert simulation.echo.rect.topleft == history.position(90)
+    assert [tuple(position) for position in simulation.echoes.positions] == [
+        history.position(20), history.position(50)]
+
+
+def test_echo_waits_at_start_until_history_is_long_enough():
+    simulation = Simulation(multi_echo_level([30, 600]))
+
+    for _ in range(10):
+        simulation.step(right=True)
+
+    assert tuple(simulation.echoes.positions[0]) == simulation.level.start_pos
+
+
+def test_short_echo_presses_paradox_switch():
+    simulation = Simulation(multi_echo_level([10, 600], [{"x": 200, "y": 684}]))
+    switch = simulation.level.paradox_switches.sprites()[0]
+
+    for _ in range(25):
+        simulation.step(right=True)
+
+    assert switch.pressed
+
+
+def test_many_echoes_draw_in_one_pass():
+    simulation = Simulation(multi_echo_level(list(range(10, 330, 20))))
+    surface = pygame.Surface((1280, 720))
+
+    for _ in range(330):
+        simulation.step(right=True)
+    simulation.echoes.draw(surface)
+
+    assert len(simulation.echoes) == 15
+    assert surface.get_at(simulation.echoes.rects()[0].center) != (0, 0, 0, 255)
@@ -1,6 +1,9 @@
 import pygame
 
-from quantumecho_game.entities import Collectible, Hazard, Platform, Player, TemporalPlatform
+from quantumecho_game.effects import _glow_sprite, glow_sprite
+from quantumecho_game.entities import (
+    PORTAL_PARTICLES, Collectible, ExitZone, Hazard, Platform, Player, TemporalPlatform,
+)
 
 
 def empty_collision_inputs():
@@ -64,3 +67,37 @@ def test_temporal_platform_changes_state_after_duration():
     platform.update()
 
     assert platform.state == "phased"
+
+
+def test_glow_sprites_are_shared_between_frames_and_entities():
+    first, second = Collectible(100, 100, "gem"), Collectible(300, 100, "gem")
+    surface = pygame.Surface((400, 200))
+    _glow_sprite.cache_clear()
+
+    for _ in range(120):
+        for collectible in (first, second):
+            collectible.update()
+            collectible.draw(surface)
+
+    # Alfa pulsuje w zakresie 50..150, czyli co najwyżej kilkanaście kubełków
+    assert _glow_sprite.cache_info().currsize <= 14
+    assert glow_sprite(10, (1, 2, 3), 97) is glow_sprite(10, (1, 2, 3, 255), 99)
+
+
+def test_open_exit_keeps_portal_particles_in_flat_array():
+    exit_zone = ExitZone(100, 100)
+    exit_zone.locked = False
+    surface = pygame.Surface((300, 300))
+
+    for _ in range(200):
+        exit_zone.update()
+
+    live = exit_zone.portal_particles[:exit_zone.portal_count]
+    assert 0 < exit_zone.portal_count <= PORTAL_PARTICLES
+    assert (live[:, 3] > 0).all()
+    exit_zone.draw(surface, draw_gate=False)
+    without_particles = pygame.Surface((300, 300))
+    exit_zone.portal_count = 0
+    exit_zone.draw(without_particles, draw_gate=False)
+    assert pygame.image.tobytes(surface, "RGB") != pygame.image.tobytes(without_particles, "RGB")
+    assert ExitZone.portal_sprites() is ExitZone.portal_sprites()
@@ -0,0 +1,17 @@
+import pygame
+
+from quantumecho_game.fonts import _render_text, font_small, render_text
+
+
+def test_render_text_reuses_surfaces_per_font_text_and_color():
+    _render_text.cache_clear()
+
+    first = render_text(font_small, "Czas: 3s", (255, 255, 255))
+    again = render_text(font_small, "Czas: 3s", [255, 255, 255])
+    other_color = render_text(font_small, "Czas: 3s", (0, 255, 255))
+
+    assert again is first
+    assert other_color is not first
+    assert _render_text.cache_info().currsize == 2
+    expected = font_small.render("Czas: 3s", True, (255, 255, 255))
+    assert pygame.image.tobytes(first, "RGBA") == pygame.image.tobytes(expected, "RGBA")
@@ -0,0 +1,60 @@
+import pytest
+
+from quantumecho_game.entities import Player
+from quantumecho_game.history import FLAG_ON_GROUND, EchoHistory
+from quantumecho_game.simulation import Simulation
+
+
+def record_positions(history, positions):
+    player = Player(0, 0)
+    for x, y in positions:
+        player.rect.topleft = (x, y)
+        history.record(player)
+    return player
+
+
+def test_position_reads_any_delay_after_wrapping():
+    history = EchoHistory(4)
+
+    record_positions(history, [(x, 10) for x in range(7)])
+
+    assert len(history) == 4
+    assert history.position(0) == (6, 10)
+    assert history.position(3) == (3, 10)
+    assert history.position(4) is None
+    with pytest.raises(IndexError):
+        history.state(4)
+
+
+def test_state_keeps_velocity_and_flags():
+    history = EchoHistory(2)
+    player = Player(5, 6)
+    player.vel_x, player.vel_y, player.on_ground = 5, -12.5, True
+
+    history.record(player)
+
+    assert history.state(0) == (5, 6, 5, -12.5, FLAG_ON_GROUND)
+
+
+def test_truncate_drops_newest_frames():
+    history = EchoHistory(5)
+    record_positions(history, [(x, 0) for x in range(5)])
+
+    history.truncate(2)
+
+    assert len(history) == 3
+    assert history.position(0) == (2, 0)
+    assert history.path(2) == [(0, 0), (1, 0), (2, 0)]
+
+
+def test_level_can_shorten_echo_delay():
+    data = {"platforms": [{"x": 0, "y": 700, "width": 1280, "height": 20}],
+            "start": {"x": 100, "y": 660}, "end": {"x": 1100, "y": 620},
+            "echo_delay_frames": 30}
+    simulation = Simulation(data)
+
+    for _ in range(40):
+        simulation.step(right=True)
+
+    assert simulation.echo.rect.x == simulation.player_history.position(30)[0]
+    assert simulation.player.rect.x - simulation.echo.rect.x == 30 * 5
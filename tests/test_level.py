@@ -0,0 +1,116 @@
+import random
+
+import pygame
+
+from quantumecho_game.config import SCREEN_HEIGHT, SCREEN_WIDTH
+from quantumecho_game.level import Level
+
+
+def level_with_temporal_tiles(count):
+    return {
+        "platforms": [{"x": 0, "y": 700, "width": 1280, "height": 20}],
+        "temporal_platforms": [{"x": 64 * i, "y": 500, "width": 32, "height": 20,
+                                "solid_time": 5, "phased_time": 5} for i in range(count)],
+        "paradox_switches": [{"x": 100, "y": 684}],
+        "paradox_doors": [{"x": 900, "y": 600, "width": 32, "height": 96}],
+        "start": {"x": 100, "y": 660},
+    }
+
+
+def test_solid_platform_list_is_reused_until_a_state_changes():
+    level = Level(level_with_temporal_tiles(20), 0)
+    solids = level.get_solid_platforms()
+
+    level.update(0)
+
+    assert level.get_solid_platforms() is solids
+    for _ in range(5):
+        level.update(0)
+    phased = level.get_solid_platforms()
+    assert phased is not solids
+    assert len(phased) == len(solids) - 20
+
+
+def test_door_open_publishes_change_to_level():
+    level = Level(level_with_temporal_tiles(1), 0)
+    door = level.paradox_doors.sprites()[0]
+    assert door in level.get_solid_platforms()
+
+    door.open()
+
+    assert door not in level.get_solid_platforms()
+    assert door not in level.solid_grid
+
+
+def static_scene():
+    return {
+        "platforms": [{"x": 0, "y": 700, "width": 1280, "height": 20},
+                      {"x": 300, "y": 500, "width": 200, "height": 24}],
+        "time_dilation_zones": [{"x": 600, "y": 300, "width": 160, "height": 120}],
+        "paradox_switches": [{"x": 100, "y": 684}],
+        "paradox_doors": [{"x": 900, "y": 520, "width": 32, "height": 160}],
+        "start": {"x": 100, "y": 660},
+        "end": {"x": 1100, "y": 400},
+    }
+
+
+def draw_each_entity(level, surface):
+    """Rysowanie bez warstw statycznych, w dawnej kolejności."""
+    for group in (level.platforms, level.temporal_platforms, level.time_dilation_zones,
+                  level.hazards, level.collectibles, level.keys, level.paradox_switches,
+                  level.paradox_doors):
+        for entity in group:
+            entity.draw(surface)
+    level.exit_zone.draw(surface, remaining_keys=len(level.keys))
+
+
+def render(draw):
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    surface.fill((30, 40, 70))
+    draw(surface)
+    return pygame.surfarray.array3d(surface).astype(int)
+
+
+def test_static_layers_match_per_entity_drawing():
+    level = Level(static_scene(), 0, rng=random.Random(1))
+
+    baked = render(lambda surface: level.draw(surface, draw_background=False))
+    expected = render(lambda surface: draw_each_entity(level, surface))
+
+    assert abs(baked - expected).max() <= 2
+
+
+def test_static_layers_rebake_after_door_and_switch_change():
+    level = Level(static_scene(), 0, rng=random.Random(1))
+    tiles = level._overlay_tiles
+
+    level.paradox_switches.sprites()[0].activate()
+    level.update(0)
+    baked = render(lambda surface: level.draw(surface, draw_background=False))
+    expected = render(lambda surface: draw_each_entity(level, surface))
+
+    assert level._overlay_tiles is not tiles
+    assert all(not door.locked for door in level.paradox_doors)
+    assert abs(baked - expected).max() <= 2
+
+
+def test_mixed_scene_keeps_per_entity_draw_order():
+    data = static_scene()
+    # Ruchoma platforma i platforma czasowa pod strefą, kolce i klejnot pod
+    # drzwiami, klucz pod przełącznikiem, przełącznik na strefie.
+    data["platforms"].append({"x": 560, "y": 360, "width": 120, "height": 20,
+                              "moving": True, "move_range": 60})
+    data["temporal_platforms"] = [{"x": 700, "y": 400, "width": 96, "height": 20,
+                                   "solid_time": 6, "phased_time": 6}]
+    data["hazards"] = [{"x": 890, "y": 600, "width": 60, "height": 24}]
+    data["collectibles"] = [{"x": 905, "y": 540, "type": "gem"}]
+    data["buttons"] = [{"x": 90, "y": 660}]
+    data["paradox_switches"].append({"x": 640, "y": 330})
+    level = Level(data, 0, rng=random.Random(2), compact=False)
+
+    for _ in range(12):
+        level.update(0)
+        baked = render(lambda surface: level.draw(surface, draw_background=False))
+        expected = render(lambda surface: draw_each_entity(level, surface))
+        assert abs(baked - expected).max() <= 2
+    assert level._zone_tiles and level._upper_tiles
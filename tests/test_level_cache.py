@@ -0,0 +1,47 @@
+import os
+
+from quantumecho_game import arcade
+from quantumecho_game.arcade import GENERATOR_VERSION, ArcadeManager
+from quantumecho_game.level_cache import LevelCache
+
+
+def test_entries_are_keyed_by_seed_level_and_generator_version(tmp_path):
+    cache = LevelCache(tmp_path, generator_version=1)
+    cache.store(7, 3, {"data": {"platforms": []}})
+
+    assert cache.load(7, 3)["data"] == {"platforms": []}
+    assert cache.load(7, 4) is None
+    assert cache.load(8, 3) is None
+    assert LevelCache(tmp_path, generator_version=2).load(7, 3) is None
+
+
+def test_corrupted_entry_is_ignored(tmp_path):
+    cache = LevelCache(tmp_path, generator_version=1)
+    cache.store(1, 1, {"data": {}})
+    next(tmp_path.rglob("*.json")).write_text("{", encoding="utf-8")
+
+    assert cache.load(1, 1) is None
+
+
+def test_arcade_manager_loads_cached_levels_without_generating(tmp_path, monkeypatch):
+    cache = LevelCache(tmp_path, GENERATOR_VERSION)
+    expected = ArcadeManager(seed=21, cache=cache).generate_level()
+
+    monkeypatch.setattr(arcade, "_VERIFIED_LAYOUTS", {})
+    monkeypatch.setattr(ArcadeManager, "_build_level", lambda *args: 1 / 0)
+    manager = ArcadeManager(seed=21, cache=LevelCache(tmp_path, GENERATOR_VERSION))
+
+    assert manager.generate_level() == expected
+    assert manager.layout_verified and manager.golden_path
+
+
+def test_store_prunes_oldest_entries_over_limit(tmp_path):
+    cache = LevelCache(tmp_path, generator_version=1, max_entries=3)
+    for level_number in range(5):
+        cache.store(7, level_number, {"data": {}})
+        stamp = (level_number + 1) * 10**9
+        os.utime(cache._path(7, level_number, ".json"), ns=(stamp, stamp))
+    cache.store(7, 5, {"data": {}})
+
+    assert len(list(tmp_path.rglob("*.json"))) == 3
+    assert [n for n in range(6) if cache.load(7, n)] == [3, 4, 5]
@@ -0,0 +1,34 @@
+import pygame
+
+from quantumecho_game.effects import ParticleSystem
+
+
+def test_burst_particles_expire_and_pool_stays_bounded():
+    particles = ParticleSystem(capacity=150)
+
+    particles.add_burst(100, 100, (0, 255, 0), 100)
+    particles.add_burst(200, 100, (255, 0, 0), 100)
+
+    assert len(particles) == 150
+    for _ in range(41):
+        particles.update()
+    assert len(particles) == 0
+
+
+def test_draw_matches_circles_of_the_old_particles():
+    particles = ParticleSystem()
+    particles.add_burst(100, 80, (255, 255, 0), 60)
+    for _ in range(12):
+        particles.update()
+    surface = pygame.Surface((200, 200))
+    expected = pygame.Surface((200, 200))
+
+    rects = particles.draw(surface)
+
+    for index in range(len(particles)):
+        size = 3 * particles.lifetime[index] // particles.max_lifetime[index]
+        if size > 0:
+            x, y = particles.position[index]
+            pygame.draw.circle(expected, (255, 255, 0), (int(x), int(y)), int(size))
+    assert pygame.image.tobytes(surface, "RGB") == pygame.image.tobytes(expected, "RGB")
+    assert len(rects) <= len(particles)
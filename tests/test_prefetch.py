@@ -0,0 +1,39 @@
+from quantumecho_game.arcade import ArcadeManager
+from quantumecho_game.entities import ExitZone
+from quantumecho_game.prefetch import ArcadePrefetcher
+
+
+def test_prefetched_level_matches_synchronous_generation():
+    expected = ArcadeManager(seed=11)
+    expected.generate_level()
+    expected.generate_level()
+
+    manager = ArcadeManager(seed=11)
+    manager.generate_level()
+    prefetcher = ArcadePrefetcher(manager)
+    prefetcher.request()
+    data, simulation = prefetcher.next_level()
+    prefetcher.shutdown()
+
+    assert data == expected.current_data
+    assert manager.level_number == 2
+    assert manager.golden_path == expected.golden_path
+    assert simulation.level.exit_zone.rect.topleft == (data["end"]["x"], data["end"]["y"])
+    assert not simulation.second_life
+
+
+def test_next_level_without_request_builds_synchronously():
+    manager = ArcadeManager(seed=5)
+    prefetcher = ArcadePrefetcher(manager)
+    data, simulation = prefetcher.next_level()
+    prefetcher.shutdown()
+
+    assert manager.level_number == 1
+    assert manager.current_data is data
+
+
+def test_exit_zones_share_gate_structure():
+    first, second = ExitZone(100, 100), ExitZone(300, 200)
+
+    assert first.gate_structure_surface is second.gate_structure_surface
+    assert second.gate_pos == (300 - 16, 200 - 40)
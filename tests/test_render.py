@@ -0,0 +1,72 @@
+import pygame
+
+from quantumecho_game.config import SCREEN_HEIGHT, SCREEN_WIDTH
+from quantumecho_game.render import DirtyRectRenderer
+from quantumecho_game.simulation import Simulation
+
+
+def busy_level():
+    return {
+        "platforms": [{"x": 0, "y": 700, "width": 1280, "height": 20},
+                      {"x": 400, "y": 560, "width": 96, "height": 20, "moving": True, "move_range": 80}],
+        "temporal_platforms": [{"x": 700, "y": 600, "width": 96, "height": 20,
+                                "solid_time": 6, "phased_time": 6}],
+        "hazards": [{"x": 600, "y": 680, "width": 60, "height": 20}],
+        "collectibles": [{"x": 300, "y": 600, "type": "gem"}],
+        "paradox_switches": [{"x": 160, "y": 684}],
+        "paradox_doors": [{"x": 1000, "y": 540, "width": 32, "height": 160}],
+        "buttons": [{"x": 900, "y": 600}],
+        "start": {"x": 100, "y": 660},
+        "end": {"x": 1100, "y": 400},
+    }
+
+
+def draw_frame(simulation, surface):
+    dirty = simulation.level.draw_dynamic(surface)
+    dirty.append(simulation.player.draw(surface))
+    if simulation.echo:
+        dirty.append(simulation.echo.draw(surface))
+    return dirty
+
+
+def test_dirty_frames_match_full_redraw(monkeypatch):
+    updates = []
+    monkeypatch.setattr(pygame.display, "flip", lambda: updates.append(None))
+    monkeypatch.setattr(pygame.display, "update", lambda rects: updates.append(list(rects)))
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    renderer = DirtyRectRenderer(screen)
+    simulation = Simulation(busy_level(), seed=5)
+
+    for _ in range(40):
+        simulation.step(right=True)
+        restored = renderer.begin(simulation.level)
+        renderer.finish(restored, draw_frame(simulation, screen))
+
+        expected = renderer.base.copy()
+        draw_frame(simulation, expected)
+        assert pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(expected, "RGB")
+
+    assert updates[0] is None
+    assert all(rects and sum(r.w * r.h for r in rects) < SCREEN_WIDTH * SCREEN_HEIGHT // 4
+               for rects in updates[-10:])
+
+
+def test_static_change_and_invalidate_send_full_frame(monkeypatch):
+    updates = []
+    monkeypatch.setattr(pygame.display, "flip", lambda: updates.append("flip"))
+    monkeypatch.setattr(pygame.display, "update", lambda rects: updates.append("rects"))
+    renderer = DirtyRectRenderer(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)))
+    simulation = Simulation(busy_level(), seed=5)
+
+    def frame():
+        renderer.finish(renderer.begin(simulation.level), [])
+
+    frame()
+    frame()
+    simulation.level.paradox_switches.sprites()[0].activate()
+    frame()
+    frame()
+    renderer.invalidate()
+    frame()
+
+    assert updates == ["flip", "rects", "flip", "rects", "flip"]
@@ -0,0 +1,64 @@
+from quantumecho_game.replay import (
+    FrameInput, InputRecorder, encode_frames, load_replay, replay, save_replay, verify_replay,
+)
+from quantumecho_game.simulation import Simulation
+
+
+def level_with_items():
+    return {
+        "platforms": [{"x": 0, "y": 700, "width": 600, "height": 20},
+                      {"x": 700, "y": 620, "width": 300, "height": 20}],
+        "hazards": [{"x": 1100, "y": 680, "width": 24, "height": 24}],
+        "collectibles": [{"x": 300, "y": 650, "type": "gem"}],
+        "buttons": [{"x": 800, "y": 560}],
+        "start": {"x": 100, "y": 660},
+        "end": {"x": 1100, "y": 500},
+    }
+
+
+def record_run(seed=1234):
+    data = level_with_items()
+    simulation = Simulation(data, seed=seed)
+    recorder = InputRecorder(simulation, data, {"index": 0})
+    for frame in range(400):
+        if frame in (60, 95, 130):
+            simulation.jump()
+            recorder.jump()
+        if frame == 200:
+            recorder.swap()
+            simulation.swap()
+        paused = 250 <= frame < 260
+        if not paused:
+            simulation.step(right=frame < 300, left=frame >= 330)
+        recorder.end_frame(right=frame < 300, left=frame >= 330, paused=paused)
+    return simulation, recorder.to_dict()
+
+
+def test_frame_input_round_trips_through_bitmask():
+    frame_input = FrameInput(left=True, right=False, jumps=2, swap=True, paused=False)
+
+    assert FrameInput.decode(frame_input.encode()) == frame_input
+
+
+def test_frames_are_run_length_encoded():
+    assert encode_frames([0, 0, 2, 2, 2, 0]) == [[0, 2], [2, 3], [0, 1]]
+
+
+def test_replay_reproduces_recorded_run():
+    simulation, recording = record_run()
+
+    replayed = replay(recording)
+
+    assert replayed.player.rect.topleft == simulation.player.rect.topleft
+    assert replayed.level_time == simulation.level_time == 390
+    assert len(replayed.level.collectibles) == len(simulation.level.collectibles)
+    assert verify_replay(recording)
+
+
+def test_saved_replay_can_be_loaded_and_verified(tmp_path):
+    _simulation, recording = record_run(seed=99)
+    replay_file = tmp_path / "replays" / "run.json"
+
+    save_replay(str(replay_file), recording)
+
+    assert verify_replay(load_replay(str(replay_file)))
@@ -0,0 +1,47 @@
+from quantumecho_game.entities import TemporalPlatform
+from quantumecho_game.level import Level
+from quantumecho_game.schedule import TemporalSchedule
+
+
+def test_schedule_matches_stepping_for_both_initial_states():
+    for initial_state in ('solid', 'phased'):
+        platform = TemporalPlatform(0, 0, 32, 32, initial_state, solid_time=7, phased_time=4)
+        for frame in range(1, 40):
+            platform.update()
+            assert platform.schedule.phase_at(frame) == (platform.state, platform.timer)
+
+
+def test_advance_skips_ahead_like_repeated_updates():
+    stepped = TemporalPlatform(0, 0, 32, 32, solid_time=10, phased_time=3)
+    skipped = TemporalPlatform(0, 0, 32, 32, solid_time=10, phased_time=3)
+    for _ in range(6):
+        stepped.update()
+        skipped.update()
+
+    for _ in range(1000):
+        stepped.update()
+    skipped.advance(1000)
+
+    assert (skipped.state, skipped.timer) == (stepped.state, stepped.timer)
+
+
+def test_frames_until_change():
+    schedule = TemporalSchedule(solid_time=5, phased_time=2)
+
+    assert schedule.period == 9
+    assert schedule.frames_until_change(0) == 6
+    assert schedule.is_solid_at(5) and not schedule.is_solid_at(6)
+    assert schedule.frames_until_change(6) == 3
+
+
+def test_level_skip_ahead_keeps_collision_set_in_sync():
+    data = {"temporal_platforms": [{"x": 0, "y": 500, "width": 32, "height": 20,
+                                    "solid_time": 5, "phased_time": 5}],
+            "start": {"x": 0, "y": 0}}
+    level = Level(data, 0)
+    platform = level.temporal_platforms.sprites()[0]
+
+    level.advance_temporal(7)
+
+    assert platform.state == platform.state_at(7) == 'phased'
+    assert platform not in level.get_solid_platforms()
@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+
+from quantumecho_game.simulation import Simulation
+
+
+def flat_level():
+    return {
+        "platforms": [{"x": 0, "y": 700, "width": 1280, "height": 20}],
+        "start": {"x": 100, "y": 660},
+        "end": {"x": 1100, "y": 620},
+    }
+
+
+def test_simulation_import_does_not_open_a_window():
+    code = ("import pygame, quantumecho_game.simulation; "
+            "assert pygame.display.get_surface() is None; "
+            "assert pygame.mixer.get_init() is None")
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    subprocess.run([sys.executable, "-c", code], check=True, env=env,
+                   cwd=os.path.dirname(os.path.dirname(__file__)))
+
+
+def test_simulation_steps_player_without_display():
+    simulation = Simulation(flat_level())
+
+    for _ in range(10):
+        simulation.step(right=True)
+
+    assert simulation.player.rect.x == 150
+    assert simulation.player.on_ground is True
+    assert simulation.level_time == 10
+
+
+def test_simulation_reaches_exit_when_walking_right():
+    simulation = Simulation(flat_level())
+
+    for _ in range(300):
+        simulation.step(right=True)
+        if simulation.reached_exit():
+            break
+
+    assert simulation.reached_exit()
+
+
+def test_falling_player_takes_over_echo():
+    data = flat_level()
+    data["platforms"] = [{"x": 0, "y": 700, "width": 300, "height": 20}]
+    simulation = Simulation(data)
+    first_player = simulation.player
+
+    results = [simulation.step(right=True) for _ in range(120)]
+
+    assert "echo_takeover" in results
+    assert simulation.player is not first_player
+    assert simulation.player.is_echo is False
+    assert simulation.echo is None
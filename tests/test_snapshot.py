@@ -0,0 +1,76 @@
+from quantumecho_game.replay import InputRecorder, verify_replay
+from quantumecho_game.simulation import Simulation
+
+
+def level_data():
+    return {
+        "platforms": [{"x": 0, "y": 700, "width": 300, "height": 20},
+                      {"x": 200, "y": 500, "width": 120, "height": 20, "moving": True}],
+        "temporal_platforms": [{"x": 400, "y": 650, "width": 96, "height": 20,
+                                "solid_time": 40, "phased_time": 30}],
+        "paradox_switches": [{"x": 120, "y": 684}],
+        "paradox_doors": [{"x": 600, "y": 500, "width": 32, "height": 96}],
+        "collectibles": [{"x": 150, "y": 650, "type": "gem"}],
+        "buttons": [{"x": 260, "y": 650}],
+        "start": {"x": 100, "y": 660},
+        "end": {"x": 1100, "y": 620},
+        "echo_delay_frames": 20,
+    }
+
+
+def world_state(simulation):
+    level = simulation.level
+    return (simulation.player.rect.topleft, simulation.level_time,
+            [p.rect.x for p in level.platforms], [(p.state, p.timer) for p in level.temporal_platforms],
+            [s.pressed for s in level.paradox_switches], [d.locked for d in level.paradox_doors],
+            len(level.collectibles), len(level.keys), simulation.echo is not None)
+
+
+def test_restart_matches_fresh_simulation():
+    simulation = Simulation(level_data(), seed=3)
+    fresh = Simulation(level_data(), seed=3)
+    for _ in range(150):
+        simulation.step(right=True)
+    assert simulation.is_on_second_life
+
+    simulation.restart()
+
+    assert world_state(simulation) == world_state(fresh)
+    for _ in range(60):
+        simulation.step(right=True)
+        fresh.step(right=True)
+    assert world_state(simulation) == world_state(fresh)
+
+
+def test_restore_returns_collected_items_and_closes_doors():
+    simulation = Simulation(level_data())
+    snapshot = simulation.snapshot()
+    for _ in range(40):
+        simulation.step(right=True)
+    assert len(simulation.level.collectibles) == 0
+    assert simulation.level.paradox_switches.sprites()[0].pressed
+
+    simulation.restore(snapshot)
+
+    door = simulation.level.paradox_doors.sprites()[0]
+    assert len(simulation.level.collectibles) == 1
+    assert door.locked and door in simulation.level.solid_grid
+
+
+def test_rewind_goes_back_and_is_recorded_in_replay():
+    data = level_data()
+    simulation = Simulation(data, seed=8, rewind=True)
+    recorder = InputRecorder(simulation, data, {"index": 0})
+    for frame in range(200):
+        if frame in (100, 170):
+            recorder.rewind()
+            assert simulation.rewind()
+        simulation.step(right=frame % 50 < 30)
+        recorder.end_frame(right=frame % 50 < 30)
+
+    assert simulation.level_time < 200
+    assert verify_replay(recorder.to_dict())
+
+
+def test_rewind_is_disabled_by_default():
+    assert Simulation(level_data()).rewind() is False
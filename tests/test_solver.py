@@ -0,0 +1,89 @@
+from quantumecho_game import arcade
+from quantumecho_game.arcade import ArcadeManager, solidify_temporal
+from quantumecho_game.solver import jump_height, solve
+
+
+def _level(second_y, temporal=()):
+    return {
+        "platforms": [{"x": 0, "y": 700, "width": 400, "height": 20},
+                      {"x": 440, "y": second_y, "width": 200, "height": 20}],
+        "temporal_platforms": list(temporal),
+        "buttons": [{"x": 200, "y": 660}],
+        "start": {"x": 20, "y": 640},
+        "end": {"x": 500, "y": second_y - 80},
+    }
+
+
+def test_reachable_exit_is_solvable():
+    result = solve(_level(620))
+
+    assert result.solvable
+    assert result.route == (0, 1)
+
+
+def test_exit_above_jump_height_is_not_solvable():
+    result = solve(_level(700 - jump_height() - 150))
+
+    assert result.key_reached
+    assert not result.solvable
+
+
+def test_temporal_schedule_decides_landing_after_spawn():
+    def level(initial_state):
+        bridge = {"x": 0, "y": 700, "width": 400, "height": 20, "initial_state": initial_state,
+                  "solid_time": 100, "phased_time": 300}
+        data = _level(620, [bridge])
+        data["platforms"] = data["platforms"][1:]
+        return data
+
+    assert solve(level("solid")).solvable
+    # Gracz spada przez niematerialny most, zanim ten zdąży się pojawić.
+    assert not solve(level("phased")).solvable
+
+
+def test_solidify_temporal_keeps_geometry():
+    data = solidify_temporal(_level(620, [{"x": 1, "y": 2, "width": 3, "height": 4,
+                                           "solid_time": 5, "phased_time": 6}]))
+
+    assert data["temporal_platforms"] == []
+    assert data["platforms"][-1] == {"x": 1, "y": 2, "width": 3, "height": 4}
+
+
+def test_arcade_levels_are_verified_and_cached(monkeypatch):
+    levels = {}
+    for seed in (3, 33):
+        manager = ArcadeManager(seed)
+        for _ in range(2):
+            data = manager.generate_level()
+            levels[seed, manager.level_number] = data
+    for data in levels.values():
+        assert solve(data).solvable
+
+    calls = []
+    monkeypatch.setattr(arcade, "solve", lambda data: calls.append(data))
+    for seed in (3, 33):
+        manager = ArcadeManager(seed)
+        for _ in range(2):
+            assert manager.generate_level() == levels[seed, manager.level_number]
+    assert calls == []
+
+
+def test_route_across_spikes_is_not_solvable():
+    def level(spike_height):
+        data = _level(620)
+        data["platforms"] = [{"x": 0, "y": 700, "width": 1280, "height": 20}]
+        data["end"] = {"x": 1100, "y": 620}
+        data["hazards"] = [{"x": 600, "y": 700 - spike_height, "width": 40, "height": spike_height}]
+        return data
+
+    assert solve(level(24)).solvable
+    # Ściana kolców wyższa niż zasięg skoku.
+    assert not solve(level(400)).solvable
+
+
+def test_temporal_platforms_still_block_when_hyperperiod_is_too_long():
+    wall = {"x": 405, "y": 300, "width": 30, "height": 420, "solid_time": 100, "phased_time": 1}
+    decoy = {"x": 1000, "y": 100, "width": 40, "height": 20, "solid_time": 102, "phased_time": 1}
+
+    assert solve(_level(620, [decoy])).solvable
+    assert not solve(_level(620, [wall, decoy])).solvable
@@ -0,0 +1,101 @@
+import pygame
+
+from quantumecho_game.entities import Player
+from quantumecho_game.level import Level
+from quantumecho_game.simulation import DirectionKeys, Simulation
+from quantumecho_game.spatial import IntervalIndex, SpatialGrid
+
+
+class Box:
+    def __init__(self, x, y, w=32, h=32):
+        self.rect = pygame.Rect(x, y, w, h)
+
+
+def tiled_level():
+    platforms = [{"x": x, "y": 700, "width": 32, "height": 32} for x in range(0, 1280, 32)]
+    platforms += [{"x": x, "y": 560, "width": 32, "height": 32} for x in range(400, 600, 32)]
+    return {
+        "platforms": platforms,
+        "temporal_platforms": [{"x": 700, "y": 600, "width": 96, "height": 20,
+                                "solid_time": 40, "phased_time": 40}],
+        "hazards": [{"x": 1000, "y": 400, "width": 24, "height": 24}],
+        "start": {"x": 100, "y": 660},
+        "end": {"x": 1200, "y": 620},
+    }
+
+
+def test_query_returns_only_nearby_items_in_insertion_order():
+    grid = SpatialGrid(cell_size=64)
+    far = Box(1000, 1000)
+    second, first = Box(40, 0), Box(0, 0)
+    grid.insert(first)
+    grid.insert(far)
+    grid.insert(second)
+
+    assert grid.query(pygame.Rect(0, 0, 80, 40)) == [first, second]
+
+
+def test_moved_and_removed_items_leave_their_old_cells():
+    grid = SpatialGrid(cell_size=64)
+    box = Box(0, 0)
+    grid.insert(box)
+
+    box.rect.x = 500
+    grid.update(box)
+
+    assert grid.query(pygame.Rect(0, 0, 32, 32)) == []
+    assert grid.query(pygame.Rect(500, 0, 32, 32)) == [box]
+    grid.remove(box)
+    assert len(grid) == 0
+
+
+def test_level_keeps_grid_in_sync_with_temporal_platforms_and_doors():
+    data = tiled_level()
+    data["paradox_doors"] = [{"x": 640, "y": 600, "width": 32, "height": 100}]
+    data["paradox_switches"] = [{"x": 200, "y": 684}]
+    level = Level(data, 0)
+    temporal = level.temporal_platforms.sprites()[0]
+    door = level.paradox_doors.sprites()[0]
+
+    assert door in level.solid_grid
+    for _ in range(45):
+        level.update(0)
+    assert (temporal in level.solid_grid) == (temporal.state == 'solid')
+
+    level.paradox_switches.sprites()[0].pressed = True
+    level.update(0)
+    assert door not in level.solid_grid
+
+
+def test_grid_physics_matches_full_platform_scan():
+    simulation = Simulation(tiled_level(), seed=5)
+    level = Level(tiled_level(), 0)
+    player = Player(*level.start_pos)
+
+    for frame in range(240):
+        right = frame < 200
+        if frame in (30, 90):
+            simulation.player.jump()
+            player.jump()
+        simulation.step(right=right)
+        player.handle_input(DirectionKeys(right=right))
+        level.update(player.vel_x, player.vel_y)
+        player.update(level.get_solid_platforms(), level.hazards, level.collectibles, level.keys)
+
+        assert simulation.player.rect.topleft == player.rect.topleft
+
+
+def test_interval_index_matches_linear_overlap_scan():
+    import random
+
+    rng = random.Random(4)
+    intervals = [(left, left + rng.randint(1, 300)) for left in (rng.randint(0, 1200) for _ in range(200))]
+    index = IntervalIndex()
+    for number, (left, right) in enumerate(intervals):
+        index.insert(left, right, number)
+
+    for left in range(-50, 1300, 37):
+        right = left + 90
+        expected = {number for number, (a, b) in enumerate(intervals) if a < right and b > left}
+        assert set(index.overlapping(left, right)) == expected
+    assert len(index) == 200
@@ -0,0 +1,102 @@
+import pygame
+
+from quantumecho_game.entities import FADE_FRAMES, Platform, TemporalPlatform
+from quantumecho_game.level import Level
+from quantumecho_game.textures import TEXTURE_VARIANTS, TextureCache, texture_cache, texture_variant
+
+
+def pixels(surface):
+    return pygame.image.tobytes(surface, "RGB")
+
+
+def test_platforms_share_textures_by_size_and_position():
+    first = Platform(0, 0, 100, 50)
+    again = Platform(0, 0, 100, 50)
+    other = next(Platform(x, 0, 100, 50) for x in range(32, 1280, 32)
+                 if texture_variant(x, 0) != texture_variant(0, 0))
+
+    assert first.image is again.image
+    assert pixels(first.image) != pixels(other.image)
+    assert first.image.get_size() == (100, 50)
+    assert first.image.get_at((3, 20))[:3] != (0, 0, 0)
+
+
+def test_rebuilding_a_level_generates_no_textures():
+    data = {"platforms": [{"x": 0, "y": 700, "width": 1280, "height": 20},
+                          {"x": 300, "y": 500, "width": 96, "height": 20}],
+            "temporal_platforms": [{"x": 600, "y": 400, "width": 96, "height": 20}],
+            "paradox_doors": [{"x": 900, "y": 540, "width": 32, "height": 160}],
+            "start": {"x": 100, "y": 600}, "end": {"x": 1100, "y": 600}}
+    Level(data, 0)
+    misses = texture_cache.misses
+
+    level = Level(data, 0)
+
+    assert texture_cache.misses == misses
+    door = level.paradox_doors.sprites()[0]
+    assert door.image is not texture_cache.get("dirt", 32, 160, texture_variant(900, 540), None)
+
+
+def test_cache_evicts_least_recently_used_over_budget():
+    cache = TextureCache(budget=3 * 10 * 10 * 4)
+
+    def create(width, height, generator):
+        return pygame.Surface((width, height), 0, 32)
+
+    for variant in range(3):
+        cache.get("dirt", 10, 10, variant, create)
+    cache.get("dirt", 10, 10, 0, create)
+    cache.get("dirt", 10, 10, 3, create)
+
+    assert len(cache) == 3
+    assert cache.size <= cache.budget
+    assert (cache.hits, cache.misses) == (1, 4)
+    cache.get("dirt", 10, 10, 0, create)
+    assert cache.hits == 2
+    cache.get("dirt", 10, 10, 1, create)
+    assert cache.misses == 5
+
+
+def test_temporal_platform_textures_keep_their_top_band():
+    platform = TemporalPlatform(0, 0, 30, 3)
+
+    assert platform.solid_texture.get_at((29, 2))[:3] == (70, 140, 90)
+    assert platform.phased_texture.get_at((0, 0))[:3] == (60, 90, 140)
+
+
+def test_temporal_fade_frames_are_shared_and_match_blended_texture():
+    first = TemporalPlatform(48, 96, 40, 12, solid_time=20, phased_time=20)
+    again = TemporalPlatform(48, 96, 40, 12, solid_time=20, phased_time=20)
+    for _ in range(10):
+        first.update()
+        again.update()
+    screen = pygame.Surface((120, 120))
+    first.draw(screen)
+    again.draw(screen)
+
+    assert first.image is again.image
+    faded = first.solid_texture.copy()
+    faded.set_alpha(170)  # Krok 6 z 12: 255 - 155 * 6 / 11
+    expected = pygame.Surface((40, 12))
+    expected.blit(faded, (0, 0))
+    assert screen.get_at((60, 101))[:3] == expected.get_at((12, 5))[:3]
+    assert screen.get_at((48, 96))[:3] == (0, 255, 255)
+
+
+def test_temporal_fade_ramp_has_fixed_length():
+    platform = TemporalPlatform(0, 0, 64, 32, solid_time=180, phased_time=120)
+    screen = pygame.Surface((64, 32))
+    frames = set()
+    for _ in range(302):
+        platform.update()
+        platform.draw(screen)
+        frames.add(id(platform.image))
+
+    assert len(frames) == 2 * FADE_FRAMES
+
+
+def test_grid_aligned_positions_spread_over_variants():
+    variants = {texture_variant(x, y) for x in range(0, 1280, 32) for y in range(0, 720, 32)}
+
+    assert variants == set(range(TEXTURE_VARIANTS))
+    assert len({texture_variant(x, 640) for x in range(0, 13 * 32, 32)}) > 4